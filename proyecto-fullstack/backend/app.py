@@ -23,6 +23,10 @@ from models.comment import Comment
 from models.password_reset_token import PasswordResetToken
 from models.revoked_token import RevokedToken
 from models.notification import Notification
+from models.report_job import ReportJob
+from models.project_stats import ProjectStats
+from models.notification_counter import NotificationCounter
+from models.notification_archive import NotificationArchive
 
 # Importar blueprints de rutas (microservicios)
 from routes.auth_routes import auth_bp
@@ -32,9 +36,21 @@ from routes.user_routes import users_bp
 from routes.metrics_routes import metrics_bp
 from routes.pdf_routes import pdf_bp
 from routes.notification_routes import notifications_bp
+from routes.search_routes import search_bp
+from routes.export_routes import export_bp
 
 # Importar utilidades
 from utils.auth_decorators import check_if_token_revoked
+from utils.revocation_cache import revocation_cache
+from utils.user_version_cache import user_version_cache
+from utils.instrumentation import init_instrumentation
+from utils.metrics import configure_engine_metrics, init_metrics
+from utils.report_cache import report_cache
+from utils.notification_bus import notification_bus
+from services.search_service import SearchService
+from services.token_cleanup_service import TokenCleanupService
+from services.notification_retention_service import NotificationRetentionService
+from cli import register_commands
 
 def create_app(config_name=None):
     """Factory function para crear la aplicación Flask"""
@@ -53,6 +69,7 @@ def create_app(config_name=None):
     app.config['JWT_BLACKLIST_TOKEN_CHECKS'] = ['access', 'refresh']
     
     # Inicializar extensiones
+    configure_engine_metrics(app)
     db.init_app(app)
     migrate.init_app(app, db)
     
@@ -77,10 +94,25 @@ def create_app(config_name=None):
             response.headers.add('Access-Control-Allow-Credentials', 'true')
             return response
     
+    # Instrumentación: consultas SQL y tiempos por petición (Server-Timing)
+    init_instrumentation(app)
+    
+    # Métricas Prometheus (/metrics)
+    init_metrics(app)
+    
+    # Caché en disco de reportes PDF
+    report_cache.init_app(app)
+    
+    # Pub/sub de notificaciones para el stream SSE
+    notification_bus.init_app(app)
+    
     # Configurar JWT
     jwt = JWTManager(app)
     
     # Configurar verificación de tokens revocados
+    revocation_cache.init_app(app)
+    user_version_cache.init_app(app)
+    
     @jwt.token_in_blocklist_loader
     def check_if_token_is_revoked(jwt_header, jwt_payload):
         return check_if_token_revoked(jwt_header, jwt_payload)
@@ -125,16 +157,26 @@ def create_app(config_name=None):
     app.register_blueprint(tasks_bp, url_prefix='/api')          # Gestión de tareas (/api/tasks)
     app.register_blueprint(users_bp, url_prefix='/api')          # Gestión de usuarios (/api/users)
     app.register_blueprint(metrics_bp, url_prefix='/api')        # Métricas y estadísticas (/api/metrics)
-    app.register_blueprint(pdf_bp, url_prefix='/api')            # Exportación PDF (/api/pdf)
-    app.register_blueprint(notifications_bp, url_prefix='/api')  # Gestión de notificaciones (/api/notifications)
+    app.register_blueprint(pdf_bp, url_prefix='/api/pdf')                      # Exportación PDF (/api/pdf)
+    app.register_blueprint(notifications_bp, url_prefix='/api/notifications')  # Gestión de notificaciones (/api/notifications)
+    app.register_blueprint(search_bp, url_prefix='/api')         # Búsqueda de texto completo (/api/search)
+    app.register_blueprint(export_bp, url_prefix='/api')         # Exportación CSV / XLSX (/api/export)
     
     # Ruta de salud del sistema
     @app.route('/health', methods=['GET'])
     def health_check():
-        """Endpoint para verificar el estado del sistema"""
+        """Endpoint para verificar el estado del sistema (incluye conexión a la base de datos)"""
+        try:
+            db.session.execute(text('SELECT 1'))
+            database_status = 'activo'
+        except Exception:
+            db.session.rollback()
+            database_status = 'inactivo'
+        
+        healthy = database_status == 'activo'
         return jsonify({
-            'success': True,
-            'message': 'Sistema funcionando correctamente',
+            'success': healthy,
+            'message': 'Sistema funcionando correctamente' if healthy else 'Base de datos no disponible',
             'version': '1.0.0',
             'architecture': 'microservices',
             'microservices': {
@@ -144,9 +186,10 @@ def create_app(config_name=None):
                 'users': 'activo',
                 'metrics': 'activo',
                 'pdf': 'activo',
-                'notifications': 'activo'
+                'notifications': 'activo',
+                'database': database_status
             }
-        }), 200
+        }), 200 if healthy else 503
     
     # Endpoint de diagnóstico de base de datos
     @app.route('/debug/db-info', methods=['GET'])
@@ -243,7 +286,10 @@ def create_app(config_name=None):
                 'metrics': '/metrics',
                 'pdf_reports': '/pdf',
                 'notifications': '/notifications',
-                'health_check': '/health'
+                'search': '/search',
+                'exports': '/export',
+                'health_check': '/health',
+                'prometheus_metrics': '/metrics'
             },
             'features': [
                 'Autenticación JWT',
@@ -312,12 +358,29 @@ def create_app(config_name=None):
             except Exception as e:
                 print(f"❌ Error inicializando base de datos: {e}")
     
+    # Índice de búsqueda de texto completo (tsvector/GIN o FTS5)
+    SearchService.init_app(app)
+    
+    # Comandos de mantenimiento, purga periódica de tokens expirados y retención de notificaciones
+    register_commands(app)
+    TokenCleanupService.init_app(app)
+    NotificationRetentionService.init_app(app)
+    
     return app
 
-# Crear aplicación
-app = create_app()
+def __getattr__(name):
+    """
+    Crear la aplicación solo cuando se accede a `app.app` (flask run, scripts de seed)
+    Importar este módulo no tiene efectos secundarios; en producción usar wsgi.py
+    """
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == '__main__':
+    app = create_app()
+    
     # Configuración para desarrollo
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') == 'development'
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark del reporte PDF de tareas con muchas filas
+
+Genera una base SQLite sintética por tamaño (por defecto 1.000, 10.000 y 100.000 tareas)
+y mide, en un proceso nuevo por medición, el tiempo de generación, el tamaño del PDF y
+la memoria residente máxima de:
+
+    streamed  PDFService.generate_tasks_report (tabla por streaming, filas con yield_per)
+    legacy    una sola Table con todas las filas (implementación anterior), solo hasta --legacy-max
+
+Uso:
+    python benchmarks/bench_pdf_reports.py
+    python benchmarks/bench_pdf_reports.py --sizes 1000 10000 100000 --legacy-max 10000
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project
+from models.task import Task
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+
+STATUSES = ['todo', 'in_progress', 'review', 'done']
+PRIORITIES = ['low', 'medium', 'high']
+
+
+def create_app(database_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed(database_path, tasks):
+    """Crear la base con `tasks` tareas repartidas en 20 proyectos y 50 usuarios"""
+    app = create_app(database_path)
+    rng = random.Random(42)
+    with app.app_context():
+        db.create_all()
+        users = [{'id': str(uuid.uuid4()), 'name': f'Usuario {i}', 'email': f'user{i}@bench.local',
+                  'password_hash': 'x', 'role': 'developer', 'is_active': True, 'role_version': 1}
+                 for i in range(50)]
+        db.session.execute(User.__table__.insert(), users)
+        projects = [{'id': str(uuid.uuid4()), 'name': f'Proyecto {i}', 'description': '',
+                     'status': 'active', 'created_by': users[0]['id']} for i in range(20)]
+        db.session.execute(Project.__table__.insert(), projects)
+
+        start = datetime(2025, 1, 1)
+        batch = []
+        for i in range(tasks):
+            batch.append({
+                'id': str(uuid.uuid4()),
+                'title': f'Tarea {i} ' + 'x' * rng.randint(0, 60),
+                'description': 'Descripción de la tarea',
+                'status': rng.choice(STATUSES),
+                'priority': rng.choice(PRIORITIES),
+                'project_id': rng.choice(projects)['id'],
+                'assigned_to': rng.choice(users)['id'] if rng.random() < 0.8 else None,
+                'due_date': (start + timedelta(days=rng.randint(0, 365))).date(),
+                'created_at': start + timedelta(seconds=i)
+            })
+            if len(batch) == 10000:
+                db.session.execute(Task.__table__.insert(), batch)
+                batch = []
+        if batch:
+            db.session.execute(Task.__table__.insert(), batch)
+        db.session.commit()
+
+
+def run_child(database_path, mode):
+    """Generar el reporte y devolver las mediciones (se ejecuta en un proceso nuevo)"""
+    import resource
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate
+    from reportlab.lib.pagesizes import A4
+    from services.pdf_service import PDFService
+    from services.task_service import TaskService
+
+    app = create_app(database_path)
+    with app.app_context():
+        start = time.perf_counter()
+        if mode == 'streamed':
+            pdf_file, error = PDFService.generate_tasks_report({})
+            if error:
+                raise RuntimeError(error)
+        else:
+            rows = [
+                [task.title, task.project_name, task.status, task.priority, task.assigned_to_name or 'Sin asignar',
+                 PDFService._format_date(task.due_date, 'Sin fecha'), PDFService._format_date(task.created_at)]
+                for task in TaskService.stream_tasks({})
+            ]
+            table = PDFService._create_table(
+                rows,
+                ['Título', 'Proyecto', 'Estado', 'Prioridad', 'Asignado', 'Fecha Límite', 'Creada'],
+                col_widths=[1.5*inch, 1*inch, 0.8*inch, 0.8*inch, 1*inch, 1*inch, 0.9*inch]
+            )
+            pdf_file = PDFService._build(SimpleDocTemplate(None, pagesize=A4), [table])
+        elapsed = time.perf_counter() - start
+        size = pdf_file.seek(0, os.SEEK_END)
+        pdf_file.close()
+    return {
+        'seconds': elapsed,
+        'pdf_mb': size / 1024 / 1024,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def measure(database_path, mode):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode, database_path],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del reporte PDF de tareas')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--legacy-max', type=int, default=10000,
+                        help='Tamaño máximo para medir la tabla única (crece de forma súper-lineal)')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'DB'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child[1], args.child[0])))
+        return
+
+    workdir = tempfile.mkdtemp(prefix='bench_pdf_')
+    print(f"{'tareas':>8} {'modo':<9} {'tiempo':>9} {'PDF':>8} {'RSS máx':>9}")
+    for size in args.sizes:
+        database_path = os.path.join(workdir, f'tasks_{size}.db')
+        seed(database_path, size)
+        modes = ['streamed'] + (['legacy'] if size <= args.legacy_max else [])
+        for mode in modes:
+            result = measure(database_path, mode)
+            print(f"{size:>8} {mode:<9} {result['seconds']:8.2f}s {result['pdf_mb']:6.1f}MB {result['max_rss_mb']:7.1f}MB")
+        os.remove(database_path)
+    os.rmdir(workdir)
+
+
+if __name__ == '__main__':
+    main()
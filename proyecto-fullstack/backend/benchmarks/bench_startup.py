@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque de la API (importación de app + create_app())
+
+Cada medición se hace en un proceso nuevo para medir un arranque en frío real:
+tiempo de importación, tiempo de create_app(), memoria residente máxima y si el
+stack de reportes (ReportLab / matplotlib) quedó cargado.
+
+Escenarios:
+    api        arranque normal (el stack de reportes se carga en la primera petición de PDF)
+    first-pdf  arranque + carga del servicio de PDFs (costo que paga la primera petición)
+    eager      arranque importando ReportLab y matplotlib por adelantado (comportamiento anterior)
+
+Uso:
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Código ejecutado en el proceso hijo; imprime una línea JSON con las mediciones
+CHILD = r'''
+import json, resource, sys, time
+scenario = sys.argv[1]
+start = time.perf_counter()
+if scenario == 'eager':
+    import reportlab.platypus, reportlab.graphics.charts.barcharts
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot
+    except ImportError:
+        pass
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app('testing')
+created = time.perf_counter()
+first_pdf_ms = None
+if scenario == 'first-pdf':
+    import services.pdf_service
+    first_pdf_ms = (time.perf_counter() - created) * 1000
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_pdf_ms': first_pdf_ms,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'reportlab': 'reportlab' in sys.modules,
+    'matplotlib': 'matplotlib' in sys.modules
+}))
+'''
+
+SCENARIOS = ['api', 'first-pdf', 'eager']
+
+
+def measure(scenario):
+    env = dict(os.environ, FLASK_ENV='testing', PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD, scenario],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de arranque de create_app()')
+    parser.add_argument('--runs', type=int, default=5, help='Arranques por escenario')
+    parser.add_argument('--scenario', choices=SCENARIOS, action='append',
+                        help='Escenario a medir (por defecto todos)')
+    args = parser.parse_args()
+
+    # Un arranque previo para que los .pyc y la caché del sistema de archivos estén calientes
+    measure('eager')
+
+    print(f"{'escenario':<10} {'import':>10} {'create_app':>11} {'1er PDF':>9} {'RSS máx':>9}  cargado")
+    for scenario in args.scenario or SCENARIOS:
+        samples = [measure(scenario) for _ in range(args.runs)]
+        median = lambda key: statistics.median(sample[key] for sample in samples)
+        first_pdf = f"{median('first_pdf_ms'):7.0f}ms" if samples[0]['first_pdf_ms'] is not None else f"{'-':>9}"
+        loaded = [name for name in ('reportlab', 'matplotlib') if samples[0][name]] or ['-']
+        print(
+            f"{scenario:<10} {median('import_ms'):8.0f}ms {median('create_app_ms'):9.0f}ms "
+            f"{first_pdf} {median('max_rss_mb'):7.1f}MB  {', '.join(loaded)}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga del servidor WSGI de producción (gunicorn.conf.py)
+
+Levanta Gunicorn con distinto número de workers, genera carga concurrente desde
+varios procesos cliente y muestra el throughput y la latencia para cada caso.
+
+Uso:
+    python benchmarks/bench_wsgi.py
+    python benchmarks/bench_wsgi.py --workers 1 2 4 8 --path /api/metrics/overview --token <jwt>
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from sqlalchemy import create_engine
+from config import detect_cpu_count
+from database import db
+from models.user import User  # noqa: F401 (registrar tablas en db.metadata)
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+
+
+def free_port():
+    """Obtener un puerto libre en localhost"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, timeout=30):
+    """Esperar a que el servidor responda en /health"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def client(port, path, token, duration, results):
+    """Proceso cliente: peticiones secuenciales con keep-alive durante `duration` segundos"""
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    results.put((latencies, errors))
+
+
+def run_load(port, path, token, clients, duration):
+    """Lanzar los procesos cliente y agregar sus resultados"""
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=client, args=(port, path, token, duration, results))
+        for _ in range(clients)
+    ]
+    for process in processes:
+        process.start()
+    latencies, errors = [], 0
+    for _ in processes:
+        client_latencies, client_errors = results.get()
+        latencies.extend(client_latencies)
+        errors += client_errors
+    for process in processes:
+        process.join()
+    return latencies, errors
+
+
+def main():
+    cpus = detect_cpu_count()
+    default_workers = sorted({1, 2, cpus, cpus * 2 + 1})
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers, help='Cantidades de workers a probar')
+    parser.add_argument('--threads', type=int, default=None, help='Hilos por worker (por defecto WSGI_THREADS)')
+    parser.add_argument('--clients', type=int, default=max(4, cpus * 2), help='Procesos cliente concurrentes')
+    parser.add_argument('--duration', type=float, default=10, help='Segundos de carga por escenario')
+    parser.add_argument('--path', default='/health', help='Ruta a consultar')
+    parser.add_argument('--token', help='JWT para rutas protegidas')
+    parser.add_argument('--database-url', help='Base de datos (por defecto SQLite temporal)')
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_wsgi.db')}"
+    db.metadata.create_all(create_engine(database_url))
+
+    print(f"🖥️  CPUs detectadas: {cpus} | clientes: {args.clients} | ruta: {args.path}")
+    rows = []
+    for workers in args.workers:
+        port = free_port()
+        env = dict(
+            os.environ,
+            FLASK_ENV='production',
+            DATABASE_URL=database_url,
+            WSGI_BIND=f'127.0.0.1:{port}',
+            WSGI_WORKERS=str(workers),
+            WSGI_MAX_REQUESTS='0'
+        )
+        if args.threads:
+            env['WSGI_THREADS'] = str(args.threads)
+
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application'],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            if not wait_until_ready(port):
+                print(f"❌ Gunicorn no respondió con {workers} workers")
+                continue
+            latencies, errors = run_load(port, args.path, args.token, args.clients, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+
+        throughput = len(latencies) / args.duration
+        p50 = statistics.median(latencies) if latencies else 0
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else p50
+        rows.append((workers, throughput, p50, p95, errors))
+        print(f"   {workers} workers: {throughput:,.0f} req/s")
+
+    print("\n" + "=" * 70)
+    print(f"{'Workers':>8}{'req/s':>12}{'Escala':>10}{'p50 (ms)':>12}{'p95 (ms)':>12}{'Errores':>10}")
+    print("=" * 70)
+    baseline = rows[0][1] if rows else 0
+    for workers, throughput, p50, p95, errors in rows:
+        scale = throughput / baseline if baseline else 0
+        print(f"{workers:>8}{throughput:>12,.0f}{scale:>9.2f}x{p50:>12.2f}{p95:>12.2f}{errors:>10}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
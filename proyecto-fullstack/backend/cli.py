@@ -0,0 +1,81 @@
+"""
+Comandos de mantenimiento (flask <comando>)
+"""
+import click
+from services.token_cleanup_service import TokenCleanupService, DEFAULT_BATCH_SIZE
+from services.project_stats_service import ProjectStatsService
+from services.notification_service import NotificationService
+from services.notification_retention_service import NotificationRetentionService, MODES, DEFAULT_BATCH_SIZE as RETENTION_BATCH_SIZE
+
+
+def register_commands(app):
+    """Registrar los comandos de CLI en la aplicación"""
+
+    @app.cli.command('purge-tokens')
+    @click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+                  help='Filas eliminadas por transacción')
+    def purge_tokens(batch_size):
+        """Eliminar tokens revocados expirados y tokens de reseteo usados o vencidos"""
+        result, error = TokenCleanupService.purge_expired_tokens(batch_size)
+        if error:
+            raise click.ClickException(error)
+        if result['skipped']:
+            click.echo("⏳ Ya hay una purga de tokens en curso en otro proceso; no se hizo nada")
+            return
+
+        for table, deleted in result['deleted'].items():
+            click.echo(
+                f"🧹 {table}: {result['before'][table]} -> {result['after'][table]} filas "
+                f"({deleted} eliminadas)"
+            )
+
+    @app.cli.command('rebuild-project-stats')
+    @click.option('--project-id', default=None, help='Reconstruir solo este proyecto')
+    def rebuild_project_stats(project_id):
+        """Recalcular la tabla project_stats desde las tareas y comentarios"""
+        result, error = ProjectStatsService.rebuild(project_id)
+        if error:
+            raise click.ClickException(error)
+
+        click.echo(
+            f"📊 project_stats: {result['checked']} proyectos revisados, "
+            f"{result['fixed']} corregidos, {result['created']} creados"
+        )
+
+    @app.cli.command('repair-notification-counters')
+    @click.option('--user-id', default=None, help='Reparar solo el contador de este usuario')
+    def repair_notification_counters(user_id):
+        """Recalcular los contadores de notificaciones no leídas desde la tabla notifications"""
+        result, error = NotificationService.repair_unread_counters(user_id)
+        if error:
+            raise click.ClickException(error)
+
+        click.echo(
+            f"🔔 notification_counters: {result['checked']} revisados, "
+            f"{result['fixed']} corregidos, {result['created']} creados"
+        )
+
+    @app.cli.command('purge-notifications')
+    @click.option('--days', type=int, default=None,
+                  help='Antigüedad mínima en días (por defecto NOTIFICATION_RETENTION_DAYS)')
+    @click.option('--mode', type=click.Choice(MODES), default=None,
+                  help='delete o archive (por defecto NOTIFICATION_RETENTION_MODE)')
+    @click.option('--batch-size', default=RETENTION_BATCH_SIZE, show_default=True,
+                  help='Filas retiradas por transacción')
+    def purge_notifications(days, mode, batch_size):
+        """Archivar o eliminar las notificaciones leídas más antiguas que la retención"""
+        result, error = NotificationRetentionService.purge_read_notifications(days, mode, batch_size)
+        if error:
+            raise click.ClickException(error)
+        if result['cutoff'] is None:
+            click.echo("🔕 Retención desactivada (0 días): no se retiró ninguna notificación")
+            return
+        if result['skipped']:
+            click.echo("⏳ Ya hay una pasada de retención en curso en otro proceso; no se hizo nada")
+            return
+
+        action = 'archivadas' if result['mode'] == 'archive' else 'eliminadas'
+        click.echo(
+            f"🧹 notifications: {result['retired']} leídas anteriores a "
+            f"{result['cutoff']:%Y-%m-%d %H:%M} {action} en {result['batches']} lotes"
+        )
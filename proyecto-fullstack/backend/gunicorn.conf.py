@@ -0,0 +1,58 @@
+"""
+Configuración de Gunicorn (servidor WSGI de producción)
+Los valores se leen de config.ProductionConfig y pueden ajustarse con variables de entorno:
+WSGI_BIND, WSGI_WORKERS, WSGI_THREADS, WSGI_WORKER_CLASS, WSGI_PRELOAD, WSGI_TIMEOUT,
+WSGI_GRACEFUL_TIMEOUT, WSGI_KEEPALIVE, WSGI_MAX_REQUESTS, WSGI_MAX_REQUESTS_JITTER
+"""
+import os
+import shutil
+import tempfile
+from config import ProductionConfig
+
+# Métricas Prometheus compartidas entre workers: debe definirse antes de cargar la aplicación
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'nutrabiotics-metrics')
+)
+shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+wsgi_app = 'wsgi:application'
+
+bind = ProductionConfig.WSGI_BIND
+workers = ProductionConfig.WSGI_WORKERS
+threads = ProductionConfig.WSGI_THREADS
+worker_class = ProductionConfig.WSGI_WORKER_CLASS
+
+# Cargar la aplicación una vez en el proceso maestro y compartirla entre workers (fork)
+preload_app = ProductionConfig.WSGI_PRELOAD
+
+# Reciclado gradual: el jitter evita que todos los workers se reinicien a la vez
+max_requests = ProductionConfig.WSGI_MAX_REQUESTS
+max_requests_jitter = ProductionConfig.WSGI_MAX_REQUESTS_JITTER
+timeout = ProductionConfig.WSGI_TIMEOUT
+graceful_timeout = ProductionConfig.WSGI_GRACEFUL_TIMEOUT
+keepalive = ProductionConfig.WSGI_KEEPALIVE
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """
+    Descartar las conexiones heredadas del proceso maestro
+    Con preload_app el pool de SQLAlchemy se crea antes del fork y no debe compartirse
+    """
+    if not preload_app:
+        return
+
+    from database import db
+    from wsgi import application
+
+    with application.app_context():
+        db.engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Descartar los gauges del worker que terminó (reciclado o caída)"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,40 @@
+"""índices compuestos para las columnas de filtrado frecuentes
+
+Revision ID: 0002_indices_compuestos
+Revises: 0001_esquema_inicial
+Create Date: 2026-10-17 01:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_indices_compuestos'
+down_revision = '0001_esquema_inicial'
+branch_labels = None
+depends_on = None
+
+
+# (nombre, tabla, columnas) según la forma de las consultas de los servicios
+INDEXES = [
+    ('ix_tasks_project_id_status', 'tasks', ['project_id', 'status']),
+    ('ix_tasks_assigned_to_status', 'tasks', ['assigned_to', 'status']),
+    ('ix_tasks_status_priority', 'tasks', ['status', 'priority']),
+    ('ix_tasks_created_at_id', 'tasks', ['created_at', 'id']),
+    ('ix_comments_task_id_is_deleted', 'comments', ['task_id', 'is_deleted']),
+    ('ix_notifications_user_id_unread', 'notifications', ['user_id', 'unread']),
+    ('ix_notifications_user_id_created_at_id', 'notifications', ['user_id', 'created_at', 'id']),
+    ('ix_projects_created_by', 'projects', ['created_by']),
+    ('ix_projects_status', 'projects', ['status']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,26 @@
+"""versión de rol en usuarios para invalidar tokens
+
+Revision ID: 0003_role_version_usuarios
+Revises: 0002_indices_compuestos
+Create Date: 2026-10-17 02:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_role_version_usuarios'
+down_revision = '0002_indices_compuestos'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('role_version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('role_version')
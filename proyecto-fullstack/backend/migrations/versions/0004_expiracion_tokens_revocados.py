@@ -0,0 +1,28 @@
+"""expiración de tokens revocados para poder purgarlos
+
+Revision ID: 0004_expiracion_tokens_revocados
+Revises: 0003_role_version_usuarios
+Create Date: 2026-10-17 02:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_expiracion_tokens_revocados'
+down_revision = '0003_role_version_usuarios'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('revoked_tokens', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_revoked_tokens_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('revoked_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_revoked_tokens_expires_at'))
+        batch_op.drop_column('expires_at')
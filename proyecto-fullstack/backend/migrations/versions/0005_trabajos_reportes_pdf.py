@@ -0,0 +1,46 @@
+"""trabajos de generación asíncrona de reportes PDF
+
+Revision ID: 0005_trabajos_reportes_pdf
+Revises: 0004_expiracion_tokens_revocados
+Create Date: 2026-10-17 03:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_trabajos_reportes_pdf'
+down_revision = '0004_expiracion_tokens_revocados'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('report_jobs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('report_type', sa.String(length=50), nullable=False),
+    sa.Column('params', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('progress', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('file_path', sa.String(length=500), nullable=True),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('report_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_report_jobs_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_report_jobs_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('report_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_report_jobs_user_id'))
+        batch_op.drop_index('ix_report_jobs_status_created_at')
+
+    op.drop_table('report_jobs')
@@ -0,0 +1,57 @@
+"""contadores de tareas por proyecto (project_stats)
+
+Revision ID: 0006_estadisticas_proyectos
+Revises: 0005_trabajos_reportes_pdf
+Create Date: 2026-10-17 05:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_estadisticas_proyectos'
+down_revision = '0005_trabajos_reportes_pdf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('project_stats',
+    sa.Column('project_id', sa.String(length=36), nullable=False),
+    sa.Column('total_tasks', sa.Integer(), nullable=False),
+    sa.Column('todo', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('review', sa.Integer(), nullable=False),
+    sa.Column('done', sa.Integer(), nullable=False),
+    sa.Column('low_priority', sa.Integer(), nullable=False),
+    sa.Column('medium_priority', sa.Integer(), nullable=False),
+    sa.Column('high_priority', sa.Integer(), nullable=False),
+    sa.Column('comments_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+    # Carga inicial desde las tareas existentes (equivale a flask rebuild-project-stats)
+    op.execute("""
+        INSERT INTO project_stats (project_id, total_tasks, todo, in_progress, review, done,
+                                   low_priority, medium_priority, high_priority, comments_count)
+        SELECT p.id,
+               COUNT(t.id),
+               COALESCE(SUM(CASE WHEN t.status = 'todo' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.status = 'in_progress' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.status = 'review' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.status = 'done' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.priority = 'low' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.priority = 'medium' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.priority = 'high' THEN 1 ELSE 0 END), 0),
+               COALESCE((SELECT COUNT(c.id) FROM comments c JOIN tasks ct ON ct.id = c.task_id
+                         WHERE ct.project_id = p.id AND (c.is_deleted = false OR c.is_deleted IS NULL)), 0)
+        FROM projects p
+        LEFT JOIN tasks t ON t.project_id = p.id
+        GROUP BY p.id
+    """)
+
+
+def downgrade():
+    op.drop_table('project_stats')
@@ -0,0 +1,38 @@
+"""contador de notificaciones no leídas por usuario
+
+Revision ID: 0007_contadores_notificaciones
+Revises: 0006_estadisticas_proyectos
+Create Date: 2026-10-17 06:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_contadores_notificaciones'
+down_revision = '0006_estadisticas_proyectos'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_counters',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('unread', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Carga inicial (equivale a flask repair-notification-counters)
+    op.execute("""
+        INSERT INTO notification_counters (user_id, unread)
+        SELECT user_id, COUNT(id)
+        FROM notifications
+        WHERE unread = true
+        GROUP BY user_id
+    """)
+
+
+def downgrade():
+    op.drop_table('notification_counters')
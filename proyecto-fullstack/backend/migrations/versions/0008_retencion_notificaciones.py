@@ -0,0 +1,44 @@
+"""archivo de notificaciones e índice parcial para la retención
+
+Revision ID: 0008_retencion_notificaciones
+Revises: 0007_contadores_notificaciones
+Create Date: 2026-10-17 08:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_retencion_notificaciones'
+down_revision = '0007_contadores_notificaciones'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notifications_archive',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notifications_archive_user_id_created_at', 'notifications_archive',
+                    ['user_id', 'created_at'], unique=False)
+
+    # Solo las notificaciones leídas: la purga por antigüedad no recorre la tabla completa
+    op.create_index('ix_notifications_read_created_at', 'notifications', ['created_at'], unique=False,
+                    postgresql_where=sa.text('NOT unread'), sqlite_where=sa.text('NOT unread'))
+
+
+def downgrade():
+    op.drop_index('ix_notifications_read_created_at', table_name='notifications')
+    op.drop_index('ix_notifications_archive_user_id_created_at', table_name='notifications_archive')
+    op.drop_table('notifications_archive')
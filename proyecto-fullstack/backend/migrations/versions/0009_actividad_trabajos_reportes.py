@@ -0,0 +1,26 @@
+"""última actividad de los trabajos de reportes PDF
+
+Revision ID: 0009_actividad_trabajos_reportes
+Revises: 0008_retencion_notificaciones
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_actividad_trabajos_reportes'
+down_revision = '0008_retencion_notificaciones'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('report_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('report_jobs', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
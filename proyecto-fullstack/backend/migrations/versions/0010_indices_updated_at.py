@@ -0,0 +1,34 @@
+"""índices de updated_at para la huella de la caché de reportes
+
+Revision ID: 0010_indices_updated_at
+Revises: 0009_actividad_trabajos_reportes
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_indices_updated_at'
+down_revision = '0009_actividad_trabajos_reportes'
+branch_labels = None
+depends_on = None
+
+
+# max(updated_at) se resuelve leyendo el último valor del índice
+INDEXES = [
+    ('ix_tasks_updated_at', 'tasks', ['updated_at']),
+    ('ix_projects_updated_at', 'projects', ['updated_at']),
+    ('ix_users_updated_at', 'users', ['updated_at']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
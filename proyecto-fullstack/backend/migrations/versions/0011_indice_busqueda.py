@@ -0,0 +1,70 @@
+"""columnas search_vector e índices GIN de búsqueda de texto completo (PostgreSQL)
+
+Revision ID: 0011_indice_busqueda
+Revises: 0010_indices_updated_at
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+import re
+from alembic import op
+from flask import current_app
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_indice_busqueda'
+down_revision = '0010_indices_updated_at'
+branch_labels = None
+depends_on = None
+
+
+# tabla -> columnas de texto (en orden de peso); igual que SEARCH_TABLES de SearchService
+SEARCH_TABLES = {
+    'tasks': ('title', 'description'),
+    'projects': ('name', 'description'),
+    'comments': ('content',)
+}
+SEARCH_WEIGHTS = ('A', 'B', 'C', 'D')
+
+
+def _language():
+    # El idioma queda fijado en la columna generada; cambiarlo requiere otra migración
+    language = current_app.config.get('SEARCH_LANGUAGE', 'spanish')
+    if not re.fullmatch(r'\w+', language):
+        raise ValueError(f"SEARCH_LANGUAGE inválido: {language}")
+    return language
+
+
+def upgrade():
+    # En SQLite el índice son tablas FTS5 que crea SearchService al iniciar
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    language = _language()
+    for table, columns in SEARCH_TABLES.items():
+        vector = ' || '.join(
+            f"setweight(to_tsvector('{language}', coalesce({column}, '')), '{weight}')"
+            for column, weight in zip(columns, SEARCH_WEIGHTS)
+        )
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({vector}) STORED"
+        )
+
+    # CONCURRENTLY no admite transacción: los índices se crean sin bloquear escrituras
+    with op.get_context().autocommit_block():
+        for table in SEARCH_TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search_vector "
+                f"ON {table} USING GIN (search_vector)"
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_search_vector")
+    for table in SEARCH_TABLES:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,62 @@
+"""secuencia de inserción de notificaciones (id de los eventos SSE)
+
+Revision ID: 0012_secuencia_notificaciones
+Revises: 0011_indice_busqueda
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_secuencia_notificaciones'
+down_revision = '0011_indice_busqueda'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    op.add_column('notifications', sa.Column('seq', sa.BigInteger(), nullable=True))
+
+    # Filas existentes numeradas en orden cronológico
+    if dialect == 'postgresql':
+        op.execute("CREATE SEQUENCE notifications_seq_seq OWNED BY notifications.seq")
+        op.execute("""
+            UPDATE notifications AS n SET seq = o.rn
+            FROM (SELECT id, row_number() OVER (ORDER BY created_at, id) AS rn FROM notifications) AS o
+            WHERE n.id = o.id
+        """)
+        op.execute("SELECT setval('notifications_seq_seq', COALESCE((SELECT MAX(seq) FROM notifications), 0) + 1, false)")
+        op.execute("ALTER TABLE notifications ALTER COLUMN seq SET DEFAULT nextval('notifications_seq_seq')")
+        with op.get_context().autocommit_block():
+            op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notifications_user_id_seq ON notifications (user_id, seq)")
+    else:
+        op.execute("""
+            UPDATE notifications SET seq = (
+                SELECT COUNT(*) FROM notifications AS o
+                WHERE (o.created_at, o.id) <= (notifications.created_at, notifications.id)
+            )
+        """)
+        if dialect == 'sqlite':
+            op.execute(
+                "CREATE TRIGGER notifications_seq_ai AFTER INSERT ON notifications WHEN new.seq IS NULL "
+                "BEGIN UPDATE notifications SET seq = (SELECT COALESCE(MAX(seq), 0) + 1 FROM notifications) "
+                "WHERE rowid = new.rowid; END"
+            )
+        op.create_index('ix_notifications_user_id_seq', 'notifications', ['user_id', 'seq'], unique=False)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notifications_user_id_seq")
+    else:
+        op.drop_index('ix_notifications_user_id_seq', table_name='notifications')
+        if dialect == 'sqlite':
+            op.execute("DROP TRIGGER IF EXISTS notifications_seq_ai")
+    # En PostgreSQL la secuencia pertenece a la columna y se elimina con ella
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_column('seq')
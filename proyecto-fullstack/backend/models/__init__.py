@@ -7,6 +7,10 @@ from .task import Task
 from .comment import Comment
 from .password_reset_token import PasswordResetToken
 from .revoked_token import RevokedToken
+from .report_job import ReportJob
+from .project_stats import ProjectStats
+from .notification_counter import NotificationCounter
+from .notification_archive import NotificationArchive
 
 __all__ = [
     'User',
@@ -14,5 +18,9 @@ __all__ = [
     'Task',
     'Comment',
     'PasswordResetToken',
-    'RevokedToken'
+    'RevokedToken',
+    'ReportJob',
+    'ProjectStats',
+    'NotificationCounter',
+    'NotificationArchive'
 ]
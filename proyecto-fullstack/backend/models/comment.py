@@ -6,6 +6,10 @@ from database import db
 
 class Comment(db.Model):
     __tablename__ = 'comments'
+    __table_args__ = (
+        # Conteo de comentarios no eliminados por tarea
+        db.Index('ix_comments_task_id_is_deleted', 'task_id', 'is_deleted'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     content = db.Column(db.Text, nullable=False)
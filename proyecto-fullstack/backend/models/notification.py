@@ -2,10 +2,22 @@
 Modelo de Notificación
 """
 import uuid
+from datetime import datetime
+from sqlalchemy import DDL, event
 from database import db
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # Contador de no leídas y listado por usuario ordenado por fecha
+        db.Index('ix_notifications_user_id_unread', 'user_id', 'unread'),
+        db.Index('ix_notifications_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        # Retención: solo las leídas, candidatas a archivarse o borrarse por antigüedad
+        db.Index('ix_notifications_read_created_at', 'created_at',
+                 postgresql_where=db.text('NOT unread'), sqlite_where=db.text('NOT unread')),
+        # Reanudación del stream SSE desde Last-Event-ID
+        db.Index('ix_notifications_user_id_seq', 'user_id', 'seq'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -14,8 +26,14 @@ class Notification(db.Model):
     type = db.Column(db.String(50), nullable=False, default='info')  # 'info', 'success', 'warning', 'error'
     category = db.Column(db.String(50), nullable=False, default='system')  # 'task', 'project', 'meeting', 'system'
     unread = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+    # Hora de Python: mismo formato de texto en SQLite para la paginación por cursor
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Orden de inserción asignado por la base (secuencia en PostgreSQL, trigger en SQLite):
+    # es el id de los eventos SSE. created_at no sirve: se fija antes del commit, así que una
+    # transacción lenta confirma filas "anteriores" a eventos ya enviados (y los empates se
+    # desharían por un UUID aleatorio)
+    seq = db.Column(db.BigInteger, server_default=db.FetchedValue())
     
     # Relaciones
     user = db.relationship('User', back_populates='notifications')
@@ -36,3 +54,17 @@ class Notification(db.Model):
 
     def __repr__(self):
         return f'<Notification {self.title}>'
+
+
+# Con db.create_all (desarrollo y pruebas); en producción lo crea la migración 0012
+event.listen(Notification.__table__, 'after_create', DDL(
+    "CREATE TRIGGER notifications_seq_ai AFTER INSERT ON notifications WHEN new.seq IS NULL "
+    "BEGIN UPDATE notifications SET seq = (SELECT COALESCE(MAX(seq), 0) + 1 FROM notifications) "
+    "WHERE rowid = new.rowid; END"
+).execute_if(dialect='sqlite'))
+event.listen(Notification.__table__, 'after_create', DDL(
+    "CREATE SEQUENCE notifications_seq_seq OWNED BY notifications.seq"
+).execute_if(dialect='postgresql'))
+event.listen(Notification.__table__, 'after_create', DDL(
+    "ALTER TABLE notifications ALTER COLUMN seq SET DEFAULT nextval('notifications_seq_seq')"
+).execute_if(dialect='postgresql'))
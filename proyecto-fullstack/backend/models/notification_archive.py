@@ -0,0 +1,23 @@
+"""
+Modelo de Notificación archivada (notificaciones leídas retiradas por la política de retención)
+"""
+from database import db
+
+class NotificationArchive(db.Model):
+    __tablename__ = 'notifications_archive'
+    __table_args__ = (
+        db.Index('ix_notifications_archive_user_id_created_at', 'user_id', 'created_at'),
+    )
+    
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    type = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<NotificationArchive {self.title}>'
@@ -0,0 +1,13 @@
+"""
+Modelo de Contador de Notificaciones (no leídas por usuario, mantenido por NotificationService)
+"""
+from database import db
+
+class NotificationCounter(db.Model):
+    __tablename__ = 'notification_counters'
+    
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    unread = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<NotificationCounter {self.user_id} {self.unread}>'
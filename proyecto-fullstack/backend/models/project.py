@@ -2,10 +2,18 @@
 Modelo de Proyecto
 """
 import uuid
+from datetime import datetime
 from database import db
 
+# Avance de un proyecto sin fila en project_stats (sin tareas o aún no reconciliado)
+EMPTY_PROGRESS = {'task_count': 0, 'completed_task_count': 0, 'progress': 0}
+
 class Project(db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (
+        db.Index('ix_projects_created_by', 'created_by'),
+        db.Index('ix_projects_status', 'status'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(200), nullable=False)
@@ -17,14 +25,21 @@ class Project(db.Model):
     end_date = db.Column(db.Date, nullable=True)
     created_by = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), 
-                          onupdate=db.func.current_timestamp())
+    # Hora de Python (con microsegundos): la huella de la caché de reportes usa max(updated_at)
+    # y current_timestamp de SQLite solo tiene resolución de un segundo
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relaciones
     tasks = db.relationship('Task', backref='project', lazy=True, cascade='all, delete-orphan')
+    stats = db.relationship('ProjectStats', uselist=False, lazy=True, cascade='all, delete-orphan')
 
-    def to_dict(self, include_tasks=False):
-        """Convertir a diccionario"""
+    def to_dict(self, include_tasks=False, comments_count=None, stats=None, include_progress=False):
+        """
+        Convertir a diccionario
+        comments_count: mapa opcional {task_id: comentarios} precalculado
+        stats: ProjectStats opcional para incluir el avance (task_count, progress)
+        include_progress: incluir el avance aunque no haya stats (en 0)
+        """
         result = {
             'id': self.id,
             'name': self.name,
@@ -37,8 +52,19 @@ class Project(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
         
+        if stats is not None:
+            result.update(stats.progress_dict())
+        elif include_progress:
+            result.update(EMPTY_PROGRESS)
+        
         if include_tasks:
-            result['tasks'] = [task.to_dict() for task in self.tasks]
+            if comments_count is None:
+                result['tasks'] = [task.to_dict() for task in self.tasks]
+            else:
+                result['tasks'] = [
+                    task.to_dict(comments_count=comments_count.get(task.id, 0))
+                    for task in self.tasks
+                ]
             
         return result
 
@@ -0,0 +1,38 @@
+"""
+Modelo de Estadísticas de Proyecto (contadores mantenidos por TaskService)
+"""
+from database import db
+
+class ProjectStats(db.Model):
+    __tablename__ = 'project_stats'
+    
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    total_tasks = db.Column(db.Integer, nullable=False, default=0)
+    todo = db.Column(db.Integer, nullable=False, default=0)
+    in_progress = db.Column(db.Integer, nullable=False, default=0)
+    review = db.Column(db.Integer, nullable=False, default=0)
+    done = db.Column(db.Integer, nullable=False, default=0)
+    low_priority = db.Column(db.Integer, nullable=False, default=0)
+    medium_priority = db.Column(db.Integer, nullable=False, default=0)
+    high_priority = db.Column(db.Integer, nullable=False, default=0)
+    comments_count = db.Column(db.Integer, nullable=False, default=0)
+
+    COUNTERS = ('total_tasks', 'todo', 'in_progress', 'review', 'done',
+                'low_priority', 'medium_priority', 'high_priority', 'comments_count')
+
+    def counters(self):
+        """Contadores como diccionario (0 si la fila aún no se ha guardado)"""
+        return {counter: getattr(self, counter) or 0 for counter in self.COUNTERS}
+
+    def progress_dict(self):
+        """Resumen de avance usado en el listado de proyectos"""
+        total = self.total_tasks or 0
+        done = self.done or 0
+        return {
+            'task_count': total,
+            'completed_task_count': done,
+            'progress': round(done * 100 / total, 1) if total else 0
+        }
+
+    def __repr__(self):
+        return f'<ProjectStats {self.project_id}>'
@@ -0,0 +1,53 @@
+"""
+Modelo de Trabajo de Reporte PDF (generación asíncrona)
+"""
+import json
+import uuid
+from datetime import datetime
+from database import db
+
+class ReportJob(db.Model):
+    __tablename__ = 'report_jobs'
+    __table_args__ = (
+        db.Index('ix_report_jobs_status_created_at', 'status', 'created_at'),
+    )
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    report_type = db.Column(db.String(50), nullable=False)  # 'project', 'tasks', 'general', 'metrics', 'custom'
+    params = db.Column(db.Text, nullable=False, default='{}')  # JSON con los parámetros del reporte
+    status = db.Column(db.String(20), nullable=False, default='queued')  # 'queued', 'running', 'done', 'failed'
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    file_path = db.Column(db.String(500))
+    file_size = db.Column(db.Integer)
+    # Fechas en UTC desde Python: ReportJobService las compara con datetime.utcnow() y
+    # current_timestamp de PostgreSQL sigue la zona horaria del servidor
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    # Última escritura del worker (estado o progreso): detecta trabajos huérfanos
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def get_params(self):
+        """Parámetros del reporte como diccionario"""
+        return json.loads(self.params or '{}')
+
+    def to_dict(self):
+        """Convertir a diccionario"""
+        return {
+            'id': self.id,
+            'report_type': self.report_type,
+            'params': self.get_params(),
+            'status': self.status,
+            'progress': self.progress,
+            'error': self.error,
+            'file_size': self.file_size,
+            'download_url': f'/api/pdf/jobs/{self.id}/download' if self.status == 'done' else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<ReportJob {self.id} {self.status}>'
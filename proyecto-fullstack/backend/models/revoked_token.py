@@ -10,6 +10,8 @@ class RevokedToken(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     jti = db.Column(db.String(120), nullable=False, unique=True, index=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    # Expiración del JWT revocado (claim exp); pasada esta fecha la fila puede purgarse
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)
 
     @classmethod
     def is_jti_blacklisted(cls, jti):
@@ -2,10 +2,19 @@
 Modelo de Tarea
 """
 import uuid
+from datetime import datetime
 from database import db
 
 class Task(db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Listados y estadísticas por proyecto / usuario / estado
+        db.Index('ix_tasks_project_id_status', 'project_id', 'status'),
+        db.Index('ix_tasks_assigned_to_status', 'assigned_to', 'status'),
+        db.Index('ix_tasks_status_priority', 'status', 'priority'),
+        # Paginación por cursor (created_at, id)
+        db.Index('ix_tasks_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
@@ -17,15 +26,32 @@ class Task(db.Model):
     project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False)
     assigned_to = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
     due_date = db.Column(db.Date, nullable=True)
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), 
-                          onupdate=db.func.current_timestamp())
+    # Hora de Python: en SQLite todas las filas quedan con el mismo formato de texto y la
+    # paginación por cursor puede comparar la columna directamente (ix_tasks_created_at_id)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Hora de Python (con microsegundos): la huella de la caché de reportes usa max(updated_at)
+    # y current_timestamp de SQLite solo tiene resolución de un segundo
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relaciones
     comments = db.relationship('Comment', backref='task', lazy=True, cascade='all, delete-orphan')
 
-    def to_dict(self, include_comments=False):
+    @staticmethod
+    def comments_count_query(project_id=None):
+        """Consulta agrupada con el número de comentarios no eliminados por tarea"""
+        from models.comment import Comment
+        query = db.session.query(
+            Comment.task_id,
+            db.func.count(Comment.id).label('comments_count')
+        ).filter(db.or_(Comment.is_deleted == False, Comment.is_deleted.is_(None)))
+        if project_id:
+            query = query.join(Task, Task.id == Comment.task_id).filter(Task.project_id == project_id)
+        return query.group_by(Comment.task_id)
+
+    def to_dict(self, include_comments=False, comments_count=None):
         """Convertir a diccionario"""
+        if comments_count is None:
+            comments_count = len([c for c in self.comments if not c.is_deleted])
         result = {
             'id': self.id,
             'title': self.title,
@@ -37,7 +63,7 @@ class Task(db.Model):
             'due_date': self.due_date.isoformat() if self.due_date else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'commentsCount': len([c for c in self.comments if not c.is_deleted])
+            'commentsCount': comments_count
         }
         if include_comments:
             result['comments'] = [comment.to_dict() for comment in self.comments if not comment.is_deleted]
@@ -2,6 +2,7 @@
 Modelo de Usuario
 """
 import uuid
+from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from database import db
 
@@ -15,9 +16,12 @@ class User(db.Model):
     role = db.Column(db.Enum('admin', 'project_manager', 'developer', name='user_roles'), 
                      nullable=False, default='developer')
     is_active = db.Column(db.Boolean, default=True)
+    # Se incrementa al cambiar el rol o desactivar al usuario para invalidar sus tokens
+    role_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), 
-                          onupdate=db.func.current_timestamp())
+    # Hora de Python (con microsegundos): la huella de la caché de reportes usa max(updated_at)
+    # y current_timestamp de SQLite solo tiene resolución de un segundo
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relaciones
     assigned_tasks = db.relationship('Task', backref='assignee', lazy=True, foreign_keys='Task.assigned_to')
@@ -88,8 +88,8 @@ def refresh():
 def logout():
     """Logout de usuarios"""
     try:
-        jti = get_jwt()['jti']
-        success, error = AuthService.logout(jti)
+        token = get_jwt()
+        success, error = AuthService.logout(token['jti'], token.get('exp'))
         
         if error:
             return jsonify({'success': False, 'message': error}), 500
@@ -0,0 +1,58 @@
+"""
+Rutas de exportación de datos (CSV / XLSX)
+"""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from datetime import datetime
+from services.export_service import ExportService, FORMATS
+from utils.streaming import stream_file, stream_generator
+
+export_bp = Blueprint('export', __name__)
+
+def _export(entity, filters, file_prefix):
+    """Responder con el archivo en el formato pedido (?format=csv|xlsx)"""
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in FORMATS:
+        return jsonify({'success': False, 'message': 'Formato inválido. Formatos válidos: csv, xlsx'}), 400
+    
+    download_name = f'{file_prefix}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_format}'
+    
+    if export_format == 'csv':
+        return stream_generator(ExportService.iter_csv(entity, filters), download_name, FORMATS['csv'])
+    
+    output, error = ExportService.build_xlsx(entity, filters)
+    if error:
+        return jsonify({'success': False, 'message': error}), 400
+    return stream_file(output, download_name, FORMATS['xlsx'])
+
+@export_bp.route('/export/tasks', methods=['GET'])
+@jwt_required()
+def export_tasks():
+    """Exportar tareas con los mismos filtros que el listado de tareas"""
+    try:
+        filters = {}
+        for field in ('project_id', 'assigned_to', 'status', 'priority', 'search'):
+            value = request.args.get(field)
+            if value:
+                filters[field] = value
+        
+        return _export('tasks', filters, 'tareas')
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error en el servidor: {str(e)}'}), 500
+
+@export_bp.route('/export/projects', methods=['GET'])
+@jwt_required()
+def export_projects():
+    """Exportar proyectos con su número de tareas"""
+    try:
+        filters = {}
+        for field in ('status', 'priority', 'created_by'):
+            value = request.args.get(field)
+            if value:
+                filters[field] = value
+        
+        return _export('projects', filters, 'proyectos')
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error en el servidor: {str(e)}'}), 500
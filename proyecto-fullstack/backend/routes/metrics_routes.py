@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from services.project_service import ProjectService
 from services.task_service import TaskService
+from services.stats_service import StatsService
 
 metrics_bp = Blueprint('metrics', __name__)
 
@@ -13,29 +14,15 @@ metrics_bp = Blueprint('metrics', __name__)
 def get_general_metrics():
     """Obtener métricas generales del sistema"""
     try:
-        # Obtener todas las estadísticas
-        project_metrics, p_error = ProjectService.get_all_projects_stats()
-        task_metrics, t_error = TaskService.get_all_tasks_stats()
+        # Proyectos y tareas agregados en una sola pasada por tabla
+        general_metrics, error = StatsService.get_overview()
         
-        if p_error or t_error:
+        if error:
             return jsonify({
                 'success': False, 
-                'message': f'Error obteniendo métricas: {p_error or t_error}'
+                'message': f'Error obteniendo métricas: {error}'
             }), 500
         
-        # Combinar métricas
-        general_metrics = {
-            'projects': project_metrics,
-            'tasks': task_metrics,
-            'summary': {
-                'total_projects': project_metrics.get('total_projects', 0),
-                'total_tasks': task_metrics.get('total_tasks', 0),
-                'completed_tasks': task_metrics.get('completed_tasks', 0),
-                'in_progress_tasks': task_metrics.get('in_progress_tasks', 0),
-                'pending_tasks': task_metrics.get('pending_tasks', 0)
-            }
-        }
-        
         return jsonify({
             'success': True,
             'data': general_metrics
@@ -2,9 +2,12 @@
 """
 Rutas para la gestión de notificaciones
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from services.notification_service import NotificationService
+from services.notification_service import BROADCAST_ROLES, NotificationService
+from utils.auth_decorators import require_role
+from utils.notification_bus import format_event, notification_bus
+from utils.pagination import decode_cursor, parse_limit
 
 # Crear blueprint
 notifications_bp = Blueprint('notifications', __name__, url_prefix='/notifications')
@@ -26,22 +29,38 @@ def delete_all_notifications():
 def get_notifications():
     """
     Obtener notificaciones del usuario autenticado
+    Paginación por cursor: next_cursor se envía como ?cursor= para la página siguiente
+    (offset se mantiene por compatibilidad)
     """
     try:
         user_id = get_jwt_identity()
         
         # Parámetros de consulta
-        limit = request.args.get('limit', 20, type=int)
-        offset = request.args.get('offset', 0, type=int)
         unread_only = request.args.get('unread_only', 'false').lower() == 'true'
+        next_cursor = None
         
-        # Obtener notificaciones
-        notifications = NotificationService.get_user_notifications(
-            user_id=user_id,
-            limit=limit,
-            offset=offset,
-            unread_only=unread_only
-        )
+        if 'offset' in request.args:
+            limit = request.args.get('limit', 20, type=int)
+            offset = request.args.get('offset', 0, type=int)
+            notifications = NotificationService.get_user_notifications(
+                user_id=user_id,
+                limit=limit,
+                offset=offset,
+                unread_only=unread_only
+            )
+        else:
+            try:
+                limit = parse_limit(request.args.get('limit'), default=20)
+                cursor = request.args.get('cursor')
+                cursor = decode_cursor(cursor) if cursor else None
+            except ValueError as e:
+                return jsonify({'success': False, 'message': str(e)}), 400
+            
+            success, page = NotificationService.get_notifications_page(user_id, limit, cursor, unread_only)
+            if not success:
+                return jsonify({'success': False, 'message': page}), 500
+            notifications = page['notifications']
+            next_cursor = page['next_cursor']
         
         # Obtener contador de no leídas
         unread_count = NotificationService.get_unread_count(user_id)
@@ -51,7 +70,8 @@ def get_notifications():
             'data': {
                 'notifications': notifications,
                 'unread_count': unread_count,
-                'total': len(notifications)
+                'total': len(notifications),
+                'next_cursor': next_cursor
             }
         }), 200
         
@@ -86,6 +106,59 @@ def get_unread_count():
         }), 500
 
 
+@notifications_bp.route('/stream', methods=['GET'])
+@jwt_required()
+def stream_notifications():
+    """
+    Stream SSE de notificaciones del usuario autenticado
+    Eventos: notification (con id para reanudar) y unread (delta o unread_count)
+    Con Last-Event-ID se reenvían las notificaciones creadas después de ese evento
+    """
+    user_id = get_jwt_identity()
+    
+    # Suscribirse antes de leer la base para no perder eventos publicados entre medio
+    subscription = notification_bus.subscribe(user_id)
+    if subscription is None:
+        response = jsonify({
+            'success': False,
+            'message': 'Demasiadas conexiones abiertas, intenta más tarde'
+        })
+        response.headers['Retry-After'] = str(notification_bus.heartbeat)
+        return response, 503
+    
+    try:
+        initial_events, replayed_ids = [], []
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        last_seq = NotificationService.parse_event_id(last_event_id) if last_event_id else None
+        if last_seq is not None:
+            backlog = NotificationService.get_notifications_since(
+                user_id, last_seq, limit=current_app.config.get('SSE_REPLAY_LIMIT', 100)
+            )
+            for notification in backlog:
+                event_id = NotificationService.event_id(notification)
+                replayed_ids.append(event_id)
+                initial_events.append(format_event('notification', notification.to_dict(), event_id))
+        initial_events.append(format_event('unread', {
+            'unread_count': NotificationService.get_unread_count(user_id)
+        }))
+    except Exception as e:
+        notification_bus.unsubscribe(subscription)
+        return jsonify({
+            'success': False,
+            'message': f'Error al abrir el stream de notificaciones: {str(e)}'
+        }), 500
+    
+    # El generador no usa la base de datos: la conexión vuelve al pool al terminar esta vista
+    response = Response(
+        notification_bus.stream(subscription, initial_events, replayed_ids),
+        mimetype='text/event-stream'
+    )
+    response.call_on_close(lambda: notification_bus.unsubscribe(subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @notifications_bp.route('/<notification_id>/read', methods=['PUT'])
 @jwt_required()
 def mark_notification_as_read(notification_id):
@@ -225,3 +298,79 @@ def create_notification():
             'success': False,
             'message': f'Error al crear notificación: {str(e)}'
         }), 500
+
+
+@notifications_bp.route('/broadcast', methods=['POST'])
+@require_role('admin', 'project_manager')
+def broadcast_notification():
+    """
+    Enviar la misma notificación a muchos usuarios
+    Destinatarios: user_ids (lista), role y/o project_id (asignados de sus tareas)
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No se proporcionaron datos'
+            }), 400
+        
+        title = data.get('title')
+        message = data.get('message')
+        user_ids = data.get('user_ids')
+        role = data.get('role')
+        project_id = data.get('project_id')
+        
+        if not title or not message:
+            return jsonify({
+                'success': False,
+                'message': 'Título y mensaje son requeridos'
+            }), 400
+        
+        if user_ids is not None and (not isinstance(user_ids, list) or
+                                     not all(isinstance(user_id, str) for user_id in user_ids)):
+            return jsonify({
+                'success': False,
+                'message': 'user_ids debe ser una lista de ids'
+            }), 400
+        
+        if not (user_ids or role or project_id):
+            return jsonify({
+                'success': False,
+                'message': 'Indica los destinatarios: user_ids, role o project_id'
+            }), 400
+        
+        if role and role not in BROADCAST_ROLES:
+            return jsonify({
+                'success': False,
+                'message': f"Rol inválido. Debe ser uno de: {', '.join(BROADCAST_ROLES)}"
+            }), 400
+        
+        success, result = NotificationService.broadcast(
+            title=title,
+            message=message,
+            notification_type=data.get('type', 'info'),
+            category=data.get('category', 'system'),
+            user_ids=user_ids,
+            role=role,
+            project_id=project_id
+        )
+        
+        if success:
+            return jsonify({
+                'success': True,
+                'message': f"Notificación enviada a {result['recipients']} usuarios",
+                'data': result
+            }), 201
+        else:
+            return jsonify({
+                'success': False,
+                'message': result
+            }), 500
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error al enviar notificaciones: {str(e)}'
+        }), 500
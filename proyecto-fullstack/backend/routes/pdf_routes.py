@@ -1,34 +1,119 @@
 """
 Rutas para exportación de reportes PDF
 """
-from flask import Blueprint, request, jsonify, send_file
-from flask_jwt_extended import jwt_required
-from services.pdf_service import PDFService
+from flask import Blueprint, request, jsonify, send_file, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.report_job_service import ReportJobService
+from services.task_service import TaskService
+from utils.report_cache import report_cache
+from utils.streaming import stream_file
 import os
 from datetime import datetime
 
 pdf_bp = Blueprint('pdf', __name__, url_prefix='/pdf')
 
-@pdf_bp.route('/report/project/<project_id>', methods=['GET'])
-@jwt_required()
-def generate_project_report(project_id):
-    """Generar reporte PDF de un proyecto específico"""
-    try:
-        # Generar el reporte
-        pdf_path, error = PDFService.generate_project_report(project_id)
+def _pdf_service():
+    """Cargar el servicio de PDFs (y ReportLab) solo cuando se genera un reporte"""
+    from services.pdf_service import PDFService
+    return PDFService
+
+def _should_run_async(filters):
+    """
+    Decidir si el reporte se genera en segundo plano
+    ?async=true lo fuerza; si no, se usa el número de tareas frente a PDF_ASYNC_THRESHOLD
+    filters=None: el reporte no lista tareas y solo pasa a segundo plano si se fuerza
+    """
+    if request.args.get('async', '').lower() == 'true':
+        return True
+    if filters is None:
+        return False
+    threshold = current_app.config.get('PDF_ASYNC_THRESHOLD', 0)
+    if not threshold:
+        return False
+    count, error = TaskService.count_tasks(filters)
+    return not error and count > threshold
+
+def _send_report(report_type, params, generate, download_name):
+    """
+    Enviar el reporte usando la caché de PDFs
+    La clave de caché se envía como ETag: si el cliente ya tiene esa versión se responde 304
+    sin generar nada; si está en disco se sirve directamente.
+    """
+    etag = report_cache.make_key(report_type, params) if report_cache.enabled else None
+    if etag and etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    
+    # Archivo ya abierto: si otro worker lo expulsa después, la descarga no se corta
+    cached = report_cache.get(etag) if etag else None
+    cache_status = 'hit' if cached else 'miss'
+    if not cached:
+        pdf_file, error = generate()
         
         if error:
             return jsonify({'success': False, 'message': error}), 400
         
-        if not pdf_path or not os.path.exists(pdf_path):
+        if pdf_file is None:
             return jsonify({'success': False, 'message': 'Error generando el reporte PDF'}), 500
         
-        # Enviar el archivo
-        return send_file(
-            pdf_path,
+        if not etag:
+            try:
+                response = stream_file(pdf_file, download_name, 'application/pdf')
+            except Exception:
+                pdf_file.close()
+                raise
+            response.headers['X-Report-Cache'] = 'disabled'
+            return response
+        
+        with pdf_file:
+            cached = report_cache.put(etag, pdf_file)
+    
+    try:
+        response = send_file(
+            cached,
             as_attachment=True,
-            download_name=f'reporte_proyecto_{project_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf',
-            mimetype='application/pdf'
+            download_name=download_name,
+            mimetype='application/pdf',
+            etag=etag
+        )
+    except Exception:
+        cached.close()
+        raise
+    # El navegador debe revalidar siempre: los datos pueden cambiar en cualquier momento
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['X-Report-Cache'] = cache_status
+    return response
+
+def _enqueue_response(report_type, params):
+    """Encolar el reporte y responder 202 con la URL de seguimiento"""
+    job, error = ReportJobService.enqueue(get_jwt_identity(), report_type, params)
+    if error:
+        return jsonify({'success': False, 'message': error}), 400
+    
+    response = jsonify({
+        'success': True,
+        'message': 'Reporte encolado para generación',
+        'data': job
+    })
+    response.headers['Location'] = f"/api/pdf/jobs/{job['id']}"
+    return response, 202
+
+@pdf_bp.route('/report/project/<project_id>', methods=['GET'])
+@jwt_required()
+def generate_project_report(project_id):
+    """Generar reporte PDF de un proyecto específico"""
+    try:
+        # Los proyectos con muchas tareas se generan en segundo plano
+        if _should_run_async({'project_id': project_id}):
+            return _enqueue_response('project', {'project_id': project_id})
+        
+        # Generar (o servir desde caché) y enviar el reporte
+        return _send_report(
+            'project',
+            {'project_id': project_id},
+            lambda: _pdf_service().generate_project_report(project_id),
+            f'reporte_proyecto_{project_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
         )
         
     except Exception as e:
@@ -61,21 +146,15 @@ def generate_tasks_report():
         if end_date:
             filters['end_date'] = end_date
         
-        # Generar el reporte
-        pdf_path, error = PDFService.generate_tasks_report(filters)
-        
-        if error:
-            return jsonify({'success': False, 'message': error}), 400
+        if _should_run_async(filters):
+            return _enqueue_response('tasks', {'filters': filters})
         
-        if not pdf_path or not os.path.exists(pdf_path):
-            return jsonify({'success': False, 'message': 'Error generando el reporte PDF'}), 500
-        
-        # Enviar el archivo
-        return send_file(
-            pdf_path,
-            as_attachment=True,
-            download_name=f'reporte_tareas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf',
-            mimetype='application/pdf'
+        # Generar (o servir desde caché) y enviar el reporte
+        return _send_report(
+            'tasks',
+            {'filters': filters},
+            lambda: _pdf_service().generate_tasks_report(filters),
+            f'reporte_tareas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
         )
         
     except Exception as e:
@@ -86,21 +165,16 @@ def generate_tasks_report():
 def generate_general_report():
     """Generar reporte PDF general del sistema"""
     try:
-        # Generar el reporte
-        pdf_path, error = PDFService.generate_general_report()
+        # Solo agregados (tamaño fijo): se genera en línea salvo ?async=true
+        if _should_run_async(None):
+            return _enqueue_response('general', {})
         
-        if error:
-            return jsonify({'success': False, 'message': error}), 400
-        
-        if not pdf_path or not os.path.exists(pdf_path):
-            return jsonify({'success': False, 'message': 'Error generando el reporte PDF'}), 500
-        
-        # Enviar el archivo
-        return send_file(
-            pdf_path,
-            as_attachment=True,
-            download_name=f'reporte_general_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf',
-            mimetype='application/pdf'
+        # Generar (o servir desde caché) y enviar el reporte
+        return _send_report(
+            'general',
+            {},
+            lambda: _pdf_service().generate_general_report(),
+            f'reporte_general_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
         )
         
     except Exception as e:
@@ -119,21 +193,16 @@ def generate_metrics_report():
         if project_id:
             filters['project_id'] = project_id
         
-        # Generar el reporte
-        pdf_path, error = PDFService.generate_metrics_report(filters, include_charts)
+        # Solo agregados (tamaño fijo): se genera en línea salvo ?async=true
+        if _should_run_async(None):
+            return _enqueue_response('metrics', {'filters': filters, 'include_charts': include_charts})
         
-        if error:
-            return jsonify({'success': False, 'message': error}), 400
-        
-        if not pdf_path or not os.path.exists(pdf_path):
-            return jsonify({'success': False, 'message': 'Error generando el reporte PDF'}), 500
-        
-        # Enviar el archivo
-        return send_file(
-            pdf_path,
-            as_attachment=True,
-            download_name=f'reporte_metricas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf',
-            mimetype='application/pdf'
+        # Generar (o servir desde caché) y enviar el reporte
+        return _send_report(
+            'metrics',
+            {'filters': filters, 'include_charts': include_charts},
+            lambda: _pdf_service().generate_metrics_report(filters, include_charts),
+            f'reporte_metricas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
         )
         
     except Exception as e:
@@ -161,20 +230,77 @@ def generate_custom_report():
             'sections': data.get('sections', [])
         }
         
-        # Generar el reporte
-        pdf_path, error = PDFService.generate_custom_report(report_config)
+        # La sección de tareas carga todas las que cumplen los filtros
+        if _should_run_async(report_config['filters'] if report_config['include_tasks'] else None):
+            return _enqueue_response('custom', {'report_config': report_config})
+        
+        # Generar (o servir desde caché) y enviar el reporte
+        return _send_report(
+            'custom',
+            {'report_config': report_config},
+            lambda: _pdf_service().generate_custom_report(report_config),
+            f'reporte_personalizado_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
+        )
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error en el servidor: {str(e)}'}), 500
+
+@pdf_bp.route('/jobs', methods=['POST'])
+@jwt_required()
+def create_report_job():
+    """Encolar la generación asíncrona de un reporte PDF"""
+    try:
+        data = request.get_json() or {}
+        report_type = data.get('report_type')
+        
+        if not report_type:
+            return jsonify({'success': False, 'message': 'report_type es requerido'}), 400
+        
+        params = {key: data[key] for key in ('project_id', 'filters', 'include_charts', 'report_config') if key in data}
+        return _enqueue_response(report_type, params)
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error en el servidor: {str(e)}'}), 500
+
+@pdf_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_report_job(job_id):
+    """Consultar el estado y progreso de un reporte asíncrono"""
+    try:
+        job, error = ReportJobService.get_job(job_id, get_jwt_identity())
         
         if error:
-            return jsonify({'success': False, 'message': error}), 400
+            return jsonify({'success': False, 'message': error}), 404
         
-        if not pdf_path or not os.path.exists(pdf_path):
-            return jsonify({'success': False, 'message': 'Error generando el reporte PDF'}), 500
+        return jsonify({'success': True, 'data': job.to_dict()}), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error en el servidor: {str(e)}'}), 500
+
+@pdf_bp.route('/jobs/<job_id>/download', methods=['GET'])
+@jwt_required()
+def download_report_job(job_id):
+    """Descargar el PDF de un reporte asíncrono terminado"""
+    try:
+        job, error = ReportJobService.get_job(job_id, get_jwt_identity())
+        
+        if error:
+            return jsonify({'success': False, 'message': error}), 404
+        
+        if job.status != 'done':
+            return jsonify({
+                'success': False,
+                'message': 'El reporte aún no está listo' if job.status in ('queued', 'running') else job.error,
+                'data': job.to_dict()
+            }), 409
+        
+        if not job.file_path or not os.path.exists(job.file_path):
+            return jsonify({'success': False, 'message': 'El archivo del reporte ya no está disponible'}), 410
         
-        # Enviar el archivo
         return send_file(
-            pdf_path,
+            job.file_path,
             as_attachment=True,
-            download_name=f'reporte_personalizado_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf',
+            download_name=ReportJobService.get_download_name(job),
             mimetype='application/pdf'
         )
         
@@ -0,0 +1,41 @@
+"""
+Rutas de búsqueda de texto completo
+"""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from services.search_service import SearchService, SEARCH_TABLES
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search():
+    """Buscar en tareas, proyectos y comentarios"""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'success': False, 'message': 'Parámetro de búsqueda q es requerido'}), 400
+        
+        # Tipos a buscar: tasks, projects, comments (por defecto todos)
+        types = request.args.get('types')
+        types = [t.strip() for t in types.split(',') if t.strip()] if types else list(SEARCH_TABLES.keys())
+        invalid = [t for t in types if t not in SEARCH_TABLES]
+        if invalid:
+            return jsonify({'success': False, 'message': f"Tipo de búsqueda inválido: {', '.join(invalid)}"}), 400
+        
+        limit = request.args.get('limit', 10, type=int)
+        limit = max(1, min(limit, 50))
+        
+        results, error = SearchService.search(query, types, limit)
+        
+        if error:
+            return jsonify({'success': False, 'message': error}), 500
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'data': results
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error en el servidor: {str(e)}'}), 500
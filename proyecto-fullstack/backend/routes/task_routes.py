@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.task_service import TaskService
 from utils.auth_decorators import require_role
+from utils.pagination import decode_cursor, parse_limit
 
 tasks_bp = Blueprint('tasks', __name__)
 
@@ -32,6 +33,32 @@ def get_tasks():
         if search:
             filters['search'] = search
         
+        # Paginación por cursor: se activa al enviar limit o cursor
+        limit = request.args.get('limit')
+        cursor = request.args.get('cursor')
+        if limit is not None or cursor:
+            try:
+                limit = parse_limit(limit)
+                cursor = decode_cursor(cursor) if cursor else None
+            except ValueError as e:
+                return jsonify({'success': False, 'message': str(e)}), 400
+            
+            include_total = request.args.get('include_total', 'false').lower() == 'true'
+            page, error = TaskService.get_tasks_page(filters, limit, cursor, include_total)
+            
+            if error:
+                return jsonify({'success': False, 'message': error}), 500
+            
+            response = {
+                'success': True,
+                'data': page['tasks'],
+                'next_cursor': page['next_cursor'],
+                'limit': limit
+            }
+            if include_total:
+                response['total'] = page['total']
+            return jsonify(response), 200
+        
         tasks, error = TaskService.get_all_tasks(filters)
         
         if error:
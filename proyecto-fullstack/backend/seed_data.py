@@ -1,4 +1,6 @@
 from app import app, db, User, Project, Task, Notification
+from services.project_stats_service import ProjectStatsService
+from services.notification_service import NotificationService
 from datetime import datetime, date
 import uuid
 
@@ -157,6 +159,7 @@ def create_sample_data():
         # Agregar tareas a la base de datos
         db.session.add_all([task1, task2, task3, task4, task5, task6, task7])
         db.session.commit()
+        ProjectStatsService.rebuild()
         
         # Crear notificaciones de ejemplo
         notification1 = Notification(
@@ -216,6 +219,7 @@ def create_sample_data():
         # Agregar notificaciones a la base de datos
         db.session.add_all([notification1, notification2, notification3, notification4, notification5, notification6])
         db.session.commit()
+        NotificationService.repair_unread_counters()
         
         print("✅ Datos de ejemplo creados exitosamente!")
         print("\n📋 Usuarios creados:")
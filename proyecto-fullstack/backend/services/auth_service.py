@@ -10,8 +10,33 @@ from models.user import User
 from models.password_reset_token import PasswordResetToken
 from models.revoked_token import RevokedToken
 from utils.email_service import send_password_reset_email
+from utils.revocation_cache import revocation_cache
+from utils.user_version_cache import user_version_cache
 
 class AuthService:
+    @staticmethod
+    def _token_claims(user):
+        """Claims adicionales del JWT para autorizar sin consultar la base de datos"""
+        return {
+            'role': user.role,
+            'is_active': bool(user.is_active),
+            'role_version': user.role_version or 1
+        }
+
+    @staticmethod
+    def _create_tokens(user):
+        """Generar access y refresh token con los claims del usuario"""
+        claims = AuthService._token_claims(user)
+        return (
+            create_access_token(identity=user.id, additional_claims=claims),
+            create_refresh_token(identity=user.id, additional_claims=claims)
+        )
+
+    @staticmethod
+    def _invalidate_tokens(user):
+        """Incrementar la versión de rol para invalidar los tokens emitidos"""
+        user.role_version = (user.role_version or 1) + 1
+
     @staticmethod
     def delete_user(user_id):
         """Soft delete: marcar usuario como inactivo"""
@@ -20,7 +45,9 @@ class AuthService:
             if not user or not user.is_active:
                 return False, "Usuario no encontrado"
             user.is_active = False
+            AuthService._invalidate_tokens(user)
             db.session.commit()
+            user_version_cache.update(user)
             return True, "Usuario eliminado (inactivado) correctamente"
         except Exception as e:
             db.session.rollback()
@@ -38,8 +65,7 @@ class AuthService:
         if not user.check_password(password):
             return None, "Contraseña incorrecta"
         
-        access_token = create_access_token(identity=user.id)
-        refresh_token = create_refresh_token(identity=user.id)
+        access_token, refresh_token = AuthService._create_tokens(user)
         
         return {
             'user': user.to_dict(),
@@ -67,8 +93,7 @@ class AuthService:
             db.session.commit()
             
             # Generar tokens al registrar (auto-login)
-            access_token = create_access_token(identity=user.id)
-            refresh_token = create_refresh_token(identity=user.id)
+            access_token, refresh_token = AuthService._create_tokens(user)
             
             return {
                 'user': user.to_dict(),
@@ -87,16 +112,18 @@ class AuthService:
         if not user or not user.is_active:
             return None, "Usuario no encontrado o inactivo"
         
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=AuthService._token_claims(user))
         return {'access_token': access_token}, None
 
     @staticmethod
-    def logout(jti):
-        """Cerrar sesión revocando el token"""
+    def logout(jti, exp=None):
+        """Cerrar sesión revocando el token (exp: claim de expiración del JWT)"""
         try:
-            revoked_token = RevokedToken(jti=jti)
+            expires_at = datetime.utcfromtimestamp(exp) if exp else None
+            revoked_token = RevokedToken(jti=jti, expires_at=expires_at)
             db.session.add(revoked_token)
             db.session.commit()
+            revocation_cache.add(jti)
             return True, None
         except Exception as e:
             db.session.rollback()
@@ -216,15 +243,36 @@ class AuthService:
                 user.email = email
             if password:
                 user.set_password(password)
-            if role:
+            if role and role != user.role:
                 user.role = role
+                AuthService._invalidate_tokens(user)
 
             db.session.commit()
+            user_version_cache.update(user)
             return user.to_dict(), None
         except Exception as e:
             db.session.rollback()
             return None, f"Error al actualizar usuario: {str(e)}"
 
+    @staticmethod
+    def update_user_role(user_id, role):
+        """Cambiar el rol de un usuario e invalidar sus tokens de acceso vigentes"""
+        try:
+            user = User.query.get(user_id)
+            if not user or not user.is_active:
+                return None, "Usuario no encontrado"
+
+            if user.role != role:
+                user.role = role
+                AuthService._invalidate_tokens(user)
+                db.session.commit()
+                user_version_cache.update(user)
+
+            return user.to_dict(), None
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Error al actualizar rol: {str(e)}"
+
     @staticmethod
     def create_user(name, email, password, role='developer'):
         """Crear usuario desde el panel de administración (sin login automático)"""
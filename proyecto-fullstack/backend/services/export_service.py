@@ -0,0 +1,126 @@
+"""
+Servicio de exportación de tareas y proyectos (CSV / XLSX)
+Las filas se leen de la base de datos por lotes (yield_per) y se escriben a medida que
+llegan, por lo que la memoria usada no depende del número de registros.
+"""
+import csv
+import io
+import tempfile
+from datetime import date, datetime
+from services.task_service import TaskService
+from services.project_service import ProjectService
+
+# Filas por bloque enviado al cliente en CSV
+CSV_ROWS_PER_CHUNK = 500
+
+# Prefijos con los que Excel/LibreOffice interpretan una celda de texto como fórmula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Columnas exportadas: (encabezado, atributo de la fila)
+TASK_COLUMNS = [
+    ('ID', 'id'),
+    ('Título', 'title'),
+    ('Descripción', 'description'),
+    ('Estado', 'status'),
+    ('Prioridad', 'priority'),
+    ('Proyecto ID', 'project_id'),
+    ('Proyecto', 'project_name'),
+    ('Asignado a ID', 'assigned_to'),
+    ('Asignado a', 'assigned_to_name'),
+    ('Fecha límite', 'due_date'),
+    ('Creada', 'created_at'),
+    ('Actualizada', 'updated_at')
+]
+
+PROJECT_COLUMNS = [
+    ('ID', 'id'),
+    ('Nombre', 'name'),
+    ('Descripción', 'description'),
+    ('Estado', 'status'),
+    ('Prioridad', 'priority'),
+    ('Fecha fin', 'end_date'),
+    ('Creado por ID', 'created_by'),
+    ('Creado por', 'created_by_name'),
+    ('Tareas', 'tasks_count'),
+    ('Creado', 'created_at'),
+    ('Actualizado', 'updated_at')
+]
+
+EXPORTS = {
+    'tasks': (TaskService.stream_tasks, TASK_COLUMNS),
+    'projects': (ProjectService.stream_projects, PROJECT_COLUMNS)
+}
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+
+class ExportService:
+    """Servicio para exportar listados completos"""
+
+    @staticmethod
+    def _safe_text(value):
+        """Anteponer ' al texto que la hoja de cálculo ejecutaría como fórmula"""
+        if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+            return f"'{value}"
+        return value
+
+    @staticmethod
+    def _csv_value(value):
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return '' if value is None else ExportService._safe_text(value)
+
+    @staticmethod
+    def _rows(entity, filters):
+        stream, columns = EXPORTS[entity]
+        attributes = [attribute for _, attribute in columns]
+        for row in stream(filters or {}):
+            yield [getattr(row, attribute) for attribute in attributes]
+
+    @staticmethod
+    def iter_csv(entity, filters=None):
+        """Generar el CSV por bloques de CSV_ROWS_PER_CHUNK filas"""
+        _, columns = EXPORTS[entity]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # BOM para que Excel reconozca UTF-8 (tildes y eñes)
+        buffer.write('\ufeff')
+        writer.writerow([header for header, _ in columns])
+
+        for count, row in enumerate(ExportService._rows(entity, filters), start=1):
+            writer.writerow([ExportService._csv_value(value) for value in row])
+            if count % CSV_ROWS_PER_CHUNK == 0:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue().encode('utf-8')
+
+    @staticmethod
+    def build_xlsx(entity, filters=None):
+        """
+        Escribir el XLSX con un libro en modo write-only (las filas no se guardan en memoria)
+        Devuelve un archivo temporal posicionado al inicio que quien lo recibe debe cerrar
+        """
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            return None, "Formato XLSX no disponible: instala openpyxl"
+
+        _, columns = EXPORTS[entity]
+        output = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024, suffix='.xlsx')
+        try:
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet(title='Tareas' if entity == 'tasks' else 'Proyectos')
+            sheet.append([header for header, _ in columns])
+            for row in ExportService._rows(entity, filters):
+                sheet.append([ExportService._safe_text(value) for value in row])
+            workbook.save(output)
+            output.seek(0)
+            return output, None
+        except Exception as e:
+            output.close()
+            return None, f"Error al exportar: {str(e)}"
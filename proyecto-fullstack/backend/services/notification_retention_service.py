@@ -0,0 +1,141 @@
+"""
+Servicio de retención de notificaciones
+Retira por lotes las notificaciones leídas más antiguas que NOTIFICATION_RETENTION_DAYS:
+las borra o, en modo archive, las copia antes a notifications_archive. Las no leídas
+nunca se tocan, por lo que los contadores de no leídas no cambian. Se ejecuta con
+`flask purge-notifications` o, si NOTIFICATION_RETENTION_INTERVAL_SECONDS > 0, desde
+un hilo en segundo plano en cada worker; en PostgreSQL un advisory lock evita que
+varios workers procesen el mismo lote a la vez.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, select
+from database import db
+from models.notification import Notification
+from models.notification_archive import NotificationArchive
+from utils.advisory_lock import exclusive_pass
+from utils.metrics import NOTIFICATIONS_RETIRED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+MODES = ('delete', 'archive')
+
+# Clave del advisory lock de PostgreSQL que serializa las pasadas entre procesos
+# (distinta de TOKEN_PURGE_LOCK_KEY)
+RETENTION_LOCK_KEY = 720250
+
+# Columnas copiadas al archivo (archived_at lo asigna la base)
+ARCHIVED_COLUMNS = ('id', 'user_id', 'title', 'message', 'type', 'category', 'created_at', 'updated_at')
+
+
+class NotificationRetentionService:
+    """Servicio para mantener acotada la tabla de notificaciones"""
+
+    _scheduler_pid = None
+    _scheduler_lock = threading.Lock()
+
+    @staticmethod
+    def _expired_condition(cutoff):
+        # Misma forma que el índice parcial ix_notifications_read_created_at
+        return and_(Notification.unread == False, Notification.created_at < cutoff)
+
+    @staticmethod
+    def _exclusive_pass():
+        """Advisory lock de las pasadas de retención (ver utils.advisory_lock)"""
+        return exclusive_pass(RETENTION_LOCK_KEY)
+
+    @staticmethod
+    def _archive(ids):
+        """Copiar las notificaciones dadas a notifications_archive (INSERT ... SELECT)"""
+        columns = [getattr(Notification, column) for column in ARCHIVED_COLUMNS]
+        db.session.execute(
+            NotificationArchive.__table__.insert().from_select(
+                ARCHIVED_COLUMNS, select(*columns).where(Notification.id.in_(ids))
+            )
+        )
+
+    @staticmethod
+    def _retire_in_batches(condition, mode, batch_size):
+        """Archivar (si corresponde) y borrar en lotes de batch_size, una transacción por lote"""
+        retired, batches = 0, 0
+        while True:
+            ids = [row_id for row_id, in db.session.query(Notification.id).filter(condition).limit(batch_size).all()]
+            if not ids:
+                return retired, batches
+            if mode == 'archive':
+                NotificationRetentionService._archive(ids)
+            db.session.query(Notification).filter(Notification.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            NOTIFICATIONS_RETIRED.labels(mode=mode).inc(len(ids))
+            retired += len(ids)
+            batches += 1
+            if len(ids) < batch_size:
+                return retired, batches
+
+    @staticmethod
+    def purge_read_notifications(days=None, mode=None, batch_size=DEFAULT_BATCH_SIZE, now=None):
+        """
+        Retirar las notificaciones leídas creadas hace más de `days` días
+        Sin argumentos usa NOTIFICATION_RETENTION_DAYS y NOTIFICATION_RETENTION_MODE
+        """
+        days = current_app.config.get('NOTIFICATION_RETENTION_DAYS', 90) if days is None else days
+        mode = mode or current_app.config.get('NOTIFICATION_RETENTION_MODE', 'delete')
+        if mode not in MODES:
+            return None, f"Modo de retención inválido '{mode}'. Debe ser uno de: {', '.join(MODES)}"
+        if days <= 0:
+            return {'mode': mode, 'cutoff': None, 'retired': 0, 'batches': 0, 'skipped': False}, None
+
+        try:
+            cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+            with NotificationRetentionService._exclusive_pass() as acquired:
+                if not acquired:
+                    # Otro worker (o flask purge-notifications) ya está retirando los mismos lotes
+                    return {'mode': mode, 'cutoff': cutoff, 'retired': 0, 'batches': 0, 'skipped': True}, None
+                retired, batches = NotificationRetentionService._retire_in_batches(
+                    NotificationRetentionService._expired_condition(cutoff), mode, batch_size
+                )
+            return {'mode': mode, 'cutoff': cutoff, 'retired': retired, 'batches': batches, 'skipped': False}, None
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Error al aplicar la retención de notificaciones: {str(e)}"
+
+    @staticmethod
+    def _run_scheduler(app, interval, batch_size):
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                result, error = NotificationRetentionService.purge_read_notifications(batch_size=batch_size)
+                if error:
+                    logger.error("Retención programada de notificaciones fallida: %s", error)
+                db.session.remove()
+
+    @staticmethod
+    def init_app(app):
+        """
+        Programar la retención periódica si NOTIFICATION_RETENTION_INTERVAL_SECONDS > 0
+        El hilo se inicia en la primera petición de cada proceso para sobrevivir al fork de Gunicorn
+        """
+        interval = app.config.get('NOTIFICATION_RETENTION_INTERVAL_SECONDS', 0)
+        if not interval or not app.config.get('NOTIFICATION_RETENTION_DAYS', 90):
+            return
+        batch_size = app.config.get('NOTIFICATION_RETENTION_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+        @app.before_request
+        def start_notification_retention_scheduler():
+            if NotificationRetentionService._scheduler_pid == os.getpid():
+                return
+            with NotificationRetentionService._scheduler_lock:
+                if NotificationRetentionService._scheduler_pid == os.getpid():
+                    return
+                NotificationRetentionService._scheduler_pid = os.getpid()
+                threading.Thread(
+                    target=NotificationRetentionService._run_scheduler,
+                    args=(app, interval, batch_size),
+                    name='notification-retention',
+                    daemon=True
+                ).start()
@@ -2,10 +2,22 @@
 Servicio de Notificaciones
 Maneja la lógica de negocio para notificaciones de usuarios
 """
+from sqlalchemy import func, or_, update
 from database import db
 from models.notification import Notification
+from models.notification_counter import NotificationCounter
+from models.task import Task
 from models.user import User
+from utils.metrics import NOTIFICATIONS_CREATED
+from utils.notification_bus import notification_bus
+from utils.pagination import apply_keyset, encode_cursor
+from utils.unit_of_work import after_commit
 import uuid
+from datetime import datetime
+
+# Filas por INSERT (executemany) en el envío masivo
+BROADCAST_BATCH_SIZE = 1000
+BROADCAST_ROLES = ('admin', 'project_manager', 'developer')
 
 
 class NotificationService:
@@ -32,18 +44,138 @@ class NotificationService:
             print(f"Error al obtener notificaciones: {e}")
             return []
 
+    @staticmethod
+    def get_notifications_page(user_id, limit=20, cursor=None, unread_only=False):
+        """
+        Obtener una página de notificaciones, de la más reciente a la más antigua
+        Paginación por cursor sobre (created_at, id): usa el índice por usuario sin recorrer
+        las filas de páginas anteriores como LIMIT/OFFSET
+        cursor: posición (created_at, id) decodificada de la página anterior
+        """
+        try:
+            query = Notification.query.filter_by(user_id=user_id)
+            if unread_only:
+                query = query.filter_by(unread=True)
+            
+            # Se pide un registro extra para saber si existe otra página
+            query = apply_keyset(query, Notification.created_at, Notification.id, cursor, descending=True)
+            notifications = query.limit(limit + 1).all()
+            
+            next_cursor = None
+            if len(notifications) > limit:
+                notifications = notifications[:limit]
+                next_cursor = encode_cursor(notifications[-1].created_at, notifications[-1].id)
+            
+            return True, {
+                'notifications': [notification.to_dict() for notification in notifications],
+                'next_cursor': next_cursor
+            }
+        except Exception as e:
+            return False, f"Error al obtener notificaciones: {e}"
+
+    @staticmethod
+    def get_notifications_since(user_id, last_seq, limit=100):
+        """
+        Notificaciones insertadas después de la secuencia last_seq, en orden de inserción
+        Se usan para reanudar el stream SSE desde Last-Event-ID
+        """
+        return Notification.query.filter(Notification.user_id == user_id, Notification.seq > last_seq)\
+                                 .order_by(Notification.seq.asc())\
+                                 .limit(limit).all()
+
+    @staticmethod
+    def event_id(notification):
+        """Id del evento SSE de una notificación (su secuencia de inserción)"""
+        return str(notification.seq)
+
+    @staticmethod
+    def parse_event_id(value):
+        """Secuencia de un Last-Event-ID; None si no es válido (p. ej. un id de otra versión)"""
+        try:
+            seq = int(value)
+        except (TypeError, ValueError):
+            return None
+        return seq if seq >= 0 else None
+
+    @staticmethod
+    def publish_unread(user_id, delta=0):
+        """Publicar el cambio del contador de no leídas (delta y valor actual)"""
+        notification_bus.publish(user_id, 'unread', {
+            'delta': delta,
+            'unread_count': NotificationService.get_unread_count(user_id)
+        })
+
+    @staticmethod
+    def count_unread(user_id):
+        """Contar las no leídas directamente en la tabla de notificaciones"""
+        return Notification.query.filter_by(user_id=user_id, unread=True).count()
+
+    @staticmethod
+    def adjust_unread(user_id, delta):
+        """
+        Sumar `delta` al contador del usuario sin confirmar la transacción (UPDATE relativo)
+        Si el usuario aún no tiene contador se crea con el conteo real, que ya incluye
+        el cambio pendiente (enviado con el autoflush)
+        """
+        if not delta:
+            return
+        result = db.session.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread=NotificationCounter.unread + delta)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.add(NotificationCounter(user_id=user_id, unread=NotificationService.count_unread(user_id)))
+
     @staticmethod
     def get_unread_count(user_id):
         """
-        Obtener número de notificaciones no leídas
+        Obtener número de notificaciones no leídas (lectura por clave primaria del contador)
         """
         try:
-            count = Notification.query.filter_by(user_id=user_id, unread=True).count()
-            return count
+            unread = db.session.query(NotificationCounter.unread)\
+                               .filter(NotificationCounter.user_id == user_id)\
+                               .scalar()
+            if unread is None:
+                # Usuario sin contador todavía: se cuenta sin guardarlo
+                return NotificationService.count_unread(user_id)
+            return max(unread, 0)
         except Exception as e:
             print(f"Error al contar notificaciones no leídas: {e}")
             return 0
 
+    @staticmethod
+    def repair_unread_counters(user_id=None):
+        """
+        Recalcular los contadores de no leídas desde las notificaciones (una consulta agrupada)
+        Corrige los que no coinciden, crea los que faltan y devuelve (resumen, error)
+        """
+        try:
+            counts = db.session.query(Notification.user_id, func.count(Notification.id))\
+                               .filter(Notification.unread == True)
+            counters = NotificationCounter.query
+            if user_id:
+                counts = counts.filter(Notification.user_id == user_id)
+                counters = counters.filter(NotificationCounter.user_id == user_id)
+            expected = dict(counts.group_by(Notification.user_id).all())
+
+            checked, fixed, created = 0, 0, 0
+            for counter in counters:
+                checked += 1
+                unread = expected.pop(counter.user_id, 0)
+                if counter.unread != unread:
+                    counter.unread = unread
+                    fixed += 1
+            for missing_user_id, unread in expected.items():
+                db.session.add(NotificationCounter(user_id=missing_user_id, unread=unread))
+                created += 1
+            db.session.commit()
+            return {'checked': checked, 'fixed': fixed, 'created': created}, None
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Error al reparar contadores de notificaciones: {e}"
+
     @staticmethod
     def mark_as_read(notification_id, user_id):
         """
@@ -58,8 +190,13 @@ class NotificationService:
             if not notification:
                 return False, "Notificación no encontrada"
             
+            was_unread = notification.unread
             notification.unread = False
+            if was_unread:
+                NotificationService.adjust_unread(user_id, -1)
             db.session.commit()
+            if was_unread:
+                NotificationService.publish_unread(user_id, delta=-1)
             
             return True, "Notificación marcada como leída"
         except Exception as e:
@@ -72,9 +209,12 @@ class NotificationService:
         Marcar todas las notificaciones como leídas
         """
         try:
-            Notification.query.filter_by(user_id=user_id, unread=True)\
-                            .update({Notification.unread: False})
+            updated = Notification.query.filter_by(user_id=user_id, unread=True)\
+                                      .update({Notification.unread: False})
+            NotificationService.adjust_unread(user_id, -updated)
             db.session.commit()
+            if updated:
+                NotificationService.publish_unread(user_id, delta=-updated)
             
             return True, "Todas las notificaciones marcadas como leídas"
         except Exception as e:
@@ -95,37 +235,184 @@ class NotificationService:
             if not notification:
                 return False, "Notificación no encontrada"
             
+            was_unread = notification.unread
             db.session.delete(notification)
+            if was_unread:
+                NotificationService.adjust_unread(user_id, -1)
             db.session.commit()
+            if was_unread:
+                NotificationService.publish_unread(user_id, delta=-1)
             
             return True, "Notificación eliminada"
         except Exception as e:
             db.session.rollback()
             return False, f"Error al eliminar notificación: {e}"
 
+    @staticmethod
+    def _publish_created(user_id, category, data, event_id, unread_count):
+        """Métrica y eventos SSE de una notificación ya confirmada"""
+        NOTIFICATIONS_CREATED.labels(category=category).inc()
+        # Streams SSE abiertos del usuario (en cualquier worker)
+        notification_bus.publish(user_id, 'notification', data, event_id)
+        notification_bus.publish(user_id, 'unread', {'delta': 1, 'unread_count': unread_count})
+
+    @staticmethod
+    def add_notification(user_id, title, message, notification_type='info', category='system'):
+        """
+        Agregar una notificación a la transacción actual sin confirmarla
+        La fila y el contador de no leídas se guardan con el commit de quien llama; los
+        eventos SSE se publican después de ese commit y se descartan si hay rollback
+        """
+        notification = Notification(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            title=title,
+            message=message,
+            type=notification_type,
+            category=category
+        )
+        
+        db.session.add(notification)
+        NotificationService.adjust_unread(user_id, 1)
+        # Datos del evento leídos dentro de la transacción (seq lo asigna la base)
+        db.session.flush()
+        if notification.seq is None:
+            # SQLite la asigna con un trigger AFTER INSERT que RETURNING no ve
+            db.session.refresh(notification, ['seq'])
+        after_commit(
+            NotificationService._publish_created, user_id, category, notification.to_dict(),
+            NotificationService.event_id(notification), NotificationService.get_unread_count(user_id)
+        )
+        return notification
+
     @staticmethod
     def create_notification(user_id, title, message, notification_type='info', category='system'):
         """
         Crear una nueva notificación
         """
         try:
-            notification = Notification(
-                id=str(uuid.uuid4()),
-                user_id=user_id,
-                title=title,
-                message=message,
-                type=notification_type,
-                category=category
+            notification = NotificationService.add_notification(
+                user_id, title, message, notification_type, category
             )
-            
-            db.session.add(notification)
             db.session.commit()
-            
             return True, notification.to_dict()
         except Exception as e:
             db.session.rollback()
             return False, f"Error al crear notificación: {e}"
 
+    @staticmethod
+    def _broadcast_recipients(user_ids=None, role=None, project_id=None):
+        """Ids de los usuarios activos destinatarios (lista, rol y/o asignados del proyecto), sin repetir"""
+        conditions = []
+        if user_ids:
+            conditions.append(User.id.in_(user_ids))
+        if role:
+            conditions.append(User.role == role)
+        if project_id:
+            assignees = db.session.query(Task.assigned_to)\
+                                  .filter(Task.project_id == project_id, Task.assigned_to.isnot(None))
+            conditions.append(User.id.in_(assignees))
+        query = db.session.query(User.id)\
+                          .filter(db.or_(User.is_active == True, User.is_active.is_(None)), or_(*conditions))\
+                          .order_by(User.id)
+        return [user_id for (user_id,) in query]
+
+    @staticmethod
+    def _increment_unread_many(user_ids):
+        """Sumar 1 al contador de no leídas de varios usuarios (un UPDATE por lote)"""
+        result = db.session.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id.in_(user_ids))
+            .values(unread=NotificationCounter.unread + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == len(user_ids):
+            return
+        # Usuarios sin contador: se crean con el conteo real (ya incluye la notificación nueva)
+        existing = {user_id for (user_id,) in db.session.query(NotificationCounter.user_id)
+                                                        .filter(NotificationCounter.user_id.in_(user_ids))}
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+        counts = dict(
+            db.session.query(Notification.user_id, func.count(Notification.id))
+                      .filter(Notification.user_id.in_(missing), Notification.unread == True)
+                      .group_by(Notification.user_id)
+        )
+        db.session.execute(NotificationCounter.__table__.insert(), [
+            {'user_id': user_id, 'unread': counts.get(user_id, 0)} for user_id in missing
+        ])
+
+    @staticmethod
+    def _publish_broadcast(rows):
+        """Publicar en el stream SSE las notificaciones de un lote ya confirmado"""
+        user_ids = [row['user_id'] for row in rows]
+        unread = dict(db.session.query(NotificationCounter.user_id, NotificationCounter.unread)
+                                .filter(NotificationCounter.user_id.in_(user_ids)))
+        events = []
+        for row in rows:
+            notification = Notification(**row)
+            events.append((row['user_id'], 'notification', notification.to_dict(),
+                           NotificationService.event_id(notification)))
+            events.append((row['user_id'], 'unread', {'delta': 1, 'unread_count': unread.get(row['user_id'], 1)}, None))
+        notification_bus.publish_many(events)
+
+    @staticmethod
+    def broadcast(title, message, notification_type='info', category='system',
+                  user_ids=None, role=None, project_id=None, batch_size=BROADCAST_BATCH_SIZE):
+        """
+        Crear la misma notificación para muchos usuarios
+        Destinatarios: user_ids, role y/o los asignados de project_id (se combinan sin repetir)
+        Inserta por lotes de batch_size filas con executemany y confirma una sola vez
+        """
+        if not (user_ids or role or project_id):
+            return False, "Indica los destinatarios: user_ids, role o project_id"
+        if role and role not in BROADCAST_ROLES:
+            return False, f"Rol inválido '{role}'. Debe ser uno de: {', '.join(BROADCAST_ROLES)}"
+        
+        try:
+            recipients = NotificationService._broadcast_recipients(user_ids, role, project_id)
+            # Misma fecha para todo el envío, del mismo reloj que el default de Notification
+            created_at = datetime.utcnow()
+            
+            batches = []
+            for start in range(0, len(recipients), batch_size):
+                rows = [{
+                    'id': str(uuid.uuid4()),
+                    'user_id': user_id,
+                    'title': title,
+                    'message': message,
+                    'type': notification_type,
+                    'category': category,
+                    'unread': True,
+                    'created_at': created_at,
+                    'updated_at': created_at
+                } for user_id in recipients[start:start + batch_size]]
+                db.session.execute(Notification.__table__.insert(), rows)
+                # seq (id de los eventos SSE) lo asigna la base: se lee antes del commit
+                seqs = dict(db.session.query(Notification.id, Notification.seq)
+                                      .filter(Notification.id.in_([row['id'] for row in rows])))
+                for row in rows:
+                    row['seq'] = seqs[row['id']]
+                NotificationService._increment_unread_many([row['user_id'] for row in rows])
+                batches.append(rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error al enviar notificaciones: {e}"
+        
+        if recipients:
+            NOTIFICATIONS_CREATED.labels(category=category).inc(len(recipients))
+        try:
+            for rows in batches:
+                NotificationService._publish_broadcast(rows)
+        except Exception as e:
+            print(f"Error al publicar notificaciones masivas: {e}")
+        
+        summary = {'recipients': len(recipients), 'batches': len(batches)}
+        if user_ids:
+            # Ids pedidos explícitamente (los inexistentes o inactivos no reciben nada)
+            summary['requested'] = len(set(user_ids))
+        return True, summary
+
     @staticmethod
     def create_task_notification(user_id, task_title, action='assigned'):
         """
@@ -1,27 +1,28 @@
 """
 Servicio para generación de reportes PDF
+Importa ReportLab al cargarse: las rutas y el servicio de trabajos lo importan de forma
+diferida para que el arranque de la API no pague el costo del stack de reportes.
 """
 import os
 import tempfile
 from datetime import datetime, timedelta
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from flask import current_app, has_app_context
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.graphics.charts.piecharts import Pie
-from reportlab.graphics.charts.linecharts import HorizontalLineChart
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Para evitar problemas con GUI
 from services.project_service import ProjectService
 from services.task_service import TaskService
 from models.user import User
 from models.project import Project
 from models.task import Task
 from database import db
+from utils.metrics import PDF_GENERATION
+from utils.pdf_streaming import StreamedTable
+
+# Tamaño a partir del cual el PDF en construcción pasa de memoria a disco
+DEFAULT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
 
 class PDFService:
     """Servicio para generar reportes PDF"""
@@ -109,7 +110,50 @@ class PDFService:
         return table
     
     @staticmethod
-    def generate_project_report(project_id):
+    def _format_date(value, default=''):
+        """Fecha (sin hora) para las celdas de las tablas"""
+        return value.strftime('%Y-%m-%d') if value else default
+    
+    @staticmethod
+    def _build(doc, story, progress_callback=None):
+        """
+        Construir el documento en un buffer y devolverlo posicionado al inicio
+        El buffer vive en memoria y solo pasa a disco por encima de PDF_SPOOL_MAX_BYTES;
+        quien lo recibe debe cerrarlo (al cerrarlo se elimina cualquier archivo temporal).
+        progress_callback(porcentaje) recibe el avance según los elementos ya dibujados
+        """
+        streamed = [flowable for flowable in story if isinstance(flowable, StreamedTable)]
+        if progress_callback and streamed:
+            # En reportes con tabla por streaming el avance lo marcan las filas ya dibujadas
+            streamed[0].progress_callback = progress_callback
+        elif progress_callback:
+            total = {'value': len(story) or 1}
+            
+            def on_progress(kind, value):
+                if kind == 'SIZE_EST':
+                    total['value'] = value or 1
+                elif kind == 'PROGRESS':
+                    progress_callback(min(100, int(value * 100 / total['value'])))
+            
+            doc.setProgressCallBack(on_progress)
+        
+        max_size = current_app.config.get('PDF_SPOOL_MAX_BYTES', DEFAULT_SPOOL_MAX_BYTES) if has_app_context() \
+            else DEFAULT_SPOOL_MAX_BYTES
+        buffer = tempfile.SpooledTemporaryFile(max_size=max_size, suffix='.pdf')
+        try:
+            doc.filename = buffer
+            doc.build(story)
+            if progress_callback and streamed:
+                progress_callback(100)
+            buffer.seek(0)
+            return buffer
+        except Exception:
+            buffer.close()
+            raise
+    
+    @staticmethod
+    @PDF_GENERATION.labels(report='project').time()
+    def generate_project_report(project_id, progress_callback=None):
         """Generar reporte PDF de un proyecto específico"""
         try:
             # Obtener datos del proyecto
@@ -122,18 +166,13 @@ class PDFService:
             if stats_error:
                 return None, stats_error
             
-            # Obtener tareas del proyecto
-            tasks, tasks_error = TaskService.get_all_tasks({'project_id': project_id})
+            # Contar las tareas del proyecto (las filas se leen por lotes al dibujar la tabla)
+            tasks_count, tasks_error = TaskService.count_tasks({'project_id': project_id})
             if tasks_error:
                 return None, tasks_error
             
-            # Crear archivo temporal
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            temp_path = temp_file.name
-            temp_file.close()
-            
-            # Crear documento PDF
-            doc = SimpleDocTemplate(temp_path, pagesize=A4)
+            # Crear documento PDF (el destino en memoria se asigna en _build)
+            doc = SimpleDocTemplate(None, pagesize=A4)
             story = []
             styles = PDFService._get_styles()
             
@@ -177,50 +216,37 @@ class PDFService:
             story.append(Spacer(1, 20))
             
             # Lista de tareas
-            if tasks:
+            if tasks_count:
                 story.append(Paragraph("Tareas del Proyecto", styles['heading']))
-                tasks_data = []
-                for task in tasks:
-                    tasks_data.append([
-                        task['title'],
-                        task['status'],
-                        task['priority'],
-                        task.get('assigned_to_name', 'Sin asignar'),
-                        task.get('due_date', 'Sin fecha')
-                    ])
-                
-                if tasks_data:
-                    table = PDFService._create_table(
-                        tasks_data,
-                        ['Título', 'Estado', 'Prioridad', 'Asignado a', 'Fecha Límite'],
-                        col_widths=[2*inch, 1*inch, 1*inch, 1.5*inch, 1*inch]
-                    )
-                    story.append(table)
+                rows = (
+                    (task.title, task.status, task.priority,
+                     task.assigned_to_name or 'Sin asignar', PDFService._format_date(task.due_date, 'Sin fecha'))
+                    for task in TaskService.stream_tasks({'project_id': project_id})
+                )
+                story.append(StreamedTable(
+                    rows, tasks_count,
+                    ['Título', 'Estado', 'Prioridad', 'Asignado a', 'Fecha Límite'],
+                    col_widths=[2*inch, 1*inch, 1*inch, 1.5*inch, 1*inch]
+                ))
             
             # Generar PDF
-            doc.build(story)
-            
-            return temp_path, None
+            return PDFService._build(doc, story, progress_callback), None
             
         except Exception as e:
             return None, f"Error generando reporte: {str(e)}"
     
     @staticmethod
-    def generate_tasks_report(filters=None):
+    @PDF_GENERATION.labels(report='tasks').time()
+    def generate_tasks_report(filters=None, progress_callback=None):
         """Generar reporte PDF de tareas con filtros"""
         try:
-            # Obtener tareas con filtros
-            tasks, error = TaskService.get_all_tasks(filters or {})
+            # Contar las tareas filtradas (las filas se leen por lotes al dibujar la tabla)
+            tasks_count, error = TaskService.count_tasks(filters or {})
             if error:
                 return None, error
             
-            # Crear archivo temporal
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            temp_path = temp_file.name
-            temp_file.close()
-            
-            # Crear documento PDF
-            doc = SimpleDocTemplate(temp_path, pagesize=A4)
+            # Crear documento PDF (el destino en memoria se asigna en _build)
+            doc = SimpleDocTemplate(None, pagesize=A4)
             story = []
             styles = PDFService._get_styles()
             
@@ -259,41 +285,32 @@ class PDFService:
                     story.append(table)
                 story.append(Spacer(1, 20))
             
-            # Lista de tareas
-            if tasks:
+            # Lista de tareas (tabla por streaming: memoria acotada sin importar el número de tareas)
+            if tasks_count:
                 story.append(Paragraph("Lista de Tareas", styles['heading']))
-                tasks_data = []
-                for task in tasks:
-                    tasks_data.append([
-                        task['title'],
-                        task.get('project_name', 'Sin proyecto'),
-                        task['status'],
-                        task['priority'],
-                        task.get('assigned_to_name', 'Sin asignar'),
-                        task.get('due_date', 'Sin fecha'),
-                        task.get('created_at', '')
-                    ])
-                
-                if tasks_data:
-                    table = PDFService._create_table(
-                        tasks_data,
-                        ['Título', 'Proyecto', 'Estado', 'Prioridad', 'Asignado', 'Fecha Límite', 'Creada'],
-                        col_widths=[1.5*inch, 1*inch, 0.8*inch, 0.8*inch, 1*inch, 1*inch, 0.9*inch]
-                    )
-                    story.append(table)
+                rows = (
+                    (task.title, task.project_name or 'Sin proyecto', task.status, task.priority,
+                     task.assigned_to_name or 'Sin asignar', PDFService._format_date(task.due_date, 'Sin fecha'),
+                     PDFService._format_date(task.created_at))
+                    for task in TaskService.stream_tasks(filters or {})
+                )
+                story.append(StreamedTable(
+                    rows, tasks_count,
+                    ['Título', 'Proyecto', 'Estado', 'Prioridad', 'Asignado', 'Fecha Límite', 'Creada'],
+                    col_widths=[1.5*inch, 1*inch, 0.8*inch, 0.8*inch, 1*inch, 1*inch, 0.9*inch]
+                ))
             else:
                 story.append(Paragraph("No se encontraron tareas con los filtros aplicados.", styles['normal']))
             
             # Generar PDF
-            doc.build(story)
-            
-            return temp_path, None
+            return PDFService._build(doc, story, progress_callback), None
             
         except Exception as e:
             return None, f"Error generando reporte: {str(e)}"
     
     @staticmethod
-    def generate_general_report():
+    @PDF_GENERATION.labels(report='general').time()
+    def generate_general_report(progress_callback=None):
         """Generar reporte PDF general del sistema"""
         try:
             # Obtener estadísticas generales
@@ -303,13 +320,8 @@ class PDFService:
             if p_error or t_error:
                 return None, f"Error obteniendo estadísticas: {p_error or t_error}"
             
-            # Crear archivo temporal
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            temp_path = temp_file.name
-            temp_file.close()
-            
-            # Crear documento PDF
-            doc = SimpleDocTemplate(temp_path, pagesize=A4)
+            # Crear documento PDF (el destino en memoria se asigna en _build)
+            doc = SimpleDocTemplate(None, pagesize=A4)
             story = []
             styles = PDFService._get_styles()
             
@@ -355,15 +367,14 @@ class PDFService:
                 story.append(table)
             
             # Generar PDF
-            doc.build(story)
-            
-            return temp_path, None
+            return PDFService._build(doc, story, progress_callback), None
             
         except Exception as e:
             return None, f"Error generando reporte: {str(e)}"
     
     @staticmethod
-    def generate_metrics_report(filters=None, include_charts=True):
+    @PDF_GENERATION.labels(report='metrics').time()
+    def generate_metrics_report(filters=None, include_charts=True, progress_callback=None):
         """Generar reporte PDF de métricas con gráficos opcionales"""
         try:
             # Obtener métricas
@@ -373,13 +384,8 @@ class PDFService:
             if p_error or t_error:
                 return None, f"Error obteniendo métricas: {p_error or t_error}"
             
-            # Crear archivo temporal
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            temp_path = temp_file.name
-            temp_file.close()
-            
-            # Crear documento PDF
-            doc = SimpleDocTemplate(temp_path, pagesize=A4)
+            # Crear documento PDF (el destino en memoria se asigna en _build)
+            doc = SimpleDocTemplate(None, pagesize=A4)
             story = []
             styles = PDFService._get_styles()
             
@@ -424,24 +430,18 @@ class PDFService:
                 story.append(table)
             
             # Generar PDF
-            doc.build(story)
-            
-            return temp_path, None
+            return PDFService._build(doc, story, progress_callback), None
             
         except Exception as e:
             return None, f"Error generando reporte: {str(e)}"
     
     @staticmethod
-    def generate_custom_report(report_config):
+    @PDF_GENERATION.labels(report='custom').time()
+    def generate_custom_report(report_config, progress_callback=None):
         """Generar reporte PDF personalizado"""
         try:
-            # Crear archivo temporal
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            temp_path = temp_file.name
-            temp_file.close()
-            
-            # Crear documento PDF
-            doc = SimpleDocTemplate(temp_path, pagesize=A4)
+            # Crear documento PDF (el destino en memoria se asigna en _build)
+            doc = SimpleDocTemplate(None, pagesize=A4)
             story = []
             styles = PDFService._get_styles()
             
@@ -515,9 +515,7 @@ class PDFService:
                         story.append(table)
             
             # Generar PDF
-            doc.build(story)
-            
-            return temp_path, None
+            return PDFService._build(doc, story, progress_callback), None
             
         except Exception as e:
             return None, f"Error generando reporte personalizado: {str(e)}"
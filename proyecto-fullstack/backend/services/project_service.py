@@ -3,19 +3,45 @@ Servicios de proyectos
 """
 from database import db
 from models.project import Project
+from models.project_stats import ProjectStats
 from models.task import Task
 from models.user import User
+from services.stats_service import StatsService
+from services.project_stats_service import ProjectStatsService
 
 class ProjectService:
     @staticmethod
     def get_all_projects():
         """Obtener todos los proyectos"""
         try:
-            projects = Project.query.all()
-            return [project.to_dict() for project in projects], None
+            rows = db.session.query(Project, ProjectStats)\
+                             .outerjoin(ProjectStats, ProjectStats.project_id == Project.id)\
+                             .all()
+            # Sin fila de estadísticas (aún no reconciliada) el avance se muestra en 0
+            return [project.to_dict(stats=stats, include_progress=True) for project, stats in rows], None
         except Exception as e:
             return None, f"Error al obtener proyectos: {str(e)}"
 
+    @staticmethod
+    def stream_projects(filters=None, batch_size=1000):
+        """
+        Recorrer los proyectos por lotes (yield_per) con el nombre del creador y el número de tareas (project_stats)
+        filters: status, priority, created_by
+        """
+        query = db.session.query(
+            Project.id, Project.name, Project.description, Project.status, Project.priority,
+            Project.end_date, Project.created_by, User.name.label('created_by_name'),
+            db.func.coalesce(ProjectStats.total_tasks, 0).label('tasks_count'),
+            Project.created_at, Project.updated_at
+        ).outerjoin(User, User.id == Project.created_by)\
+         .outerjoin(ProjectStats, ProjectStats.project_id == Project.id)
+        
+        for field in ('status', 'priority', 'created_by'):
+            if filters and filters.get(field):
+                query = query.filter(getattr(Project, field) == filters[field])
+        
+        return query.order_by(Project.created_at, Project.id).yield_per(batch_size)
+
     @staticmethod
     def get_project_by_id(project_id):
         """Obtener proyecto por ID"""
@@ -23,7 +49,8 @@ class ProjectService:
         if not project:
             return None, "Proyecto no encontrado"
         
-        return project.to_dict(include_tasks=True), None
+        comments_count = dict(Task.comments_count_query(project_id=project.id).all())
+        return project.to_dict(include_tasks=True, comments_count=comments_count), None
 
     @staticmethod
     def create_project(name, description, created_by, **kwargs):
@@ -41,6 +68,9 @@ class ProjectService:
                     setattr(project, key, value)
             
             db.session.add(project)
+            db.session.flush()
+            # Fila de contadores en 0 (INSERT directo, sin instanciar el modelo)
+            db.session.execute(ProjectStats.__table__.insert().values(project_id=project.id))
             db.session.commit()
             
             return project.to_dict(), None
@@ -85,67 +115,32 @@ class ProjectService:
     def get_all_projects_stats():
         """Obtener estadísticas de todos los proyectos"""
         try:
-            projects = Project.query.all()
-            all_tasks = Task.query.all()
-            
-            total_projects = len(projects)
-            total_tasks = len(all_tasks)
-            
-            # Estadísticas por estado
-            tasks_by_status = {
-                'todo': len([t for t in all_tasks if t.status == 'todo']),
-                'in_progress': len([t for t in all_tasks if t.status == 'in_progress']),
-                'review': len([t for t in all_tasks if t.status == 'review']),
-                'done': len([t for t in all_tasks if t.status == 'done'])
-            }
-            
-            # Estadísticas por prioridad
-            tasks_by_priority = {
-                'high': len([t for t in all_tasks if t.priority == 'high']),
-                'medium': len([t for t in all_tasks if t.priority == 'medium']),
-                'low': len([t for t in all_tasks if t.priority == 'low'])
-            }
-            
-            # Proyectos por estado
-            projects_by_status = {
-                'active': len([p for p in projects if p.status == 'active']),
-                'completed': len([p for p in projects if p.status == 'completed']),
-                'on_hold': len([p for p in projects if p.status == 'on_hold'])
-            }
-            
-            stats = {
-                'total_projects': total_projects,
-                'total_tasks': total_tasks,
-                'tasks_by_status': tasks_by_status,
-                'tasks_by_priority': tasks_by_priority,
-                'projects_by_status': projects_by_status
-            }
-            
+            stats = StatsService.build_project_stats(
+                StatsService.get_project_counts(),
+                StatsService.get_task_stats()
+            )
             return stats, None
         except Exception as e:
             return None, f"Error al obtener estadísticas: {str(e)}"
 
+    @staticmethod
+    def get_projects_progress_chart():
+        """Obtener el progreso (tareas completadas / totales) de cada proyecto"""
+        try:
+            return StatsService.get_projects_progress(), None
+        except Exception as e:
+            return None, f"Error al obtener datos del gráfico: {str(e)}"
+
     @staticmethod
     def get_project_stats(project_id):
-        """Obtener estadísticas del proyecto"""
+        """Obtener estadísticas del proyecto (contadores de project_stats y tareas vencidas)"""
         project = Project.query.get(project_id)
         if not project:
             return None, "Proyecto no encontrado"
         
         try:
-            tasks = Task.query.filter_by(project_id=project_id).all()
-            
-            stats = {
-                'total_tasks': len(tasks),
-                'todo': len([t for t in tasks if t.status == 'todo']),
-                'in_progress': len([t for t in tasks if t.status == 'in_progress']),
-                'review': len([t for t in tasks if t.status == 'review']),
-                'done': len([t for t in tasks if t.status == 'done']),
-                'high_priority': len([t for t in tasks if t.priority == 'high']),
-                'medium_priority': len([t for t in tasks if t.priority == 'medium']),
-                'low_priority': len([t for t in tasks if t.priority == 'low'])
-            }
-            
+            stats = ProjectStatsService.get_stats(project_id)
+            stats['overdue'] = ProjectStatsService.count_overdue(project_id)
             return stats, None
         except Exception as e:
             return None, f"Error al obtener estadísticas: {str(e)}"
@@ -0,0 +1,177 @@
+"""
+Servicio de contadores por proyecto (tabla project_stats)
+TaskService aplica los cambios como UPDATE relativos (col = col + n) dentro de la misma
+transacción que modifica la tarea, así las estadísticas de un proyecto se leen de una sola
+fila. La reconciliación (flask rebuild-project-stats) recalcula las filas desde las tareas.
+"""
+from datetime import datetime
+from sqlalchemy import func, update
+from database import db
+from models.project import Project
+from models.project_stats import ProjectStats
+from models.task import Task
+from services.stats_service import TASK_STATUSES
+
+PRIORITY_COUNTERS = {
+    'low': 'low_priority',
+    'medium': 'medium_priority',
+    'high': 'high_priority'
+}
+
+
+class ProjectStatsService:
+    """Mantenimiento incremental y reconciliación de project_stats"""
+
+    @staticmethod
+    def _task_deltas(status, priority, sign=1):
+        deltas = {'total_tasks': sign}
+        if status in TASK_STATUSES:
+            deltas[status] = sign
+        if priority in PRIORITY_COUNTERS:
+            deltas[PRIORITY_COUNTERS[priority]] = sign
+        return deltas
+
+    @staticmethod
+    def _merge(*deltas):
+        merged = {}
+        for delta in deltas:
+            for counter, value in delta.items():
+                merged[counter] = merged.get(counter, 0) + value
+        return merged
+
+    @staticmethod
+    def apply(project_id, deltas):
+        """
+        Sumar `deltas` ({contador: n}) a la fila del proyecto sin confirmar la transacción
+        Si el proyecto aún no tiene fila se crea recalculada desde las tareas
+        (que ya incluyen el cambio pendiente, enviado con el autoflush)
+        """
+        deltas = {counter: value for counter, value in deltas.items() if value}
+        if not deltas:
+            return
+        values = {counter: getattr(ProjectStats, counter) + value for counter, value in deltas.items()}
+        result = db.session.execute(
+            update(ProjectStats)
+            .where(ProjectStats.project_id == project_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            counters = ProjectStatsService.compute(project_id).get(project_id, {})
+            db.session.add(ProjectStats(project_id=project_id, **counters))
+
+    @staticmethod
+    def task_created(task):
+        ProjectStatsService.apply(task.project_id, ProjectStatsService._task_deltas(task.status, task.priority))
+
+    @staticmethod
+    def task_updated(previous, task):
+        """previous: (project_id, status, priority) de la tarea antes del cambio"""
+        project_id, status, priority = previous
+        removed = ProjectStatsService._task_deltas(status, priority, -1)
+        added = ProjectStatsService._task_deltas(task.status, task.priority)
+        if project_id == task.project_id:
+            ProjectStatsService.apply(project_id, ProjectStatsService._merge(removed, added))
+            return
+        # La tarea cambió de proyecto: sus comentarios también se mueven
+        comments = ProjectStatsService.count_task_comments(task.id)
+        ProjectStatsService.apply(project_id, dict(removed, comments_count=-comments))
+        ProjectStatsService.apply(task.project_id, dict(added, comments_count=comments))
+
+    @staticmethod
+    def task_deleted(task, comments=0):
+        deltas = ProjectStatsService._task_deltas(task.status, task.priority, -1)
+        deltas['comments_count'] = -comments
+        ProjectStatsService.apply(task.project_id, deltas)
+
+    @staticmethod
+    def comment_added(project_id):
+        ProjectStatsService.apply(project_id, {'comments_count': 1})
+
+    @staticmethod
+    def count_task_comments(task_id):
+        """Comentarios no eliminados de una tarea"""
+        return dict(Task.comments_count_query().filter_by(task_id=task_id).all()).get(task_id, 0)
+
+    @staticmethod
+    def compute(project_id=None):
+        """
+        Recalcular los contadores desde las tareas y comentarios con dos consultas agrupadas
+        Devuelve {project_id: {contador: n}} solo para los proyectos con tareas
+        """
+        tasks = db.session.query(Task.project_id, Task.status, Task.priority, func.count(Task.id))
+        counts = Task.comments_count_query().subquery()
+        comments = db.session.query(Task.project_id, func.sum(counts.c.comments_count))\
+                             .join(counts, counts.c.task_id == Task.id)
+        if project_id:
+            tasks = tasks.filter(Task.project_id == project_id)
+            comments = comments.filter(Task.project_id == project_id)
+
+        result = {}
+        for task_project, status, priority, count in tasks.group_by(Task.project_id, Task.status, Task.priority):
+            deltas = ProjectStatsService._task_deltas(status, priority, count)
+            result[task_project] = ProjectStatsService._merge(result.get(task_project, {}), deltas)
+        for task_project, count in comments.group_by(Task.project_id):
+            result.setdefault(task_project, {})['comments_count'] = int(count or 0)
+        return result
+
+    @staticmethod
+    def get_stats(project_id):
+        """
+        Obtener los contadores del proyecto desde project_stats (una fila)
+        Si la fila no existe todavía se recalculan sin guardarlos
+        """
+        stats = ProjectStats.query.get(project_id)
+        if stats is not None:
+            return stats.counters()
+        counters = ProjectStats(project_id=project_id).counters()
+        counters.update(ProjectStatsService.compute(project_id).get(project_id, {}))
+        return counters
+
+    @staticmethod
+    def count_overdue(project_id, today=None):
+        """
+        Tareas no completadas con fecha límite vencida
+        Depende de la fecha actual, por lo que no se guarda en project_stats
+        """
+        today = today or datetime.utcnow().date()
+        return Task.query.filter(
+            Task.project_id == project_id,
+            Task.status != 'done',
+            Task.due_date < today
+        ).count()
+
+    @staticmethod
+    def rebuild(project_id=None):
+        """
+        Reconciliar project_stats con las tareas: recalcula todos los proyectos (o uno),
+        corrige las filas que no coinciden y crea las que faltan
+        Devuelve (resumen, error)
+        """
+        try:
+            computed = ProjectStatsService.compute(project_id)
+            projects = db.session.query(Project.id)
+            rows = ProjectStats.query
+            if project_id:
+                projects = projects.filter(Project.id == project_id)
+                rows = rows.filter(ProjectStats.project_id == project_id)
+            existing = {stats.project_id: stats for stats in rows}
+
+            checked, fixed, created = 0, 0, 0
+            for (current_id,) in projects:
+                checked += 1
+                expected = ProjectStats(project_id=current_id).counters()
+                expected.update(computed.get(current_id, {}))
+                stats = existing.get(current_id)
+                if stats is None:
+                    db.session.add(ProjectStats(project_id=current_id, **expected))
+                    created += 1
+                elif stats.counters() != expected:
+                    for counter, value in expected.items():
+                        setattr(stats, counter, value)
+                    fixed += 1
+            db.session.commit()
+            return {'checked': checked, 'fixed': fixed, 'created': created}, None
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Error al reconstruir estadísticas de proyectos: {str(e)}"
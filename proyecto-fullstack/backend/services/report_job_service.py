@@ -0,0 +1,240 @@
+"""
+Servicio de generación asíncrona de reportes PDF
+Los reportes grandes se encolan en un pool de hilos local a cada worker; el cliente
+consulta el progreso en GET /api/pdf/jobs/<id> y descarga el archivo al terminar.
+
+El estado del trabajo se guarda en la tabla report_jobs, por lo que cualquier worker
+puede responder la consulta de progreso; los archivos generados se guardan en
+PDF_JOB_DIR (debe ser un directorio compartido si hay varias réplicas).
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func
+from database import db
+from models.report_job import ReportJob
+
+DEFAULT_WORKERS = 2
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_STALE_SECONDS = 900
+
+PENDING_STATUSES = ('queued', 'running')
+FINISHED_STATUSES = ('done', 'failed')
+STALE_ERROR = 'El trabajo se interrumpió (reinicio del servidor); vuelve a solicitar el reporte'
+
+# Tipo de reporte -> (generador, nombre de descarga); el generador recibe PDFService
+REPORT_TYPES = {
+    'project': (
+        lambda pdf, params, progress: pdf.generate_project_report(
+            params['project_id'], progress_callback=progress),
+        'reporte_proyecto'
+    ),
+    'tasks': (
+        lambda pdf, params, progress: pdf.generate_tasks_report(
+            params.get('filters') or {}, progress_callback=progress),
+        'reporte_tareas'
+    ),
+    'general': (
+        lambda pdf, params, progress: pdf.generate_general_report(progress_callback=progress),
+        'reporte_general'
+    ),
+    'metrics': (
+        lambda pdf, params, progress: pdf.generate_metrics_report(
+            params.get('filters') or {}, params.get('include_charts', True), progress_callback=progress),
+        'reporte_metricas'
+    ),
+    'custom': (
+        lambda pdf, params, progress: pdf.generate_custom_report(
+            params.get('report_config') or {}, progress_callback=progress),
+        'reporte_personalizado'
+    )
+}
+
+
+class ReportJobService:
+    """Servicio para encolar y consultar trabajos de reportes PDF"""
+
+    _executor = None
+    _executor_pid = None
+    _executor_lock = threading.Lock()
+
+    @staticmethod
+    def _get_executor():
+        """Pool de hilos del proceso actual (se recrea tras el fork de Gunicorn)"""
+        if ReportJobService._executor_pid != os.getpid():
+            with ReportJobService._executor_lock:
+                if ReportJobService._executor_pid != os.getpid():
+                    ReportJobService._executor = ThreadPoolExecutor(
+                        max_workers=current_app.config.get('PDF_JOB_WORKERS', DEFAULT_WORKERS),
+                        thread_name_prefix='pdf-job'
+                    )
+                    ReportJobService._executor_pid = os.getpid()
+        return ReportJobService._executor
+
+    @staticmethod
+    def _job_dir():
+        job_dir = current_app.config.get('PDF_JOB_DIR') or os.path.join(tempfile.gettempdir(), 'nutrabiotics_pdf_jobs')
+        os.makedirs(job_dir, exist_ok=True)
+        return job_dir
+
+    @staticmethod
+    def _update(job_id, **values):
+        """Actualizar el trabajo en su propia transacción"""
+        ReportJob.query.filter_by(id=job_id).update(values)
+        db.session.commit()
+
+    @staticmethod
+    def _progress_reporter(job_id):
+        """Callback de progreso que solo escribe en la base de datos cada 5 %"""
+        last = {'value': 0}
+
+        def report(percentage):
+            # El 100 % se registra al guardar el archivo
+            percentage = min(percentage, 99)
+            if percentage - last['value'] >= 5:
+                last['value'] = percentage
+                ReportJobService._update(job_id, progress=percentage)
+
+        return report
+
+    @staticmethod
+    def run_job(job_id):
+        """Generar el reporte de un trabajo (se ejecuta dentro de un contexto de aplicación)"""
+        job = db.session.get(ReportJob, job_id)
+        if not job or job.status != 'queued':
+            return
+
+        # Solo si sigue en cola: fail_stale_jobs pudo marcarlo como fallido mientras esperaba
+        started = ReportJob.query.filter_by(id=job_id, status='queued')\
+                                 .update({'status': 'running', 'started_at': datetime.utcnow(), 'progress': 1})
+        db.session.commit()
+        if not started:
+            return
+        # Importación diferida: ReportLab solo se carga en los procesos que generan reportes
+        from services.pdf_service import PDFService
+
+        generator, _ = REPORT_TYPES[job.report_type]
+        try:
+            pdf_file, error = generator(PDFService, job.get_params(), ReportJobService._progress_reporter(job_id))
+        except Exception as e:
+            pdf_file, error = None, f"Error generando reporte: {str(e)}"
+
+        if error or pdf_file is None:
+            if pdf_file is not None:
+                pdf_file.close()
+            db.session.rollback()
+            ReportJobService._update(
+                job_id, status='failed', error=error or 'Error generando el reporte PDF',
+                finished_at=datetime.utcnow()
+            )
+            return
+
+        file_path = os.path.join(ReportJobService._job_dir(), f'{job_id}.pdf')
+        with pdf_file, open(file_path, 'wb') as f:
+            shutil.copyfileobj(pdf_file, f)
+        ReportJobService._update(
+            job_id, status='done', progress=100, file_path=file_path,
+            file_size=os.path.getsize(file_path), finished_at=datetime.utcnow()
+        )
+
+    @staticmethod
+    def _run_in_context(app, job_id):
+        with app.app_context():
+            try:
+                ReportJobService.run_job(job_id)
+            except Exception as e:
+                db.session.rollback()
+                ReportJobService._update(job_id, status='failed', error=str(e), finished_at=datetime.utcnow())
+            finally:
+                db.session.remove()
+
+    @staticmethod
+    def enqueue(user_id, report_type, params=None):
+        """Crear un trabajo y enviarlo al pool de hilos"""
+        try:
+            if report_type not in REPORT_TYPES:
+                return None, f"Tipo de reporte inválido. Tipos válidos: {', '.join(REPORT_TYPES)}"
+            params = params or {}
+            if report_type == 'project' and not params.get('project_id'):
+                return None, "project_id es requerido para el reporte de proyecto"
+
+            ReportJobService.purge_expired_jobs()
+            ReportJobService.fail_stale_jobs()
+
+            job = ReportJob(user_id=user_id, report_type=report_type, params=json.dumps(params))
+            db.session.add(job)
+            db.session.commit()
+
+            app = current_app._get_current_object()
+            ReportJobService._get_executor().submit(ReportJobService._run_in_context, app, job.id)
+            return job.to_dict(), None
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Error al encolar el reporte: {str(e)}"
+
+    @staticmethod
+    def get_job(job_id, user_id):
+        """Obtener un trabajo del usuario"""
+        try:
+            job = ReportJob.query.filter_by(id=job_id, user_id=user_id).first()
+            if not job:
+                return None, "Trabajo de reporte no encontrado"
+            # Sin esto el cliente consultaría para siempre un trabajo que ningún worker tiene
+            if job.status in PENDING_STATUSES and ReportJobService.fail_stale_jobs(job_id=job.id):
+                db.session.refresh(job)
+            return job, None
+        except Exception as e:
+            return None, f"Error al obtener el trabajo: {str(e)}"
+
+    @staticmethod
+    def get_download_name(job):
+        """Nombre de archivo con el que se descarga el reporte"""
+        _, prefix = REPORT_TYPES[job.report_type]
+        if job.report_type == 'project':
+            prefix = f"{prefix}_{job.get_params()['project_id']}"
+        finished_at = job.finished_at or datetime.utcnow()
+        return f'{prefix}_{finished_at.strftime("%Y%m%d_%H%M%S")}.pdf'
+
+    @staticmethod
+    def fail_stale_jobs(now=None, job_id=None):
+        """
+        Marcar como fallidos los trabajos en cola o en curso sin escrituras desde hace
+        PDF_JOB_STALE_SECONDS: el pool de hilos es local al proceso y se pierde si el
+        worker se recicla o reinicia. Devuelve el número de trabajos marcados
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(seconds=current_app.config.get('PDF_JOB_STALE_SECONDS', DEFAULT_STALE_SECONDS))
+        query = ReportJob.query.filter(
+            ReportJob.status.in_(PENDING_STATUSES),
+            func.coalesce(ReportJob.updated_at, ReportJob.started_at, ReportJob.created_at) < cutoff
+        )
+        if job_id:
+            query = query.filter(ReportJob.id == job_id)
+        stale = query.update({'status': 'failed', 'error': STALE_ERROR, 'finished_at': now},
+                             synchronize_session=False)
+        db.session.commit()
+        return stale
+
+    @staticmethod
+    def purge_expired_jobs(now=None):
+        """
+        Eliminar los trabajos terminados (y sus archivos) más antiguos que PDF_JOB_TTL_SECONDS
+        Los trabajos en cola o en curso no se borran: run_job todavía escribirá en ellos
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(seconds=current_app.config.get('PDF_JOB_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+        expired = ReportJob.query.filter(
+            ReportJob.status.in_(FINISHED_STATUSES),
+            func.coalesce(ReportJob.finished_at, ReportJob.created_at) < cutoff
+        ).all()
+        for job in expired:
+            if job.file_path and os.path.exists(job.file_path):
+                os.remove(job.file_path)
+            db.session.delete(job)
+        db.session.commit()
+        return len(expired)
@@ -0,0 +1,240 @@
+"""
+Servicio de búsqueda de texto completo
+PostgreSQL: columna tsvector generada + índice GIN (migración 0011_indice_busqueda)
+SQLite: tablas virtuales FTS5 sincronizadas con triggers (desarrollo/tests)
+Sin soporte de índice se usa ILIKE como respaldo
+"""
+import logging
+import re
+from flask import current_app
+from database import db
+from models.task import Task
+from models.project import Project
+from models.comment import Comment
+
+# Tablas indexadas: tabla -> columnas de texto (en orden de peso)
+SEARCH_TABLES = {
+    'tasks': ('title', 'description'),
+    'projects': ('name', 'description'),
+    'comments': ('content',)
+}
+
+SEARCH_WEIGHTS = ('A', 'B', 'C', 'D')
+MAX_SEARCH_TERMS = 8
+
+logger = logging.getLogger(__name__)
+
+
+class SearchService:
+    """Servicio para indexar y buscar tareas, proyectos y comentarios"""
+
+    @staticmethod
+    def init_app(app):
+        """Preparar el índice de búsqueda y registrar el backend disponible"""
+        with app.app_context():
+            try:
+                backend = SearchService.ensure_search_index()
+            except Exception as e:
+                db.session.rollback()
+                logger.warning("Índice de búsqueda no disponible, se usará ILIKE: %s", e)
+                backend = 'like'
+        app.config['SEARCH_BACKEND'] = backend
+
+    @staticmethod
+    def ensure_search_index():
+        """
+        Devolver el backend de búsqueda disponible
+        En PostgreSQL el índice lo crea la migración (un ALTER TABLE en cada arranque de
+        worker tomaría bloqueos exclusivos); aquí solo se comprueba que exista. Las tablas
+        FTS5 de SQLite sí se crean aquí porque desarrollo y pruebas usan db.create_all
+        """
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            if SearchService._postgres_index_exists():
+                return 'postgresql'
+            logger.warning("Faltan las columnas search_vector (ejecuta flask db upgrade); se usará ILIKE")
+            return 'like'
+        if dialect == 'sqlite':
+            SearchService._ensure_sqlite_index()
+            return 'sqlite'
+        return 'like'
+
+    @staticmethod
+    def _language():
+        """Configuración de idioma para tsvector (solo identificadores simples)"""
+        language = current_app.config.get('SEARCH_LANGUAGE', 'spanish')
+        if not re.fullmatch(r'\w+', language):
+            raise ValueError(f"SEARCH_LANGUAGE inválido: {language}")
+        return language
+
+    @staticmethod
+    def _postgres_index_exists():
+        """Todas las tablas indexadas tienen la columna search_vector"""
+        count = db.session.execute(
+            db.text(
+                "SELECT count(*) FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND column_name = 'search_vector' "
+                "AND table_name IN :tables"
+            ).bindparams(db.bindparam('tables', expanding=True)),
+            {'tables': list(SEARCH_TABLES)}
+        ).scalar()
+        db.session.commit()
+        return count == len(SEARCH_TABLES)
+
+    @staticmethod
+    def _sqlite_fts_statements(table, columns):
+        """DDL de la tabla FTS5 y sus tres triggers, por nombre de objeto"""
+        fts = f"{table}_fts"
+        cols = ', '.join(columns)
+        new_values = ', '.join(f"new.{column}" for column in columns)
+        old_values = ', '.join(f"old.{column}" for column in columns)
+        return {
+            fts: (
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', "
+                f"content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')"
+            ),
+            f"{fts}_ai": (
+                f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END"
+            ),
+            f"{fts}_ad": (
+                f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END"
+            ),
+            f"{fts}_au": (
+                f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END"
+            )
+        }
+
+    @staticmethod
+    def _ensure_sqlite_index():
+        """
+        Tablas FTS5 de contenido externo sincronizadas por triggers
+        pysqlite confirma cada DDL por separado: si un arranque anterior falló a mitad
+        (p. ej. base sin migrar) puede existir la tabla sin algún trigger, así que se
+        crean los objetos que falten y se reindexa
+        """
+        with db.engine.begin() as connection:
+            for table, columns in SEARCH_TABLES.items():
+                fts = f"{table}_fts"
+                statements = SearchService._sqlite_fts_statements(table, columns)
+                existing = {name for name, in connection.execute(
+                    db.text("SELECT name FROM sqlite_master WHERE name IN :names")
+                      .bindparams(db.bindparam('names', expanding=True)),
+                    {'names': list(statements)}
+                )}
+                missing = [name for name in statements if name not in existing]
+                if not missing:
+                    continue
+
+                for name in missing:
+                    connection.execute(db.text(statements[name]))
+                # Indexar las filas existentes (y las cambiadas mientras faltaba un trigger)
+                connection.execute(db.text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+    @staticmethod
+    def _backend():
+        """Backend de búsqueda registrado al iniciar la aplicación"""
+        return current_app.config.get('SEARCH_BACKEND', 'like')
+
+    @staticmethod
+    def _terms(text):
+        """Extraer las palabras buscables del texto ingresado"""
+        return re.findall(r'\w+', text or '', flags=re.UNICODE)[:MAX_SEARCH_TERMS]
+
+    @staticmethod
+    def match_subquery(table, text):
+        """
+        Subconsulta (id, rank) con las filas de la tabla que coinciden con el texto
+        Todas las palabras deben aparecer y cada una se trata como prefijo.
+        Devuelve None si no hay índice disponible o el texto no tiene palabras.
+        """
+        terms = SearchService._terms(text)
+        backend = SearchService._backend()
+        if not terms or backend == 'like':
+            return None
+
+        if backend == 'postgresql':
+            tsquery = ' & '.join(f"{term}:*" for term in terms)
+            statement = db.text(
+                f"SELECT {table}.id AS id, ts_rank({table}.search_vector, query) AS rank "
+                f"FROM {table}, to_tsquery(CAST(:language AS regconfig), :query) query "
+                f"WHERE {table}.search_vector @@ query"
+            ).bindparams(language=SearchService._language(), query=tsquery)
+        else:
+            match = ' '.join(f'"{term}"*' for term in terms)
+            # bm25 devuelve valores menores para mejores coincidencias
+            statement = db.text(
+                f"SELECT {table}.id AS id, -bm25({table}_fts) AS rank "
+                f"FROM {table}_fts JOIN {table} ON {table}.rowid = {table}_fts.rowid "
+                f"WHERE {table}_fts MATCH :query"
+            ).bindparams(query=match)
+
+        return statement.columns(id=db.String, rank=db.Float).subquery(f"{table}_matches")
+
+    @staticmethod
+    def apply_task_search(query, text):
+        """
+        Filtrar una consulta de tareas por texto
+        Devuelve (query, rank) donde rank es None cuando se usa ILIKE
+        """
+        matches = SearchService.match_subquery('tasks', text)
+        if matches is None:
+            search_term = f"%{text}%"
+            return query.filter(Task.title.ilike(search_term) | Task.description.ilike(search_term)), None
+        return query.join(matches, matches.c.id == Task.id), matches.c.rank
+
+    @staticmethod
+    def _search_model(model, table, text, limit, like_columns, base_filter=None):
+        """Buscar registros de un modelo ordenados por relevancia"""
+        matches = SearchService.match_subquery(table, text)
+        if matches is None:
+            search_term = f"%{text}%"
+            query = model.query.add_columns(db.literal(0.0))\
+                               .filter(db.or_(*[column.ilike(search_term) for column in like_columns]))
+        else:
+            query = model.query.join(matches, matches.c.id == model.id)\
+                               .add_columns(matches.c.rank)\
+                               .order_by(matches.c.rank.desc())
+        if base_filter is not None:
+            query = query.filter(base_filter)
+        return query.limit(limit).all()
+
+    @staticmethod
+    def search(text, types=None, limit=10):
+        """Buscar en tareas, proyectos y comentarios"""
+        try:
+            types = types or list(SEARCH_TABLES.keys())
+            results = {}
+
+            if 'tasks' in types:
+                rows = SearchService._search_model(
+                    Task, 'tasks', text, limit, (Task.title, Task.description)
+                )
+                task_ids = [task.id for task, _ in rows]
+                comments_count = dict(
+                    Task.comments_count_query().filter(Comment.task_id.in_(task_ids)).all()
+                ) if task_ids else {}
+                results['tasks'] = [
+                    {**task.to_dict(comments_count=comments_count.get(task.id, 0)), 'score': rank}
+                    for task, rank in rows
+                ]
+
+            if 'projects' in types:
+                rows = SearchService._search_model(
+                    Project, 'projects', text, limit, (Project.name, Project.description)
+                )
+                results['projects'] = [{**project.to_dict(), 'score': rank} for project, rank in rows]
+
+            if 'comments' in types:
+                rows = SearchService._search_model(
+                    Comment, 'comments', text, limit, (Comment.content,),
+                    base_filter=db.or_(Comment.is_deleted == False, Comment.is_deleted.is_(None))
+                )
+                results['comments'] = [{**comment.to_dict(), 'score': rank} for comment, rank in rows]
+
+            return results, None
+        except Exception as e:
+            return None, f"Error al realizar la búsqueda: {str(e)}"
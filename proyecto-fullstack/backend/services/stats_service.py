@@ -0,0 +1,176 @@
+"""
+Servicio de estadísticas agregadas
+Calcula los conteos de tareas y proyectos directamente en SQL (GROUP BY) en lugar de
+cargar cada fila en memoria
+"""
+from datetime import datetime, time, timedelta
+from sqlalchemy import case, func
+from database import db
+from models.project import Project
+from models.task import Task
+
+TASK_STATUSES = ('todo', 'in_progress', 'review', 'done')
+TASK_PRIORITIES = ('high', 'medium', 'low')
+PROJECT_STATUSES = ('active', 'completed', 'on_hold')
+
+# Rango permitido (en días) para la línea temporal de tareas
+TIMELINE_MAX_DAYS = 365
+
+
+class StatsService:
+    """Motor de estadísticas de tareas y proyectos basado en consultas agregadas"""
+
+    @staticmethod
+    def get_task_counts(filters=None):
+        """
+        Obtener el conteo de tareas por (estado, prioridad) en una sola consulta
+        Filtros soportados: project_id, assigned_to
+        """
+        query = db.session.query(Task.status, Task.priority, func.count(Task.id))
+
+        if filters:
+            if filters.get('project_id'):
+                query = query.filter(Task.project_id == filters['project_id'])
+            if filters.get('assigned_to'):
+                query = query.filter(Task.assigned_to == filters['assigned_to'])
+
+        rows = query.group_by(Task.status, Task.priority).all()
+        return {(status, priority): count for status, priority, count in rows}
+
+    @staticmethod
+    def build_task_stats(counts):
+        """Construir la respuesta de estadísticas a partir de los conteos agrupados"""
+        tasks_by_status = {status: 0 for status in TASK_STATUSES}
+        tasks_by_priority = {priority: 0 for priority in TASK_PRIORITIES}
+        total_tasks = 0
+
+        for (status, priority), count in counts.items():
+            total_tasks += count
+            if status in tasks_by_status:
+                tasks_by_status[status] += count
+            if priority in tasks_by_priority:
+                tasks_by_priority[priority] += count
+
+        return {
+            'total_tasks': total_tasks,
+            'tasks_by_status': tasks_by_status,
+            'tasks_by_priority': tasks_by_priority,
+            'completed_tasks': tasks_by_status['done'],
+            'in_progress_tasks': tasks_by_status['in_progress'],
+            'pending_tasks': tasks_by_status['todo']
+        }
+
+    @staticmethod
+    def get_task_stats(filters=None):
+        """Obtener estadísticas de tareas (estado, prioridad y totales)"""
+        return StatsService.build_task_stats(StatsService.get_task_counts(filters))
+
+    @staticmethod
+    def get_project_counts():
+        """Obtener el conteo de proyectos por estado en una sola consulta"""
+        rows = db.session.query(Project.status, func.count(Project.id))\
+                         .group_by(Project.status)\
+                         .all()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def build_project_stats(project_counts, task_stats):
+        """Construir la respuesta de estadísticas de proyectos"""
+        return {
+            'total_projects': sum(project_counts.values()),
+            'total_tasks': task_stats['total_tasks'],
+            'tasks_by_status': task_stats['tasks_by_status'],
+            'tasks_by_priority': task_stats['tasks_by_priority'],
+            'projects_by_status': {
+                status: project_counts.get(status, 0) for status in PROJECT_STATUSES
+            }
+        }
+
+    @staticmethod
+    def get_daily_counts(column, since, filters=None, status=None):
+        """
+        Contar tareas por día de `column` desde `since` (truncando la fecha en SQL)
+        Devuelve {'YYYY-MM-DD': conteo} solo con los días que tienen tareas
+        """
+        day = func.date(column)
+        query = db.session.query(day, func.count(Task.id)).filter(column >= since)
+        if status:
+            query = query.filter(Task.status == status)
+        if filters and filters.get('project_id'):
+            query = query.filter(Task.project_id == filters['project_id'])
+
+        # SQLite devuelve la fecha como texto y PostgreSQL como date
+        return {str(bucket): count for bucket, count in query.group_by(day).all()}
+
+    @staticmethod
+    def get_task_timeline(days=30, filters=None, today=None):
+        """
+        Tareas creadas y completadas por día en los últimos `days` días (incluido hoy)
+        Las tareas completadas se cuentan por el día de su última actualización con estado done
+        Los días sin tareas se rellenan con 0; los días son en UTC, como las fechas guardadas
+        """
+        days = min(max(int(days), 1), TIMELINE_MAX_DAYS)
+        first_day = (today or datetime.utcnow().date()) - timedelta(days=days - 1)
+        since = datetime.combine(first_day, time.min)
+
+        created = StatsService.get_daily_counts(Task.created_at, since, filters)
+        completed = StatsService.get_daily_counts(Task.updated_at, since, filters, status='done')
+
+        timeline = []
+        for offset in range(days):
+            key = (first_day + timedelta(days=offset)).isoformat()
+            timeline.append({
+                'date': key,
+                'created': created.get(key, 0),
+                'completed': completed.get(key, 0)
+            })
+        return timeline
+
+    @staticmethod
+    def get_projects_progress():
+        """Obtener tareas totales y completadas de cada proyecto en una sola consulta agrupada"""
+        done = func.sum(case((Task.status == 'done', 1), else_=0))
+        rows = db.session.query(
+                Project.id, Project.name, Project.status,
+                func.count(Task.id), func.coalesce(done, 0)
+            )\
+            .outerjoin(Task, Task.project_id == Project.id)\
+            .group_by(Project.id, Project.name, Project.status)\
+            .order_by(Project.name)\
+            .all()
+
+        return [{
+            'project_id': project_id,
+            'name': name,
+            'status': status,
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'progress': round(completed * 100 / total, 1) if total else 0
+        } for project_id, name, status, total, completed in rows]
+
+    @staticmethod
+    def get_overview():
+        """
+        Obtener métricas generales (proyectos, tareas y resumen)
+        Usa una consulta agregada por tabla: 2 consultas en total
+        """
+        try:
+            task_stats = StatsService.get_task_stats()
+            project_stats = StatsService.build_project_stats(
+                StatsService.get_project_counts(), task_stats
+            )
+
+            overview = {
+                'projects': project_stats,
+                'tasks': task_stats,
+                'summary': {
+                    'total_projects': project_stats['total_projects'],
+                    'total_tasks': task_stats['total_tasks'],
+                    'completed_tasks': task_stats['completed_tasks'],
+                    'in_progress_tasks': task_stats['in_progress_tasks'],
+                    'pending_tasks': task_stats['pending_tasks']
+                }
+            }
+            return overview, None
+        except Exception as e:
+            return None, f"Error al obtener métricas: {str(e)}"
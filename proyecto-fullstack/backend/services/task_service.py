@@ -6,11 +6,52 @@ from database import db
 from models.task import Task
 from models.project import Project
 from models.user import User
+from services.stats_service import StatsService
+from services.project_stats_service import ProjectStatsService
+from services.search_service import SearchService
+from utils.pagination import apply_keyset, encode_cursor
 
 class TaskService:
+    @staticmethod
+    def _serialize_tasks(query, limit=None):
+        """Serializar tareas obteniendo commentsCount en la misma consulta"""
+        counts = Task.comments_count_query().subquery()
+        query = query.outerjoin(counts, counts.c.task_id == Task.id)\
+                     .add_columns(db.func.coalesce(counts.c.comments_count, 0))
+        if limit:
+            query = query.limit(limit)
+        return [task.to_dict(comments_count=count) for task, count in query.all()]
+
+    @staticmethod
+    def _build_tasks_query(filters=None, ranked=False):
+        """
+        Construir la consulta de tareas aplicando los filtros soportados
+        ranked: ordenar por relevancia cuando se filtra por texto
+        """
+        query = Task.query
+        
+        if filters:
+            if 'project_id' in filters:
+                query = query.filter_by(project_id=filters['project_id'])
+            if 'assigned_to' in filters:
+                query = query.filter_by(assigned_to=filters['assigned_to'])
+            if 'status' in filters:
+                query = query.filter_by(status=filters['status'])
+            if 'priority' in filters:
+                query = query.filter_by(priority=filters['priority'])
+            if 'search' in filters:
+                query, rank = SearchService.apply_task_search(query, filters['search'])
+                if ranked and rank is not None:
+                    query = query.order_by(rank.desc())
+        
+        return query
+
     @staticmethod
     def notify_task_crud(user_id, action, task, project=None):
-        """Notificar al usuario sobre acción CRUD en una tarea"""
+        """
+        Notificar al usuario sobre acción CRUD en una tarea
+        La notificación se agrega a la transacción de la tarea: quien llama hace un solo commit
+        """
         from services.notification_service import NotificationService
         actions = {
             'create': ('Tarea creada', f"Se ha creado la tarea '{task.title}' en el proyecto '{project.name if project else ''}'."),
@@ -19,14 +60,13 @@ class TaskService:
         }
         if action in actions:
             title, message = actions[action]
-            NotificationService.create_notification(
+            NotificationService.add_notification(
                 user_id=user_id,
                 title=title,
                 message=message,
                 notification_type='info',
                 category='task'
             )
-            db.session.commit()
     @staticmethod
     def add_task_comment(task_id, content, user_id):
         """Agregar comentario a una tarea"""
@@ -46,6 +86,7 @@ class TaskService:
                 author_id=user_id
             )
             db.session.add(comment)
+            ProjectStatsService.comment_added(task.project_id)
             db.session.commit()
             return comment.to_dict(), None
         except Exception as e:
@@ -64,36 +105,7 @@ class TaskService:
     def get_tasks_stats(filters=None):
         """Obtener estadísticas de tareas con filtros opcionales"""
         try:
-            query = Task.query
-            if filters:
-                if 'project_id' in filters:
-                    query = query.filter(Task.project_id == filters['project_id'])
-                if 'assigned_to' in filters:
-                    query = query.filter(Task.assigned_to == filters['assigned_to'])
-            tasks = query.all()
-            total_tasks = len(tasks)
-            tasks_by_status = {
-                'todo': len([t for t in tasks if t.status == 'todo']),
-                'in_progress': len([t for t in tasks if t.status == 'in_progress']),
-                'review': len([t for t in tasks if t.status == 'review']),
-                'done': len([t for t in tasks if t.status == 'done'])
-            }
-            tasks_by_priority = {
-                'high': len([t for t in tasks if t.priority == 'high']),
-                'medium': len([t for t in tasks if t.priority == 'medium']),
-                'low': len([t for t in tasks if t.priority == 'low'])
-            }
-            completed_tasks = len([t for t in tasks if t.status == 'done'])
-            in_progress_tasks = len([t for t in tasks if t.status == 'in_progress'])
-            pending_tasks = len([t for t in tasks if t.status == 'todo'])
-            metrics = {
-                'total_tasks': total_tasks,
-                'tasks_by_status': tasks_by_status,
-                'tasks_by_priority': tasks_by_priority,
-                'completed_tasks': completed_tasks,
-                'in_progress_tasks': in_progress_tasks,
-                'pending_tasks': pending_tasks
-            }
+            metrics = StatsService.get_task_stats(filters)
             return metrics, None
         except Exception as e:
             return None, str(e)
@@ -101,69 +113,111 @@ class TaskService:
     def get_all_tasks(filters=None):
         """Obtener todas las tareas con filtros opcionales"""
         try:
-            query = Task.query
-            
-            if filters:
-                if 'project_id' in filters:
-                    query = query.filter_by(project_id=filters['project_id'])
-                if 'assigned_to' in filters:
-                    query = query.filter_by(assigned_to=filters['assigned_to'])
-                if 'status' in filters:
-                    query = query.filter_by(status=filters['status'])
-                if 'priority' in filters:
-                    query = query.filter_by(priority=filters['priority'])
-                if 'search' in filters:
-                    search_term = f"%{filters['search']}%"
-                    query = query.filter(Task.title.ilike(search_term) | Task.description.ilike(search_term))
-            
-            tasks = query.all()
-            return [task.to_dict() for task in tasks], None
+            query = TaskService._build_tasks_query(filters, ranked=True)
+            return TaskService._serialize_tasks(query), None
         except Exception as e:
             return None, f"Error al obtener tareas: {str(e)}"
 
     @staticmethod
-    def get_all_tasks_stats():
-        """Obtener estadísticas de todas las tareas"""
+    def stream_tasks(filters=None, batch_size=1000):
+        """
+        Recorrer las tareas filtradas por lotes (yield_per) sin cargarlas todas en memoria
+        Cada fila trae los nombres del proyecto y del usuario asignado, ordenadas por (created_at, id)
+        """
+        return TaskService._build_tasks_query(filters)\
+            .outerjoin(Project, Project.id == Task.project_id)\
+            .outerjoin(User, User.id == Task.assigned_to)\
+            .with_entities(
+                Task.id, Task.title, Task.description, Task.status, Task.priority,
+                Task.project_id, Project.name.label('project_name'),
+                Task.assigned_to, User.name.label('assigned_to_name'),
+                Task.due_date, Task.created_at, Task.updated_at
+            )\
+            .order_by(Task.created_at, Task.id)\
+            .yield_per(batch_size)
+
+    @staticmethod
+    def count_tasks(filters=None):
+        """Contar las tareas que cumplen los filtros"""
         try:
-            tasks = Task.query.all()
-            
-            total_tasks = len(tasks)
+            return TaskService._build_tasks_query(filters).count(), None
+        except Exception as e:
+            return None, f"Error al contar tareas: {str(e)}"
+
+    @staticmethod
+    def get_tasks_page(filters=None, limit=50, cursor=None, include_total=False):
+        """
+        Obtener una página de tareas ordenada por (created_at, id)
+        cursor: posición (created_at, id) decodificada de la página anterior
+        """
+        try:
+            query = TaskService._build_tasks_query(filters)
+            total = query.count() if include_total else None
             
-            # Estadísticas por estado
-            tasks_by_status = {
-                'todo': len([t for t in tasks if t.status == 'todo']),
-                'in_progress': len([t for t in tasks if t.status == 'in_progress']),
-                'review': len([t for t in tasks if t.status == 'review']),
-                'done': len([t for t in tasks if t.status == 'done'])
-            }
+            # Se pide un registro extra para saber si existe otra página
+            page_query = apply_keyset(query, Task.created_at, Task.id, cursor)
+            tasks = TaskService._serialize_tasks(page_query, limit=limit + 1)
             
-            # Estadísticas por prioridad
-            tasks_by_priority = {
-                'high': len([t for t in tasks if t.priority == 'high']),
-                'medium': len([t for t in tasks if t.priority == 'medium']),
-                'low': len([t for t in tasks if t.priority == 'low'])
-            }
+            next_cursor = None
+            if len(tasks) > limit:
+                tasks = tasks[:limit]
+                next_cursor = encode_cursor(tasks[-1]['created_at'], tasks[-1]['id'])
             
-            # Estadísticas adicionales para compatibility
-            stats = {
-                'total_tasks': total_tasks,
-                'completed_tasks': tasks_by_status['done'],
-                'in_progress_tasks': tasks_by_status['in_progress'],
-                'pending_tasks': tasks_by_status['todo'],
-                'tasks_by_status': tasks_by_status,
-                'tasks_by_priority': tasks_by_priority
+            page = {
+                'tasks': tasks,
+                'next_cursor': next_cursor
             }
-            
+            if include_total:
+                page['total'] = total
+            return page, None
+        except Exception as e:
+            return None, f"Error al obtener tareas: {str(e)}"
+
+    @staticmethod
+    def get_all_tasks_stats(filters=None):
+        """Obtener estadísticas de todas las tareas"""
+        try:
+            stats = StatsService.get_task_stats(filters)
             return stats, None
         except Exception as e:
             return None, f"Error al obtener estadísticas: {str(e)}"
 
+    @staticmethod
+    def get_tasks_by_status_chart(filters=None):
+        """Obtener datos del gráfico de tareas por estado"""
+        try:
+            counts = StatsService.get_task_stats(filters)['tasks_by_status']
+            return [{'status': status, 'count': count} for status, count in counts.items()], None
+        except Exception as e:
+            return None, f"Error al obtener datos del gráfico: {str(e)}"
+
+    @staticmethod
+    def get_tasks_by_priority_chart(filters=None):
+        """Obtener datos del gráfico de tareas por prioridad"""
+        try:
+            counts = StatsService.get_task_stats(filters)['tasks_by_priority']
+            return [{'priority': priority, 'count': count} for priority, count in counts.items()], None
+        except Exception as e:
+            return None, f"Error al obtener datos del gráfico: {str(e)}"
+
+    @staticmethod
+    def get_tasks_timeline_chart(filters=None):
+        """
+        Obtener tareas creadas y completadas por día
+        Filtros soportados: days (por defecto 30), project_id
+        """
+        try:
+            filters = filters or {}
+            return StatsService.get_task_timeline(filters.get('days', 30), filters), None
+        except Exception as e:
+            return None, f"Error al obtener datos del gráfico: {str(e)}"
+
     @staticmethod
     def get_tasks_by_project(project_id):
         """Obtener tareas por proyecto"""
         try:
-            tasks = Task.query.filter_by(project_id=project_id).all()
-            return [task.to_dict() for task in tasks], None
+            query = Task.query.filter_by(project_id=project_id)
+            return TaskService._serialize_tasks(query), None
         except Exception as e:
             return None, f"Error al obtener tareas: {str(e)}"
 
@@ -198,10 +252,11 @@ class TaskService:
                 due_date=datetime.strptime(due_date, '%Y-%m-%d').date() if due_date else None
             )
             db.session.add(task)
-            db.session.commit()
-            # Notificar al usuario asignado si existe
+            ProjectStatsService.task_created(task)
+            # Notificar al usuario asignado si existe (mismo commit que la tarea)
             if user:
                 TaskService.notify_task_crud(user.id, 'create', task, project)
+            db.session.commit()
             return task.to_dict(), None
         except Exception as e:
             db.session.rollback()
@@ -234,21 +289,23 @@ class TaskService:
                 kwargs['due_date'] = datetime.strptime(kwargs['due_date'], '%Y-%m-%d').date()
             print(f"🔧 Actualizando campos...")
             prev_assigned_to = task.assigned_to
+            previous = (task.project_id, task.status, task.priority)
             for key, value in kwargs.items():
                 if hasattr(task, key):
                     print(f"🔧   {key}: {value}")
                     setattr(task, key, value)
                 else:
                     print(f"⚠️  Campo ignorado (no existe): {key}")
-            print(f"🔧 Commitando cambios...")
-            db.session.commit()
-            # Notificar al usuario si la asignación cambió
+            ProjectStatsService.task_updated(previous, task)
+            # Notificar al usuario si la asignación cambió (mismo commit que la tarea)
             assigned_to_id = kwargs.get('assigned_to')
             if assigned_to_id and assigned_to_id != prev_assigned_to:
                 user = User.query.get(assigned_to_id)
                 project = Project.query.get(task.project_id)
                 if user and project:
                     TaskService.notify_task_crud(user.id, 'update', task, project)
+            print(f"🔧 Commitando cambios...")
+            db.session.commit()
             print(f"✅ Tarea actualizada exitosamente")
             return task.to_dict(), None
         except Exception as e:
@@ -261,8 +318,12 @@ class TaskService:
         """Eliminar todas las notificaciones de un usuario"""
         from models.notification import Notification
         try:
+            from services.notification_service import NotificationService
+            unread = Notification.query.filter_by(user_id=user_id, unread=True).delete()
             Notification.query.filter_by(user_id=user_id).delete()
+            NotificationService.adjust_unread(user_id, -unread)
             db.session.commit()
+            NotificationService.publish_unread(user_id, -unread)
             return True, "Notificaciones eliminadas"
         except Exception as e:
             db.session.rollback()
@@ -276,7 +337,9 @@ class TaskService:
             return None, "Tarea no encontrada"
         
         try:
+            previous = (task.project_id, task.status, task.priority)
             task.status = new_status
+            ProjectStatsService.task_updated(previous, task)
             db.session.commit()
             return task.to_dict(), None
         except Exception as e:
@@ -293,13 +356,15 @@ class TaskService:
         try:
             assigned_to_id = task.assigned_to
             project = Project.query.get(task.project_id)
+            comments = ProjectStatsService.count_task_comments(task.id)
             db.session.delete(task)
-            db.session.commit()
-            # Notificar al usuario asignado si existe
+            ProjectStatsService.task_deleted(task, comments)
+            # Notificar al usuario asignado si existe (mismo commit que el borrado)
             if assigned_to_id:
                 user = User.query.get(assigned_to_id)
                 if user and project:
                     TaskService.notify_task_crud(user.id, 'delete', task, project)
+            db.session.commit()
             return True, "Tarea eliminada exitosamente"
         except Exception as e:
             db.session.rollback()
@@ -309,8 +374,8 @@ class TaskService:
     def get_user_tasks(user_id):
         """Obtener tareas asignadas a un usuario"""
         try:
-            tasks = Task.query.filter_by(assigned_to=user_id).all()
-            return [task.to_dict() for task in tasks], None
+            query = Task.query.filter_by(assigned_to=user_id)
+            return TaskService._serialize_tasks(query), None
         except Exception as e:
             return None, f"Error al obtener tareas del usuario: {str(e)}"
 
@@ -318,7 +383,7 @@ class TaskService:
     def get_tasks_by_status(status):
         """Obtener tareas por estado"""
         try:
-            tasks = Task.query.filter_by(status=status).all()
-            return [task.to_dict() for task in tasks], None
+            query = Task.query.filter_by(status=status)
+            return TaskService._serialize_tasks(query), None
         except Exception as e:
             return None, f"Error al obtener tareas por estado: {str(e)}"
@@ -0,0 +1,134 @@
+"""
+Servicio de purga de tokens expirados
+Elimina por lotes los tokens revocados cuyo JWT ya expiró y los tokens de reseteo
+de contraseña usados o vencidos. Se ejecuta con `flask purge-tokens` o, si
+TOKEN_PURGE_INTERVAL_SECONDS > 0, desde un hilo en segundo plano en cada worker; en
+PostgreSQL un advisory lock evita que varios workers purguen los mismos lotes a la vez.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, func, or_
+from database import db
+from models.revoked_token import RevokedToken
+from models.password_reset_token import PasswordResetToken
+from utils.advisory_lock import exclusive_pass
+from utils.metrics import TOKEN_TABLE_ROWS, TOKENS_PURGED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Clave del advisory lock de PostgreSQL que serializa las purgas entre procesos
+# (distinta de RETENTION_LOCK_KEY)
+TOKEN_PURGE_LOCK_KEY = 720120
+
+
+class TokenCleanupService:
+    """Servicio para compactar las tablas de tokens"""
+
+    _scheduler_pid = None
+    _scheduler_lock = threading.Lock()
+
+    @staticmethod
+    def _expired_conditions(now):
+        """Condición de purga por tabla"""
+        # Filas anteriores a expires_at: se conservan mientras el refresh token más largo siga vigente
+        legacy_cutoff = now - current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+        return {
+            'revoked_tokens': (RevokedToken, or_(
+                RevokedToken.expires_at < now,
+                and_(RevokedToken.expires_at.is_(None), RevokedToken.created_at < legacy_cutoff)
+            )),
+            'password_reset_tokens': (PasswordResetToken, or_(
+                PasswordResetToken.used == True,
+                PasswordResetToken.expires_at < now
+            ))
+        }
+
+    @staticmethod
+    def get_table_sizes():
+        """Número de filas de cada tabla de tokens"""
+        sizes = {
+            'revoked_tokens': db.session.query(func.count(RevokedToken.id)).scalar(),
+            'password_reset_tokens': db.session.query(func.count(PasswordResetToken.id)).scalar()
+        }
+        for table, size in sizes.items():
+            TOKEN_TABLE_ROWS.labels(table=table).set(size)
+        return sizes
+
+    @staticmethod
+    def _delete_in_batches(model, condition, batch_size):
+        """Borrar las filas que cumplen la condición en lotes de batch_size (una transacción por lote)"""
+        deleted = 0
+        while True:
+            ids = [row_id for row_id, in db.session.query(model.id).filter(condition).limit(batch_size).all()]
+            if not ids:
+                return deleted
+            db.session.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            deleted += len(ids)
+            if len(ids) < batch_size:
+                return deleted
+
+    @staticmethod
+    def purge_expired_tokens(batch_size=DEFAULT_BATCH_SIZE, now=None):
+        """
+        Purgar tokens expirados y devolver el tamaño de las tablas antes y después
+        skipped=True si otro proceso ya está purgando (no se borra nada)
+        """
+        try:
+            now = now or datetime.utcnow()
+            with exclusive_pass(TOKEN_PURGE_LOCK_KEY) as acquired:
+                before = TokenCleanupService.get_table_sizes()
+                if not acquired:
+                    deleted = {table: 0 for table in before}
+                    return {'deleted': deleted, 'before': before, 'after': before, 'skipped': True}, None
+                deleted = {}
+                for table, (model, condition) in TokenCleanupService._expired_conditions(now).items():
+                    deleted[table] = TokenCleanupService._delete_in_batches(model, condition, batch_size)
+                    TOKENS_PURGED.labels(table=table).inc(deleted[table])
+                after = TokenCleanupService.get_table_sizes()
+            return {'deleted': deleted, 'before': before, 'after': after, 'skipped': False}, None
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Error al purgar tokens: {str(e)}"
+
+    @staticmethod
+    def _run_scheduler(app, interval, batch_size):
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                result, error = TokenCleanupService.purge_expired_tokens(batch_size)
+                if error:
+                    logger.error("Purga programada de tokens fallida: %s", error)
+                db.session.remove()
+
+    @staticmethod
+    def init_app(app):
+        """
+        Programar la purga periódica si TOKEN_PURGE_INTERVAL_SECONDS > 0
+        El hilo se inicia en la primera petición de cada proceso para sobrevivir al fork de Gunicorn
+        """
+        interval = app.config.get('TOKEN_PURGE_INTERVAL_SECONDS', 0)
+        if not interval:
+            return
+        batch_size = app.config.get('TOKEN_PURGE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+        @app.before_request
+        def start_token_purge_scheduler():
+            if TokenCleanupService._scheduler_pid == os.getpid():
+                return
+            with TokenCleanupService._scheduler_lock:
+                if TokenCleanupService._scheduler_pid == os.getpid():
+                    return
+                TokenCleanupService._scheduler_pid = os.getpid()
+                threading.Thread(
+                    target=TokenCleanupService._run_scheduler,
+                    args=(app, interval, batch_size),
+                    name='token-purge',
+                    daemon=True
+                ).start()
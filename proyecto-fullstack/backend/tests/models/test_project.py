@@ -52,3 +52,11 @@ def test_to_dict_with_tasks():
 def test_repr():
     project = Project(name='Proyecto Z')
     assert repr(project) == '<Project Proyecto Z>'
+
+def test_to_dict_with_tasks_and_comments_count():
+    from backend.models.task import Task
+    project = Project(id='p3', name='Proyecto W', status='active', priority='low', created_by='user-3')
+    project.tasks = [Task(id='t1', title='T1'), Task(id='t2', title='T2')]
+    result = project.to_dict(include_tasks=True, comments_count={'t1': 3})
+    assert result['tasks'][0]['commentsCount'] == 3
+    assert result['tasks'][1]['commentsCount'] == 0
@@ -55,3 +55,14 @@ def test_to_dict_with_comments():
 def test_repr():
     task = Task(title='Tarea X')
     assert repr(task) == '<Task Tarea X>'
+
+def test_to_dict_with_precomputed_comments_count():
+    task = Task(
+        id='t3',
+        title='Tarea 3',
+        status='todo',
+        priority='low',
+        project_id='p3'
+    )
+    result = task.to_dict(comments_count=4)
+    assert result['commentsCount'] == 4
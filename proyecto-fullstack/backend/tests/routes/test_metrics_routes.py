@@ -4,6 +4,7 @@ from flask_jwt_extended import JWTManager, create_access_token
 from backend.routes.metrics_routes import metrics_bp
 from backend.services.project_service import ProjectService
 from backend.services.task_service import TaskService
+from backend.services.stats_service import StatsService
 
 @pytest.fixture
 def app(monkeypatch):
@@ -25,8 +26,7 @@ def auth_headers():
     return {'Authorization': f'Bearer {token}'}
 
 def test_get_general_metrics_success(client, monkeypatch):
-    monkeypatch.setattr(ProjectService, 'get_all_projects_stats', staticmethod(lambda: ({'total_projects': 2}, None)))
-    monkeypatch.setattr(TaskService, 'get_all_tasks_stats', staticmethod(lambda: ({'total_tasks': 5, 'completed_tasks': 2, 'in_progress_tasks': 1, 'pending_tasks': 2}, None)))
+    monkeypatch.setattr(StatsService, 'get_overview', staticmethod(lambda: ({'projects': {'total_projects': 2}, 'tasks': {'total_tasks': 5}, 'summary': {}}, None)))
     response = client.get('/metrics/overview', headers=auth_headers())
     assert response.status_code == 200
     assert response.json['success'] is True
@@ -23,13 +23,26 @@ def auth_headers():
     return {'Authorization': f'Bearer {token}'}
 
 def test_get_notifications_success(client, monkeypatch):
-    monkeypatch.setattr(NotificationService, 'get_user_notifications', staticmethod(lambda user_id, limit, offset, unread_only: [{'id': 'n1'}]))
+    monkeypatch.setattr(NotificationService, 'get_notifications_page', staticmethod(
+        lambda user_id, limit, cursor, unread_only: (True, {'notifications': [{'id': 'n1'}], 'next_cursor': 'c1'})))
     monkeypatch.setattr(NotificationService, 'get_unread_count', staticmethod(lambda user_id: 2))
     response = client.get('/notifications', headers=auth_headers())
     assert response.status_code == 200
     assert response.json['success'] is True
     assert 'notifications' in response.json['data']
     assert 'unread_count' in response.json['data']
+    assert response.json['data']['next_cursor'] == 'c1'
+
+def test_get_notifications_with_offset(client, monkeypatch):
+    monkeypatch.setattr(NotificationService, 'get_user_notifications', staticmethod(lambda user_id, limit, offset, unread_only: [{'id': 'n1'}]))
+    monkeypatch.setattr(NotificationService, 'get_unread_count', staticmethod(lambda user_id: 2))
+    response = client.get('/notifications?offset=20', headers=auth_headers())
+    assert response.status_code == 200
+    assert response.json['data']['next_cursor'] is None
+
+def test_get_notifications_invalid_cursor(client):
+    response = client.get('/notifications?cursor=xyz', headers=auth_headers())
+    assert response.status_code == 400
 
 def test_get_unread_count_success(client, monkeypatch):
     monkeypatch.setattr(NotificationService, 'get_unread_count', staticmethod(lambda user_id: 3))
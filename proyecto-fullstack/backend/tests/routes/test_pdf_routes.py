@@ -3,6 +3,7 @@ from flask import Flask
 from flask_jwt_extended import JWTManager, create_access_token
 from backend.routes.pdf_routes import pdf_bp
 from backend.services.pdf_service import PDFService
+import io
 import os
 
 @pytest.fixture
@@ -23,10 +24,8 @@ def auth_headers():
     token = create_access_token(identity='user-1')
     return {'Authorization': f'Bearer {token}'}
 
-def test_generate_project_report_success(client, monkeypatch, tmp_path):
-    fake_pdf = tmp_path / 'test.pdf'
-    fake_pdf.write_bytes(b'%PDF-1.4')
-    monkeypatch.setattr(PDFService, 'generate_project_report', staticmethod(lambda pid: (str(fake_pdf), None)))
+def test_generate_project_report_success(client, monkeypatch):
+    monkeypatch.setattr(PDFService, 'generate_project_report', staticmethod(lambda pid: (io.BytesIO(b'%PDF-1.4'), None)))
     response = client.get('/pdf/report/project/123', headers=auth_headers())
     assert response.status_code == 200
     assert response.mimetype == 'application/pdf'
@@ -37,10 +36,8 @@ def test_generate_project_report_error(client, monkeypatch):
     assert response.status_code == 400
     assert response.json['success'] is False
 
-def test_generate_tasks_report_success(client, monkeypatch, tmp_path):
-    fake_pdf = tmp_path / 'tasks.pdf'
-    fake_pdf.write_bytes(b'%PDF-1.4')
-    monkeypatch.setattr(PDFService, 'generate_tasks_report', staticmethod(lambda filters: (str(fake_pdf), None)))
+def test_generate_tasks_report_success(client, monkeypatch):
+    monkeypatch.setattr(PDFService, 'generate_tasks_report', staticmethod(lambda filters: (io.BytesIO(b'%PDF-1.4'), None)))
     response = client.get('/pdf/report/tasks', headers=auth_headers())
     assert response.status_code == 200
     assert response.mimetype == 'application/pdf'
@@ -51,10 +48,8 @@ def test_generate_general_report_error(client, monkeypatch):
     assert response.status_code == 400
     assert response.json['success'] is False
 
-def test_generate_metrics_report_success(client, monkeypatch, tmp_path):
-    fake_pdf = tmp_path / 'metrics.pdf'
-    fake_pdf.write_bytes(b'%PDF-1.4')
-    monkeypatch.setattr(PDFService, 'generate_metrics_report', staticmethod(lambda filters, charts: (str(fake_pdf), None)))
+def test_generate_metrics_report_success(client, monkeypatch):
+    monkeypatch.setattr(PDFService, 'generate_metrics_report', staticmethod(lambda filters, charts: (io.BytesIO(b'%PDF-1.4'), None)))
     response = client.get('/pdf/report/metrics', headers=auth_headers())
     assert response.status_code == 200
     assert response.mimetype == 'application/pdf'
@@ -0,0 +1,58 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from routes.search_routes import search_bp
+from services.search_service import SearchService
+
+@pytest.fixture
+def app(monkeypatch):
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+    JWTManager(app)
+    app.register_blueprint(search_bp)
+    return app
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+@pytest.fixture
+def auth_headers(app):
+    # create_access_token necesita el contexto de la aplicación
+    with app.app_context():
+        token = create_access_token(identity='user-1')
+    return {'Authorization': f'Bearer {token}'}
+
+def test_search_success(client, auth_headers, monkeypatch):
+    calls = []
+    def fake_search(q, types, limit):
+        calls.append((q, types, limit))
+        return {'tasks': [{'id': 't1'}]}, None
+    monkeypatch.setattr(SearchService, 'search', staticmethod(fake_search))
+    response = client.get('/search?q=migra&types=tasks&limit=500', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json['success'] is True
+    assert response.json['data']['tasks'][0]['id'] == 't1'
+    assert calls == [('migra', ['tasks'], 50)]
+
+def test_search_defaults_to_all_types(client, auth_headers, monkeypatch):
+    calls = []
+    monkeypatch.setattr(SearchService, 'search', staticmethod(lambda q, types, limit: calls.append(types) or ({}, None)))
+    response = client.get('/search?q=migra', headers=auth_headers)
+    assert response.status_code == 200
+    assert calls == [['tasks', 'projects', 'comments']]
+
+def test_search_missing_query(client, auth_headers):
+    response = client.get('/search', headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json['success'] is False
+
+def test_search_invalid_type(client, auth_headers):
+    response = client.get('/search?q=migra&types=usuarios', headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json['success'] is False
+
+def test_search_requires_token(client):
+    response = client.get('/search?q=migra')
+    assert response.status_code == 401
@@ -1,8 +1,8 @@
 import pytest
 from flask import Flask
 from flask_jwt_extended import JWTManager, create_access_token
-from backend.routes.task_routes import tasks_bp
-from backend.services.task_service import TaskService
+from routes.task_routes import tasks_bp
+from services.task_service import TaskService
 
 @pytest.fixture
 def app(monkeypatch):
@@ -17,25 +17,29 @@ def client(app):
     with app.test_client() as client:
         yield client
 
-def auth_headers():
-    from flask_jwt_extended import create_access_token
-    token = create_access_token(identity='user-1')
-    return {'Authorization': f'Bearer {token}'}
+@pytest.fixture
+def auth_headers(app):
+    """Construir los headers dentro del contexto de la aplicación (create_access_token lo necesita)"""
+    def build():
+        with app.app_context():
+            token = create_access_token(identity='user-1')
+        return {'Authorization': f'Bearer {token}'}
+    return build
 
-def test_get_tasks_success(client, monkeypatch):
+def test_get_tasks_success(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'get_all_tasks', staticmethod(lambda filters: ([{'id': 't1'}], None)))
     response = client.get('/tasks', headers=auth_headers())
     assert response.status_code == 200
     assert response.json['success'] is True
     assert 'data' in response.json
 
-def test_get_task_not_found(client, monkeypatch):
+def test_get_task_not_found(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'get_task_by_id', staticmethod(lambda tid: (None, 'No encontrado')))
     response = client.get('/tasks/123', headers=auth_headers())
     assert response.status_code == 404
     assert response.json['success'] is False
 
-def test_create_task_success(client, monkeypatch):
+def test_create_task_success(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'create_task', staticmethod(lambda **kwargs: ({'id': 't2'}, None)))
     headers = auth_headers()
     headers['Content-Type'] = 'application/json'
@@ -43,21 +47,21 @@ def test_create_task_success(client, monkeypatch):
     assert response.status_code == 201
     assert response.json['success'] is True
 
-def test_create_task_missing_title(client):
+def test_create_task_missing_title(client, auth_headers):
     headers = auth_headers()
     headers['Content-Type'] = 'application/json'
     response = client.post('/tasks', json={'project_id': 'p1'}, headers=headers)
     assert response.status_code == 400
     assert response.json['success'] is False
 
-def test_create_task_missing_project_id(client):
+def test_create_task_missing_project_id(client, auth_headers):
     headers = auth_headers()
     headers['Content-Type'] = 'application/json'
     response = client.post('/tasks', json={'title': 'Tarea sin proyecto'}, headers=headers)
     assert response.status_code == 400
     assert response.json['success'] is False
 
-def test_update_task_success(client, monkeypatch):
+def test_update_task_success(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'update_task', staticmethod(lambda tid, **data: ({'id': tid, **data}, None)))
     headers = auth_headers()
     headers['Content-Type'] = 'application/json'
@@ -65,20 +69,20 @@ def test_update_task_success(client, monkeypatch):
     assert response.status_code == 200
     assert response.json['success'] is True
 
-def test_delete_task_success(client, monkeypatch):
+def test_delete_task_success(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'delete_task', staticmethod(lambda tid: (True, 'Eliminada')))
     response = client.delete('/tasks/123', headers=auth_headers())
     assert response.status_code == 200
     assert response.json['success'] is True
 
-def test_get_task_comments_success(client, monkeypatch):
+def test_get_task_comments_success(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'get_task_comments', staticmethod(lambda tid: ([{'id': 'c1'}], None)))
     response = client.get('/tasks/123/comments', headers=auth_headers())
     assert response.status_code == 200
     assert response.json['success'] is True
     assert 'comments' in response.json
 
-def test_add_task_comment_success(client, monkeypatch):
+def test_add_task_comment_success(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'add_task_comment', staticmethod(lambda **kwargs: ({'id': 'c2'}, None)))
     headers = auth_headers()
     headers['Content-Type'] = 'application/json'
@@ -86,7 +90,7 @@ def test_add_task_comment_success(client, monkeypatch):
     assert response.status_code == 201
     assert response.json['success'] is True
 
-def test_update_comment_success(client, monkeypatch):
+def test_update_comment_success(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'update_comment', staticmethod(lambda **kwargs: ({'id': 'c3'}, None)))
     headers = auth_headers()
     headers['Content-Type'] = 'application/json'
@@ -94,8 +98,22 @@ def test_update_comment_success(client, monkeypatch):
     assert response.status_code == 200
     assert response.json['success'] is True
 
-def test_delete_comment_success(client, monkeypatch):
+def test_delete_comment_success(client, monkeypatch, auth_headers):
     monkeypatch.setattr(TaskService, 'delete_comment', staticmethod(lambda cid, uid: (True, 'Eliminado')))
     response = client.delete('/tasks/comments/123', headers=auth_headers())
     assert response.status_code == 200
     assert response.json['success'] is True
+
+def test_get_tasks_paginated(client, monkeypatch, auth_headers):
+    def mock_get_tasks_page(filters, limit, cursor, include_total):
+        return ({'tasks': [{'id': 't1'}], 'next_cursor': 'abc', 'total': 10}, None)
+    monkeypatch.setattr(TaskService, 'get_tasks_page', staticmethod(mock_get_tasks_page))
+    response = client.get('/tasks?limit=1&include_total=true', headers=auth_headers())
+    assert response.status_code == 200
+    assert response.json['next_cursor'] == 'abc'
+    assert response.json['total'] == 10
+
+def test_get_tasks_invalid_cursor(client, auth_headers):
+    response = client.get('/tasks?cursor=invalido', headers=auth_headers())
+    assert response.status_code == 400
+    assert response.json['success'] is False
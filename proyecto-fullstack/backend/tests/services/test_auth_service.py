@@ -9,6 +9,7 @@ class DummyUser:
         self.email = email
         self.role = role
         self.is_active = is_active
+        self.role_version = 1
         self.password = 'hashed'
     def set_password(self, password):
         self.password = f'hashed_{password}'
@@ -83,3 +84,66 @@ def test_register_db_error(mock_user, mock_db, dummy_user):
     result, error = AuthService.register('Test', 'test@example.com', '1234')
     assert result is None
     assert 'Error al crear usuario' in error
+
+@patch('services.auth_service.User')
+@patch('services.auth_service.create_access_token')
+@patch('services.auth_service.create_refresh_token')
+def test_login_embeds_role_claims(mock_refresh, mock_access, mock_user, dummy_user):
+    mock_user.query.filter_by.return_value.first.return_value = dummy_user
+    AuthService.login('test@example.com', 'correctpassword')
+    expected = {'role': 'developer', 'is_active': True, 'role_version': 1}
+    assert mock_access.call_args.kwargs['additional_claims'] == expected
+    assert mock_refresh.call_args.kwargs['additional_claims'] == expected
+
+@patch('services.auth_service.User')
+@patch('services.auth_service.create_access_token')
+def test_refresh_token_uses_current_role(mock_access, mock_user, dummy_user):
+    dummy_user.role = 'admin'
+    dummy_user.role_version = 3
+    mock_user.query.get.return_value = dummy_user
+    mock_access.return_value = 'access_token'
+    result, error = AuthService.refresh_token(dummy_user.id)
+    assert error is None
+    assert mock_access.call_args.kwargs['additional_claims']['role'] == 'admin'
+    assert mock_access.call_args.kwargs['additional_claims']['role_version'] == 3
+
+@patch('services.auth_service.user_version_cache')
+@patch('services.auth_service.db')
+@patch('services.auth_service.User')
+def test_update_user_role_invalidates_tokens(mock_user, mock_db, mock_cache, dummy_user):
+    mock_user.query.get.return_value = dummy_user
+    result, error = AuthService.update_user_role(dummy_user.id, 'admin')
+    assert error is None
+    assert result['role'] == 'admin'
+    assert dummy_user.role_version == 2
+    mock_db.session.commit.assert_called_once()
+    mock_cache.update.assert_called_once_with(dummy_user)
+
+@patch('services.auth_service.user_version_cache')
+@patch('services.auth_service.db')
+@patch('services.auth_service.User')
+def test_update_user_role_same_role_keeps_tokens(mock_user, mock_db, mock_cache, dummy_user):
+    mock_user.query.get.return_value = dummy_user
+    result, error = AuthService.update_user_role(dummy_user.id, 'developer')
+    assert error is None
+    assert dummy_user.role_version == 1
+    mock_db.session.commit.assert_not_called()
+
+@patch('services.auth_service.User')
+def test_update_user_role_user_not_found(mock_user):
+    mock_user.query.get.return_value = None
+    result, error = AuthService.update_user_role('missing', 'admin')
+    assert result is None
+    assert error == 'Usuario no encontrado'
+
+@patch('services.auth_service.revocation_cache')
+@patch('services.auth_service.RevokedToken')
+@patch('services.auth_service.db')
+def test_logout_stores_token_expiration(mock_db, mock_revoked, mock_cache):
+    success, error = AuthService.logout('jti-1', 1735689600)
+    assert success is True
+    assert error is None
+    kwargs = mock_revoked.call_args.kwargs
+    assert kwargs['jti'] == 'jti-1'
+    assert kwargs['expires_at'].isoformat() == '2025-01-01T00:00:00'
+    mock_cache.add.assert_called_once_with('jti-1')
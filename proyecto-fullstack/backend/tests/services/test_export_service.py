@@ -0,0 +1,111 @@
+import csv
+import io
+from datetime import date, datetime
+import pytest
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project
+from models.task import Task
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+from services import export_service
+from services.export_service import ExportService
+from services.project_stats_service import ProjectStatsService
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Ana Pérez', email='ana@example.com', password_hash='x'))
+        db.session.add_all([
+            Project(id='p1', name='Proyecto Uno', created_by='u1', status='active',
+                    created_at=datetime(2025, 1, 1)),
+            Project(id='p2', name='Proyecto Dos', created_by='u1', status='planning',
+                    created_at=datetime(2025, 1, 2))
+        ])
+        db.session.add_all([
+            Task(id=f't{i}', title=f'Tarea {i}', project_id='p1', assigned_to='u1' if i % 2 else None,
+                 status='done' if i < 3 else 'todo', due_date=date(2025, 2, 1),
+                 created_at=datetime(2025, 1, 1, 0, 0, i))
+            for i in range(7)
+        ])
+        db.session.commit()
+        ProjectStatsService.rebuild()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _read_csv(chunks):
+    content = b''.join(chunks).decode('utf-8')
+    assert content.startswith('﻿')
+    return list(csv.reader(io.StringIO(content[1:])))
+
+def test_tasks_csv_includes_joined_names(app):
+    rows = _read_csv(ExportService.iter_csv('tasks'))
+    assert rows[0][:3] == ['ID', 'Título', 'Descripción']
+    assert len(rows) == 8
+    first = dict(zip(rows[0], rows[1]))
+    assert first['ID'] == 't0'
+    assert first['Proyecto'] == 'Proyecto Uno'
+    assert first['Asignado a'] == ''
+    assert first['Fecha límite'] == '2025-02-01'
+    assert dict(zip(rows[0], rows[2]))['Asignado a'] == 'Ana Pérez'
+
+def test_tasks_csv_reuses_task_filters(app):
+    rows = _read_csv(ExportService.iter_csv('tasks', {'status': 'done'}))
+    assert [row[0] for row in rows[1:]] == ['t0', 't1', 't2']
+
+def test_csv_is_streamed_in_chunks(app, monkeypatch):
+    monkeypatch.setattr(export_service, 'CSV_ROWS_PER_CHUNK', 3)
+    chunks = list(ExportService.iter_csv('tasks'))
+    assert len(chunks) == 3
+    assert len(_read_csv(chunks)) == 8
+
+def test_projects_csv_counts_tasks(app):
+    rows = _read_csv(ExportService.iter_csv('projects'))
+    projects = {row[0]: dict(zip(rows[0], row)) for row in rows[1:]}
+    assert projects['p1']['Tareas'] == '7'
+    assert projects['p2']['Tareas'] == '0'
+    assert projects['p1']['Creado por'] == 'Ana Pérez'
+
+def test_projects_csv_filters_by_status(app):
+    rows = _read_csv(ExportService.iter_csv('projects', {'status': 'planning'}))
+    assert [row[0] for row in rows[1:]] == ['p2']
+
+def test_build_xlsx(app):
+    openpyxl = pytest.importorskip('openpyxl')
+    output, error = ExportService.build_xlsx('tasks', {'status': 'todo'})
+    assert error is None
+    sheet = openpyxl.load_workbook(output).active
+    output.close()
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0][1] == 'Título'
+    assert [row[0] for row in rows[1:]] == ['t3', 't4', 't5', 't6']
+
+def test_exports_neutralize_spreadsheet_formulas(app):
+    payloads = ['=HYPERLINK("http://x","y")', '+1+1', '-2+3', '@SUM(A1)', '\tTab', '\rCR']
+    for i, payload in enumerate(payloads):
+        db.session.add(Task(id=f'f{i}', title=payload, description='texto normal', project_id='p2'))
+    db.session.commit()
+
+    rows = _read_csv(ExportService.iter_csv('tasks', {'project_id': 'p2'}))
+    titles = {row[0]: row[1] for row in rows[1:]}
+    assert [titles[f'f{i}'] for i in range(len(payloads))] == [f"'{payload}" for payload in payloads]
+    assert {row[2] for row in rows[1:]} == {'texto normal'}
+
+    openpyxl = pytest.importorskip('openpyxl')
+    output, error = ExportService.build_xlsx('tasks', {'project_id': 'p2'})
+    assert error is None
+    sheet = openpyxl.load_workbook(output).active
+    output.close()
+    cells = {row[0].value: row[1] for row in sheet.iter_rows(min_row=2)}
+    for i in range(len(payloads)):
+        # Texto, no fórmula (el XML del libro normaliza \r a \n al leerlo)
+        assert cells[f'f{i}'].data_type == 's'
+        assert cells[f'f{i}'].value.startswith("'")
+    assert cells['f0'].value == '\'=HYPERLINK("http://x","y")'
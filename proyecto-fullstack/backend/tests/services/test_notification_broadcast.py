@@ -0,0 +1,120 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import event
+from database import db
+from models.user import User
+from models.project import Project
+from models.task import Task
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification
+from models.notification_counter import NotificationCounter
+from routes.notification_routes import notifications_bp
+from services.notification_service import NotificationService
+from utils.notification_bus import notification_bus
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-notification-broadcast'
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
+    notification_bus.reset()
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(id='admin', name='Admin', email='admin@example.com', password_hash='x', role='admin'),
+            User(id='pm', name='PM', email='pm@example.com', password_hash='x', role='project_manager'),
+            User(id='d1', name='Dev 1', email='d1@example.com', password_hash='x', role='developer'),
+            User(id='d2', name='Dev 2', email='d2@example.com', password_hash='x', role='developer'),
+            User(id='off', name='Inactivo', email='off@example.com', password_hash='x', role='developer',
+                 is_active=False)
+        ])
+        db.session.add(Project(id='p1', name='P1', created_by='pm'))
+        db.session.add_all([
+            Task(id='t1', title='T1', project_id='p1', assigned_to='d1'),
+            Task(id='t2', title='T2', project_id='p1', assigned_to='d1'),
+            Task(id='t3', title='T3', project_id='p1', assigned_to='pm'),
+            Task(id='t4', title='T4', project_id='p1')
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    notification_bus.reset()
+
+def _recipients():
+    return sorted(user_id for (user_id,) in db.session.query(Notification.user_id))
+
+def test_broadcast_to_role_skips_inactive_users(app):
+    ok, result = NotificationService.broadcast('Aviso', 'Mantenimiento', role='developer')
+    assert ok
+    assert result == {'recipients': 2, 'batches': 1}
+    assert _recipients() == ['d1', 'd2']
+
+def test_broadcast_to_project_assignees_without_duplicates(app):
+    ok, result = NotificationService.broadcast('Aviso', 'Entrega', project_id='p1')
+    assert ok
+    assert result['recipients'] == 2
+    assert _recipients() == ['d1', 'pm']
+
+def test_broadcast_combines_targets_and_reports_requested(app):
+    ok, result = NotificationService.broadcast('Aviso', 'x', user_ids=['admin', 'off', 'nadie'], project_id='p1')
+    assert ok
+    assert result == {'recipients': 3, 'batches': 1, 'requested': 3}
+    assert _recipients() == ['admin', 'd1', 'pm']
+
+def test_broadcast_requires_a_target(app):
+    ok, error = NotificationService.broadcast('Aviso', 'x')
+    assert not ok
+    ok, error = NotificationService.broadcast('Aviso', 'x', role='guest')
+    assert not ok and 'Rol inválido' in error
+
+def test_broadcast_batches_inserts_and_counters(app):
+    NotificationService.create_notification('d1', 'Previa', 'x')
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        rows = len(parameters) if executemany else 1
+        statements.append((statement, rows))
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        ok, result = NotificationService.broadcast(
+            'Aviso', 'x', user_ids=['admin', 'pm', 'd1', 'd2'], batch_size=3
+        )
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert ok
+    assert result['batches'] == 2
+    # Un executemany por lote
+    inserts = [rows for sql, rows in statements if sql.startswith('INSERT INTO notifications ')]
+    assert inserts == [3, 1]
+
+    counters = dict(db.session.query(NotificationCounter.user_id, NotificationCounter.unread))
+    assert counters == {'admin': 1, 'pm': 1, 'd1': 2, 'd2': 1}
+    assert NotificationService.repair_unread_counters()[0]['fixed'] == 0
+
+def test_broadcast_pushes_to_open_streams(app):
+    subscription = notification_bus.subscribe('d2')
+    NotificationService.broadcast('Aviso', 'x', role='developer')
+    events = [subscription.queue.get_nowait()[1] for _ in range(2)]
+    assert events[0].startswith('id: ') and 'event: notification' in events[0]
+    assert 'event: unread' in events[1] and '"unread_count": 1' in events[1]
+    notification_bus.unsubscribe(subscription)
+
+def _post(app, identity, role, body):
+    token = create_access_token(identity=identity, additional_claims={'role': role, 'is_active': True})
+    return app.test_client().post('/api/notifications/broadcast', json=body,
+                                  headers={'Authorization': f'Bearer {token}'})
+
+def test_broadcast_route(app):
+    response = _post(app, 'pm', 'project_manager', {'title': 'Aviso', 'message': 'x', 'role': 'developer'})
+    assert response.status_code == 201
+    assert response.json['data']['recipients'] == 2
+
+    assert _post(app, 'd1', 'developer', {'title': 'Aviso', 'message': 'x', 'role': 'developer'}).status_code == 403
+    assert _post(app, 'pm', 'project_manager', {'title': 'Aviso', 'message': 'x'}).status_code == 400
+    assert _post(app, 'pm', 'project_manager',
+                 {'title': 'Aviso', 'message': 'x', 'user_ids': 'd1'}).status_code == 400
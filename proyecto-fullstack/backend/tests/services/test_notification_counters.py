@@ -0,0 +1,102 @@
+import pytest
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification
+from models.notification_counter import NotificationCounter
+from services.notification_service import NotificationService
+from services.task_service import TaskService
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(id='u1', name='Ana', email='ana@example.com', password_hash='x'),
+            User(id='u2', name='Luis', email='luis@example.com', password_hash='x')
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _counter(user_id):
+    db.session.expire_all()
+    counter = db.session.get(NotificationCounter, user_id)
+    return counter.unread if counter else None
+
+def _create(user_id, title='Aviso'):
+    ok, data = NotificationService.create_notification(user_id, title, 'Mensaje')
+    assert ok
+    return data['id']
+
+def test_counter_follows_every_mutation(app):
+    first = _create('u1')
+    second = _create('u1')
+    third = _create('u1')
+    _create('u2')
+    assert _counter('u1') == 3
+    assert _counter('u2') == 1
+
+    NotificationService.mark_as_read(first, 'u1')
+    NotificationService.mark_as_read(first, 'u1')
+    assert _counter('u1') == 2
+
+    NotificationService.delete_notification(first, 'u1')
+    assert _counter('u1') == 2
+    NotificationService.delete_notification(second, 'u1')
+    assert _counter('u1') == 1
+
+    _create('u1')
+    NotificationService.mark_all_as_read('u1')
+    assert _counter('u1') == 0
+
+    _create('u1')
+    TaskService.delete_all_user_notifications('u1')
+    assert _counter('u1') == 0
+    assert NotificationService.get_unread_count('u2') == 1
+    assert third
+
+def test_unread_count_is_a_primary_key_read(app):
+    from sqlalchemy import event
+    _create('u1')
+    statements = []
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', count_query)
+    try:
+        assert NotificationService.get_unread_count('u1') == 1
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_query)
+    assert len(statements) == 1
+    assert 'notification_counters' in statements[0]
+    assert 'count(' not in statements[0].lower()
+
+def test_missing_counter_falls_back_and_is_created_on_write(app):
+    db.session.add(Notification(user_id='u1', title='Legado', message='x'))
+    db.session.commit()
+    assert _counter('u1') is None
+    assert NotificationService.get_unread_count('u1') == 1
+    _create('u1')
+    assert _counter('u1') == 2
+
+def test_repair_unread_counters(app):
+    _create('u1')
+    _create('u1')
+    db.session.add(Notification(user_id='u2', title='Sin contador', message='x'))
+    NotificationCounter.query.filter_by(user_id='u1').update({'unread': 7})
+    db.session.commit()
+
+    result, error = NotificationService.repair_unread_counters()
+    assert error is None
+    assert result == {'checked': 1, 'fixed': 1, 'created': 1}
+    assert _counter('u1') == 2
+    assert _counter('u2') == 1
+    assert NotificationService.repair_unread_counters()[0] == {'checked': 2, 'fixed': 0, 'created': 0}
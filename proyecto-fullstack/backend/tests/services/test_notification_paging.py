@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification
+from models.notification_counter import NotificationCounter  # noqa: F401
+from services.notification_service import NotificationService
+from utils.pagination import decode_cursor
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Ana', email='ana@example.com', password_hash='x'))
+        db.session.add(User(id='u2', name='Luis', email='luis@example.com', password_hash='x'))
+        # n3 y n4 comparten created_at: el desempate es por id
+        db.session.add_all([
+            Notification(id='n1', user_id='u1', title='1', message='x', unread=False, created_at=NOW - timedelta(hours=3)),
+            Notification(id='n2', user_id='u1', title='2', message='x', unread=True, created_at=NOW - timedelta(hours=2)),
+            Notification(id='n3', user_id='u1', title='3', message='x', unread=False, created_at=NOW - timedelta(hours=1)),
+            Notification(id='n4', user_id='u1', title='4', message='x', unread=True, created_at=NOW - timedelta(hours=1)),
+            Notification(id='n5', user_id='u1', title='5', message='x', unread=True, created_at=NOW),
+            Notification(id='other', user_id='u2', title='x', message='x', unread=True, created_at=NOW),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _page(limit, cursor=None, unread_only=False):
+    success, page = NotificationService.get_notifications_page(
+        'u1', limit=limit, cursor=decode_cursor(cursor) if cursor else None, unread_only=unread_only
+    )
+    assert success
+    return [notification['id'] for notification in page['notifications']], page['next_cursor']
+
+def test_two_pages_newest_first(app):
+    first, cursor = _page(3)
+    assert first == ['n5', 'n4', 'n3']
+    assert cursor is not None
+
+    second, cursor = _page(3, cursor)
+    assert second == ['n2', 'n1']
+    assert cursor is None
+
+def test_tied_timestamps_are_split_by_id_across_pages(app):
+    first, cursor = _page(2)
+    assert first == ['n5', 'n4']
+    # El cursor apunta a n4: n3 tiene el mismo created_at y no se salta ni se repite
+    second, cursor = _page(2, cursor)
+    assert second == ['n3', 'n2']
+    third, cursor = _page(2, cursor)
+    assert third == ['n1']
+    assert cursor is None
+
+def test_unread_only(app):
+    first, cursor = _page(2, unread_only=True)
+    assert first == ['n5', 'n4']
+    second, cursor = _page(2, cursor, unread_only=True)
+    assert second == ['n2']
+    assert cursor is None
+
+def test_exact_page_size_has_no_next_cursor(app):
+    ids, cursor = _page(5)
+    assert ids == ['n5', 'n4', 'n3', 'n2', 'n1']
+    assert cursor is None
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification
+from models.notification_archive import NotificationArchive
+from models.notification_counter import NotificationCounter  # noqa: F401
+from services.notification_retention_service import NotificationRetentionService
+from cli import register_commands
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['NOTIFICATION_RETENTION_DAYS'] = 30
+    db.init_app(app)
+    register_commands(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Test', email='test@example.com', password_hash='x'))
+        # 5 leídas antiguas, 1 no leída antigua y 1 leída reciente
+        db.session.add_all([
+            Notification(id=f'old-{i}', user_id='u1', title=f'Antigua {i}', message='x', unread=False,
+                         created_at=NOW - timedelta(days=40 + i))
+            for i in range(5)
+        ])
+        db.session.add_all([
+            Notification(id='old-unread', user_id='u1', title='Pendiente', message='x', unread=True,
+                         created_at=NOW - timedelta(days=60)),
+            Notification(id='recent', user_id='u1', title='Reciente', message='x', unread=False,
+                         created_at=NOW - timedelta(days=1)),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _remaining():
+    return sorted(row_id for row_id, in db.session.query(Notification.id))
+
+def test_purge_deletes_old_read_notifications_in_batches(app):
+    result, error = NotificationRetentionService.purge_read_notifications(batch_size=2, now=NOW)
+    assert error is None
+    assert result['mode'] == 'delete'
+    assert (result['retired'], result['batches']) == (5, 3)
+    assert _remaining() == ['old-unread', 'recent']
+    assert NotificationArchive.query.count() == 0
+
+def test_purge_archive_mode_copies_before_deleting(app):
+    result, error = NotificationRetentionService.purge_read_notifications(mode='archive', now=NOW)
+    assert error is None
+    assert result['retired'] == 5
+    assert _remaining() == ['old-unread', 'recent']
+    archived = NotificationArchive.query.get('old-0')
+    assert (archived.user_id, archived.title) == ('u1', 'Antigua 0')
+    assert archived.archived_at is not None
+    assert NotificationArchive.query.count() == 5
+
+def test_purge_disabled_or_invalid_mode(app):
+    result, error = NotificationRetentionService.purge_read_notifications(days=0, now=NOW)
+    assert error is None and result['retired'] == 0
+    result, error = NotificationRetentionService.purge_read_notifications(mode='move', now=NOW)
+    assert result is None and 'move' in error
+    assert len(_remaining()) == 7
+
+def test_purge_notifications_command(app):
+    result = app.test_cli_runner().invoke(args=['purge-notifications', '--days', '0'])
+    assert result.exit_code == 0
+    assert 'desactivada' in result.output
+    result = app.test_cli_runner().invoke(args=['purge-notifications', '--days', '3650', '--mode', 'archive'])
+    assert result.exit_code == 0
+    assert 'archivadas' in result.output
+
+def test_purge_skips_when_another_pass_holds_the_lock(app, monkeypatch):
+    from contextlib import contextmanager
+
+    @contextmanager
+    def busy():
+        yield False
+
+    monkeypatch.setattr(NotificationRetentionService, '_exclusive_pass', staticmethod(busy))
+    result, error = NotificationRetentionService.purge_read_notifications(mode='archive', now=NOW)
+    assert error is None
+    assert result['skipped'] is True and result['retired'] == 0
+    assert len(_remaining()) == 7
+    assert 'otro proceso' in app.test_cli_runner().invoke(args=['purge-notifications', '--days', '3650']).output
+
+def test_exclusive_pass_uses_advisory_lock_on_postgres(app, monkeypatch):
+    from unittest.mock import MagicMock
+    engine = MagicMock()
+    engine.dialect.name = 'postgresql'
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.execute.return_value.scalar.side_effect = [True, False]
+    monkeypatch.setattr(type(db), 'engine', property(lambda self: engine))
+
+    with NotificationRetentionService._exclusive_pass() as acquired:
+        assert acquired is True
+    with NotificationRetentionService._exclusive_pass() as acquired:
+        assert acquired is False
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert statements == ['SELECT pg_try_advisory_lock(:key)', 'SELECT pg_advisory_unlock(:key)',
+                          'SELECT pg_try_advisory_lock(:key)']
@@ -16,12 +16,20 @@ def test_get_user_notifications(mock_Notification):
     assert isinstance(result, list)
     assert result[0]['id'] == 1
 
-@patch('services.notification_service.Notification')
-def test_get_unread_count(mock_Notification):
-    mock_Notification.query.filter_by.return_value.count.return_value = 3
+@patch('services.notification_service.db')
+def test_get_unread_count_reads_counter(mock_db):
+    mock_db.session.query.return_value.filter.return_value.scalar.return_value = 3
     count = NotificationService.get_unread_count(1)
     assert count == 3
 
+@patch('services.notification_service.Notification')
+@patch('services.notification_service.db')
+def test_get_unread_count_without_counter(mock_db, mock_Notification):
+    mock_db.session.query.return_value.filter.return_value.scalar.return_value = None
+    mock_Notification.query.filter_by.return_value.count.return_value = 2
+    count = NotificationService.get_unread_count(1)
+    assert count == 2
+
 @patch('services.notification_service.Notification')
 @patch('services.notification_service.db')
 def test_mark_as_read(mock_db, mock_Notification):
@@ -0,0 +1,67 @@
+import pytest
+from flask import Flask
+from reportlab.platypus import SimpleDocTemplate, Paragraph
+from reportlab.lib.pagesizes import A4
+from services.pdf_service import PDFService
+
+
+def _story(paragraphs=1):
+    styles = PDFService._get_styles()
+    return [Paragraph(f'Párrafo {i}', styles['normal']) for i in range(paragraphs)]
+
+def test_build_returns_buffer_in_memory():
+    buffer = PDFService._build(SimpleDocTemplate(None, pagesize=A4), _story())
+    assert buffer.read(5) == b'%PDF-'
+    # Sin pasar a disco: el PDF pequeño se queda en memoria
+    assert not buffer._rolled
+    buffer.close()
+
+def test_build_spills_to_disk_above_threshold():
+    app = Flask(__name__)
+    app.config['PDF_SPOOL_MAX_BYTES'] = 100
+    with app.app_context():
+        buffer = PDFService._build(SimpleDocTemplate(None, pagesize=A4), _story(50))
+    assert buffer._rolled
+    assert buffer.read(5) == b'%PDF-'
+    buffer.close()
+
+def test_build_reports_progress():
+    seen = []
+    buffer = PDFService._build(SimpleDocTemplate(None, pagesize=A4), _story(10), seen.append)
+    buffer.close()
+    assert seen[-1] == 100
+    assert seen == sorted(seen)
+
+def test_build_closes_buffer_on_error(monkeypatch):
+    buffers = []
+
+    def failing_build(self, story, *args, **kwargs):
+        buffers.append(self.filename)
+        raise ValueError('boom')
+
+    monkeypatch.setattr(SimpleDocTemplate, 'build', failing_build)
+    with pytest.raises(ValueError):
+        PDFService._build(SimpleDocTemplate(None, pagesize=A4), _story())
+    assert buffers[0].closed
+
+def test_streamed_table_splits_rows_across_pages():
+    from utils.pdf_streaming import StreamedTable
+    rows = (('Tarea %d' % i, 'todo') for i in range(300))
+    progress = []
+    table = StreamedTable(rows, 300, ['Título', 'Estado'], [200, 100])
+    buffer = PDFService._build(SimpleDocTemplate(None, pagesize=A4), [table], progress.append)
+    data = buffer.read()
+    buffer.close()
+    # 300 filas de 14 pt no caben en una página A4
+    assert data.count(b'/Type /Page\n') >= 5
+    assert table.remaining == 0
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+
+def test_fit_text_truncates_long_values():
+    from utils.pdf_streaming import fit_text
+    assert fit_text('Corta', 100) == 'Corta'
+    truncated = fit_text('x' * 200, 60)
+    assert truncated.endswith('…')
+    assert len(truncated) < 200
+    assert fit_text(None, 60) == ''
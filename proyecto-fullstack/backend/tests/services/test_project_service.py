@@ -9,21 +9,30 @@ class DummyProject:
         self.name = name
         self.description = description
         self.created_by = created_by
-    def to_dict(self, include_tasks=False):
-        return {'id': self.id, 'name': self.name, 'description': self.description, 'created_by': self.created_by}
+    def to_dict(self, include_tasks=False, comments_count=None, stats=None, include_progress=False):
+        result = {'id': self.id, 'name': self.name, 'description': self.description, 'created_by': self.created_by}
+        if stats is not None:
+            result.update(stats.progress_dict())
+        elif include_progress:
+            result.update({'task_count': 0, 'completed_task_count': 0, 'progress': 0})
+        return result
 
 @patch('services.project_service.Project')
 @patch('services.project_service.db')
 def test_get_all_projects(mock_db, mock_Project):
-    mock_Project.query.all.return_value = [DummyProject()]
+    mock_db.session.query.return_value.outerjoin.return_value.all.return_value = [(DummyProject(), None)]
     result, err = ProjectService.get_all_projects()
     assert err is None
     assert isinstance(result, list)
     assert result[0]['name'] == 'Test'
+    assert result[0]['task_count'] == 0
+    assert result[0]['progress'] == 0
 
+@patch('services.project_service.Task')
 @patch('services.project_service.Project')
-def test_get_project_by_id(mock_Project):
+def test_get_project_by_id(mock_Project, mock_Task):
     mock_Project.query.get.return_value = DummyProject()
+    mock_Task.comments_count_query.return_value.all.return_value = [('t1', 2)]
     result, err = ProjectService.get_project_by_id(1)
     assert err is None
     assert result['id'] == 1
@@ -36,6 +45,7 @@ def test_create_project_success(mock_db):
         result, err = ProjectService.create_project('Test', 'Desc', 1)
         assert err is None
         assert result['name'] == 'Test'
+        mock_db.session.execute.assert_called_once()
 
 @patch('services.project_service.Project')
 @patch('services.project_service.db')
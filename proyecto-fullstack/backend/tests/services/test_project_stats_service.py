@@ -0,0 +1,115 @@
+import pytest
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project
+from models.project_stats import ProjectStats
+from models.task import Task
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+from services.project_service import ProjectService
+from services.project_stats_service import ProjectStatsService
+from services.task_service import TaskService
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Ana', email='ana@example.com', password_hash='x'))
+        db.session.commit()
+        ProjectService.create_project('P1', '', 'u1', id='p1')
+        ProjectService.create_project('P2', '', 'u1', id='p2')
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _stored(project_id):
+    db.session.expire_all()
+    return ProjectStats.query.get(project_id).counters()
+
+def _expected(project_id):
+    expected = ProjectStats(project_id=project_id).counters()
+    expected.update(ProjectStatsService.compute(project_id).get(project_id, {}))
+    return expected
+
+def test_create_project_creates_empty_stats(app):
+    assert _stored('p1') == ProjectStats(project_id='p1').counters()
+
+def test_counters_follow_task_mutations(app):
+    first, _ = TaskService.create_task('A', '', 'p1', priority='high')
+    second, _ = TaskService.create_task('B', '', 'p1', status='in_progress', priority='low')
+    TaskService.add_task_comment(first['id'], 'Hola', 'u1')
+    TaskService.add_task_comment(first['id'], 'Otra', 'u1')
+    stats = _stored('p1')
+    assert stats['total_tasks'] == 2
+    assert stats['todo'] == 1 and stats['in_progress'] == 1
+    assert stats['high_priority'] == 1 and stats['low_priority'] == 1
+    assert stats['comments_count'] == 2
+
+    TaskService.update_task_status(first['id'], 'done')
+    TaskService.update_task(second['id'], priority='medium', status='review')
+    stats = _stored('p1')
+    assert (stats['todo'], stats['review'], stats['done']) == (0, 1, 1)
+    assert (stats['low_priority'], stats['medium_priority']) == (0, 1)
+    assert stats == _expected('p1')
+
+    TaskService.update_task(first['id'], project_id='p2')
+    assert _stored('p1') == _expected('p1')
+    assert _stored('p2')['comments_count'] == 2
+    assert _stored('p2')['done'] == 1
+
+    TaskService.delete_task(first['id'])
+    assert _stored('p2') == ProjectStats(project_id='p2').counters()
+    assert _stored('p1')['total_tasks'] == 1
+
+def test_failed_update_does_not_change_counters(app):
+    task, _ = TaskService.create_task('A', '', 'p1')
+    before = _stored('p1')
+    _, error = TaskService.update_task(task['id'], status='cancelled')
+    assert error
+    assert _stored('p1') == before
+
+def test_missing_row_is_created_from_tasks(app):
+    db.session.add(Task(id='t0', title='Legado', project_id='p1', status='done'))
+    ProjectStats.query.filter_by(project_id='p1').delete()
+    db.session.commit()
+    TaskService.create_task('Nueva', '', 'p1')
+    stats = _stored('p1')
+    assert stats['total_tasks'] == 2
+    assert stats['done'] == 1
+
+def test_rebuild_fixes_drift(app):
+    TaskService.create_task('A', '', 'p1')
+    db.session.add(Task(id='t0', title='Sin contador', project_id='p2', status='done'))
+    ProjectStats.query.filter_by(project_id='p1').update({'total_tasks': 40})
+    ProjectStats.query.filter_by(project_id='p2').delete()
+    db.session.commit()
+
+    result, error = ProjectStatsService.rebuild()
+    assert error is None
+    assert result == {'checked': 2, 'fixed': 1, 'created': 1}
+    assert _stored('p1')['total_tasks'] == 1
+    assert _stored('p2')['done'] == 1
+    assert ProjectStatsService.rebuild()[0] == {'checked': 2, 'fixed': 0, 'created': 0}
+
+def test_project_stats_and_list_progress(app):
+    TaskService.create_task('A', '', 'p1', status='done')
+    TaskService.create_task('B', '', 'p1', due_date='2000-01-01')
+    TaskService.create_task('C', '', 'p1', due_date='2999-01-01')
+
+    stats, error = ProjectService.get_project_stats('p1')
+    assert error is None
+    assert stats['total_tasks'] == 3
+    assert stats['done'] == 1
+    assert stats['overdue'] == 1
+
+    projects, error = ProjectService.get_all_projects()
+    progress = {project['id']: project for project in projects}
+    assert progress['p1']['task_count'] == 3
+    assert progress['p1']['completed_task_count'] == 1
+    assert progress['p1']['progress'] == 33.3
+    assert progress['p2']['progress'] == 0
@@ -0,0 +1,178 @@
+import io
+import time
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+from models.report_job import ReportJob
+from services.report_job_service import ReportJobService
+from services.pdf_service import PDFService
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    # Base de datos en archivo para que los hilos del pool vean los mismos datos
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'jobs.db'}"
+    app.config['PDF_JOB_DIR'] = str(tmp_path / 'jobs')
+    app.config['PDF_JOB_WORKERS'] = 1
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Test', email='test@example.com', password_hash='x'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _fake_report(buffers):
+    def generate(filters, progress_callback=None):
+        for percentage in (10, 50, 90):
+            progress_callback(percentage)
+        buffers.append(io.BytesIO(b'%PDF-1.4 fake'))
+        return buffers[-1], None
+    return generate
+
+def _wait_for(job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        db.session.expire_all()
+        job = db.session.get(ReportJob, job_id)
+        if job.status in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError('El trabajo no terminó a tiempo')
+
+def test_enqueue_rejects_unknown_type(app):
+    job, error = ReportJobService.enqueue('u1', 'unknown')
+    assert job is None
+    assert 'Tipo de reporte inválido' in error
+
+def test_enqueue_requires_project_id(app):
+    job, error = ReportJobService.enqueue('u1', 'project', {})
+    assert job is None
+    assert 'project_id' in error
+
+def test_job_runs_in_background_and_stores_file(app, monkeypatch):
+    buffers = []
+    monkeypatch.setattr(PDFService, 'generate_tasks_report', staticmethod(_fake_report(buffers)))
+    data, error = ReportJobService.enqueue('u1', 'tasks', {'filters': {'status': 'todo'}})
+    assert error is None
+    assert data['status'] == 'queued'
+    assert data['download_url'] is None
+
+    job = _wait_for(data['id'])
+    assert job.status == 'done'
+    assert job.progress == 100
+    assert job.file_size == len(b'%PDF-1.4 fake')
+    assert job.file_path.startswith(app.config['PDF_JOB_DIR'])
+    assert job.to_dict()['download_url'] == f"/api/pdf/jobs/{job.id}/download"
+    assert ReportJobService.get_download_name(job).startswith('reporte_tareas_')
+    assert buffers[0].closed
+
+def test_run_job_records_progress_and_failure(app, monkeypatch):
+    progress_seen = []
+
+    def failing_report(filters, progress_callback=None):
+        progress_callback(40)
+        progress_seen.append(db.session.get(ReportJob, job.id).progress)
+        return None, 'Error generando reporte: sin datos'
+
+    monkeypatch.setattr(PDFService, 'generate_tasks_report', staticmethod(failing_report))
+    job = ReportJob(user_id='u1', report_type='tasks', params='{}')
+    db.session.add(job)
+    db.session.commit()
+
+    ReportJobService.run_job(job.id)
+
+    db.session.expire_all()
+    job = db.session.get(ReportJob, job.id)
+    assert progress_seen == [40]
+    assert job.status == 'failed'
+    assert job.error == 'Error generando reporte: sin datos'
+    assert job.finished_at is not None
+
+def test_get_job_is_scoped_to_owner(app):
+    db.session.add(User(id='u2', name='Otro', email='otro@example.com', password_hash='x'))
+    job = ReportJob(user_id='u1', report_type='general', params='{}')
+    db.session.add(job)
+    db.session.commit()
+
+    found, error = ReportJobService.get_job(job.id, 'u1')
+    assert error is None and found.id == job.id
+    found, error = ReportJobService.get_job(job.id, 'u2')
+    assert found is None
+    assert error == 'Trabajo de reporte no encontrado'
+
+def test_purge_expired_jobs_removes_files(app, tmp_path):
+    old_file = tmp_path / 'old.pdf'
+    old_file.write_bytes(b'%PDF')
+    now = datetime.utcnow()
+    db.session.add_all([
+        ReportJob(id='old', user_id='u1', report_type='general', params='{}', status='done',
+                  file_path=str(old_file), created_at=now - timedelta(hours=2)),
+        ReportJob(id='recent', user_id='u1', report_type='general', params='{}', created_at=now)
+    ])
+    db.session.commit()
+
+    assert ReportJobService.purge_expired_jobs(now=now) == 1
+    assert not old_file.exists()
+    assert [job.id for job in ReportJob.query.all()] == ['recent']
+
+def test_purge_expired_jobs_keeps_pending_jobs(app):
+    now = datetime.utcnow()
+    db.session.add_all([
+        ReportJob(id='running', user_id='u1', report_type='general', params='{}', status='running',
+                  created_at=now - timedelta(hours=2)),
+        ReportJob(id='failed', user_id='u1', report_type='general', params='{}', status='failed',
+                  created_at=now - timedelta(hours=3), finished_at=now - timedelta(hours=2))
+    ])
+    db.session.commit()
+
+    assert ReportJobService.purge_expired_jobs(now=now) == 1
+    assert [job.id for job in ReportJob.query.all()] == ['running']
+
+def test_stale_jobs_are_marked_failed(app):
+    now = datetime.utcnow()
+    db.session.add_all([
+        ReportJob(id='lost', user_id='u1', report_type='general', params='{}', status='running',
+                  created_at=now - timedelta(hours=1), updated_at=now - timedelta(minutes=20)),
+        ReportJob(id='queued', user_id='u1', report_type='general', params='{}', status='queued',
+                  created_at=now - timedelta(minutes=20), updated_at=now - timedelta(minutes=20)),
+        ReportJob(id='active', user_id='u1', report_type='general', params='{}', status='running',
+                  created_at=now - timedelta(hours=1), updated_at=now)
+    ])
+    db.session.commit()
+
+    job, error = ReportJobService.get_job('lost', 'u1')
+    assert error is None
+    assert job.status == 'failed' and 'reinicio' in job.error
+    assert ReportJobService.fail_stale_jobs(now=now) == 1
+    db.session.expire_all()
+    assert {job.id: job.status for job in ReportJob.query.all()} == {
+        'lost': 'failed', 'queued': 'failed', 'active': 'running'
+    }
+
+    # Un trabajo marcado como fallido mientras esperaba en la cola ya no se ejecuta
+    ReportJobService.run_job('queued')
+    db.session.expire_all()
+    assert db.session.get(ReportJob, 'queued').status == 'failed'
+
+def test_job_activity_uses_the_same_clock_as_the_stale_check(app):
+    # fail_stale_jobs compara con datetime.utcnow(): las fechas del trabajo deben salir del
+    # mismo reloj y no de current_timestamp (zona del servidor en PostgreSQL, segundos en SQLite)
+    before = datetime.utcnow()
+    db.session.add(ReportJob(id='j1', user_id='u1', report_type='general', params='{}'))
+    db.session.commit()
+    ReportJobService._update('j1', status='running', progress=10)
+    after = datetime.utcnow()
+
+    job, error = ReportJobService.get_job('j1', 'u1')
+    assert error is None
+    assert job.status == 'running'
+    assert before <= job.created_at <= job.updated_at <= after
@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from services.search_service import SearchService
+
+@pytest.fixture
+def app():
+    from flask import Flask
+    from database import db
+    from models.user import User
+    from models.project import Project
+    from models.task import Task
+    from models.comment import Comment
+    from models.notification import Notification
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Test', email='test@example.com', password_hash='x'))
+        db.session.add(Project(id='p1', name='Migración', description='Cambio de base de datos', created_by='u1'))
+        db.session.add(Task(id='t1', title='Migrar esquema', description='Pasar a PostgreSQL', project_id='p1'))
+        db.session.add(Task(id='t2', title='Revisar diseño', description='Validar la migración', project_id='p1'))
+        db.session.commit()
+    SearchService.init_app(app)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def test_terms_are_sanitized():
+    assert SearchService._terms('migra* "base" OR (datos)') == ['migra', 'base', 'OR', 'datos']
+    assert SearchService._terms('%%') == []
+
+def test_search_prefix_match(app):
+    assert app.config['SEARCH_BACKEND'] == 'sqlite'
+    results, err = SearchService.search('migr', types=['tasks', 'projects'])
+    assert err is None
+    assert {task['id'] for task in results['tasks']} == {'t1', 't2'}
+    assert [project['id'] for project in results['projects']] == ['p1']
+
+def test_search_index_follows_updates(app):
+    from database import db
+    from models.task import Task
+    task = Task.query.get('t2')
+    task.description = 'Sin relación'
+    db.session.commit()
+    results, err = SearchService.search('migr', types=['tasks'])
+    assert err is None
+    assert [task['id'] for task in results['tasks']] == ['t1']
+
+def test_apply_task_search_falls_back_to_ilike():
+    with patch.object(SearchService, 'match_subquery', return_value=None):
+        query = MagicMock()
+        filtered, rank = SearchService.apply_task_search(query, 'texto')
+        assert rank is None
+        query.filter.assert_called_once()
+
+def test_ensure_search_index_repairs_missing_triggers(app):
+    from database import db
+    from models.task import Task
+    db.session.execute(db.text('DROP TRIGGER tasks_fts_ai'))
+    db.session.commit()
+    db.session.add(Task(id='t3', title='Migración parcial', project_id='p1'))
+    db.session.commit()
+    assert 't3' not in {task['id'] for task in SearchService.search('parcial', types=['tasks'])[0]['tasks']}
+
+    assert SearchService.ensure_search_index() == 'sqlite'
+    triggers = {name for name, in db.session.execute(db.text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))}
+    assert {'tasks_fts_ai', 'tasks_fts_ad', 'tasks_fts_au'} <= triggers
+    results, err = SearchService.search('parcial', types=['tasks'])
+    assert [task['id'] for task in results['tasks']] == ['t3']
+
+def test_postgres_startup_only_checks_the_migrated_index(app, monkeypatch):
+    from database import db
+    engine = MagicMock()
+    engine.dialect.name = 'postgresql'
+    monkeypatch.setattr(type(db), 'engine', property(lambda self: engine))
+
+    with patch.object(SearchService, '_postgres_index_exists', return_value=False):
+        assert SearchService.ensure_search_index() == 'like'
+    with patch.object(SearchService, '_postgres_index_exists', return_value=True):
+        assert SearchService.ensure_search_index() == 'postgresql'
+    # Sin DDL en el arranque: la columna y el índice GIN los crea la migración
+    engine.begin.assert_not_called()
+    engine.connect.assert_not_called()
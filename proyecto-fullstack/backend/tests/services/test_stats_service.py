@@ -0,0 +1,164 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from services.stats_service import StatsService
+
+def test_build_task_stats():
+    counts = {
+        ('todo', 'high'): 2,
+        ('todo', 'low'): 1,
+        ('in_progress', 'medium'): 3,
+        ('done', 'high'): 4
+    }
+    stats = StatsService.build_task_stats(counts)
+    assert stats['total_tasks'] == 10
+    assert stats['tasks_by_status'] == {'todo': 3, 'in_progress': 3, 'review': 0, 'done': 4}
+    assert stats['tasks_by_priority'] == {'high': 6, 'medium': 3, 'low': 1}
+    assert stats['completed_tasks'] == 4
+    assert stats['in_progress_tasks'] == 3
+    assert stats['pending_tasks'] == 3
+
+def test_build_task_stats_empty():
+    stats = StatsService.build_task_stats({})
+    assert stats['total_tasks'] == 0
+    assert stats['tasks_by_status']['done'] == 0
+    assert stats['tasks_by_priority']['high'] == 0
+
+@patch('services.stats_service.db')
+def test_get_task_counts_single_grouped_query(mock_db):
+    query = MagicMock()
+    mock_db.session.query.return_value = query
+    query.filter.return_value = query
+    query.group_by.return_value.all.return_value = [('todo', 'high', 5), ('done', 'low', 2)]
+    counts = StatsService.get_task_counts({'project_id': 'p1'})
+    assert counts == {('todo', 'high'): 5, ('done', 'low'): 2}
+    mock_db.session.query.assert_called_once()
+    query.filter.assert_called_once()
+    query.group_by.assert_called_once()
+
+@pytest.fixture
+def app():
+    from flask import Flask
+    from flask_jwt_extended import JWTManager
+    from database import db
+    from models.user import User
+    from models.project import Project
+    from models.task import Task
+    from models.notification import Notification
+    from routes.metrics_routes import metrics_bp
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(metrics_bp)
+    with app.app_context():
+        db.create_all()
+        user = User(id='u1', name='Test', email='test@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.add(Project(id='p1', name='P1', status='active', created_by='u1'))
+        db.session.add(Project(id='p2', name='P2', status='completed', created_by='u1'))
+        for i, (status, priority) in enumerate([('todo', 'high'), ('done', 'low'), ('done', 'high')]):
+            db.session.add(Task(id=f't{i}', title=f'T{i}', status=status, priority=priority, project_id='p1'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def test_overview_query_count(app):
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import event
+    from database import db
+    statements = []
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', count_query)
+    try:
+        with app.test_client() as client:
+            token = create_access_token(identity='u1')
+            response = client.get('/metrics/overview', headers={'Authorization': f'Bearer {token}'})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_query)
+    assert response.status_code == 200
+    data = response.json['data']
+    assert data['summary']['total_projects'] == 2
+    assert data['summary']['total_tasks'] == 3
+    assert data['summary']['completed_tasks'] == 2
+    assert data['projects']['projects_by_status'] == {'active': 1, 'completed': 1, 'on_hold': 0}
+    assert data['tasks']['tasks_by_priority'] == {'high': 2, 'medium': 0, 'low': 1}
+    # Una consulta agregada para tareas y otra para proyectos
+    assert len(statements) == 2
+
+def _get(app, path):
+    from flask_jwt_extended import create_access_token
+    with app.test_client() as client:
+        token = create_access_token(identity='u1')
+        return client.get(path, headers={'Authorization': f'Bearer {token}'})
+
+def test_tasks_by_status_and_priority_charts(app):
+    response = _get(app, '/charts/tasks-by-status?project_id=p1')
+    assert response.status_code == 200
+    assert response.json['chart_data'] == [
+        {'status': 'todo', 'count': 1}, {'status': 'in_progress', 'count': 0},
+        {'status': 'review', 'count': 0}, {'status': 'done', 'count': 2}
+    ]
+    response = _get(app, '/charts/tasks-by-priority')
+    assert response.json['chart_data'] == [
+        {'priority': 'high', 'count': 2}, {'priority': 'medium', 'count': 0}, {'priority': 'low', 'count': 1}
+    ]
+
+def test_projects_progress_single_grouped_query(app):
+    from sqlalchemy import event
+    from database import db
+    statements = []
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', count_query)
+    try:
+        response = _get(app, '/charts/projects-progress')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_query)
+    assert response.status_code == 200
+    progress = {item['project_id']: item for item in response.json['chart_data']}
+    assert progress['p1']['total_tasks'] == 3
+    assert progress['p1']['completed_tasks'] == 2
+    assert progress['p1']['progress'] == 66.7
+    assert progress['p2']['total_tasks'] == 0
+    assert progress['p2']['progress'] == 0
+    assert len(statements) == 1
+
+def test_task_timeline_buckets_by_day_and_fills_gaps(app):
+    from datetime import date, datetime
+    from database import db
+    from models.task import Task
+    with app.app_context():
+        db.session.add(Task(id='a', title='A', project_id='p1', status='todo',
+                            created_at=datetime(2025, 3, 8, 23, 59), updated_at=datetime(2025, 3, 8, 23, 59)))
+        db.session.add(Task(id='b', title='B', project_id='p1', status='done',
+                            created_at=datetime(2025, 3, 8, 9), updated_at=datetime(2025, 3, 10, 12)))
+        db.session.add(Task(id='c', title='C', project_id='p2', status='done',
+                            created_at=datetime(2025, 3, 10, 8), updated_at=datetime(2025, 3, 10, 8)))
+        # Fuera de la ventana
+        db.session.add(Task(id='d', title='D', project_id='p1', status='done',
+                            created_at=datetime(2025, 3, 6), updated_at=datetime(2025, 3, 6)))
+        db.session.commit()
+
+        timeline = StatsService.get_task_timeline(3, today=date(2025, 3, 10))
+        assert timeline == [
+            {'date': '2025-03-08', 'created': 2, 'completed': 0},
+            {'date': '2025-03-09', 'created': 0, 'completed': 0},
+            {'date': '2025-03-10', 'created': 1, 'completed': 2}
+        ]
+        by_project = StatsService.get_task_timeline(3, {'project_id': 'p2'}, today=date(2025, 3, 10))
+        assert [day['created'] for day in by_project] == [0, 0, 1]
+
+def test_task_timeline_clamps_days(app):
+    with app.app_context():
+        assert len(StatsService.get_task_timeline(0)) == 1
+        assert len(StatsService.get_task_timeline(10000)) == 365
+
+def test_tasks_timeline_route(app):
+    response = _get(app, '/charts/tasks-timeline?days=7')
+    assert response.status_code == 200
+    timeline = response.json['chart_data']
+    assert len(timeline) == 7
+    assert sum(day['created'] for day in timeline) == 3
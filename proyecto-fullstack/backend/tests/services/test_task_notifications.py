@@ -0,0 +1,103 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from sqlalchemy import event
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification
+from models.notification_counter import NotificationCounter
+from services.notification_service import NotificationService
+from services.project_service import ProjectService
+from services.task_service import TaskService
+from utils.notification_bus import notification_bus
+from utils.unit_of_work import after_commit, pending_callbacks
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Ana', email='ana@example.com', password_hash='x'))
+        db.session.add(User(id='u2', name='Luis', email='luis@example.com', password_hash='x'))
+        db.session.commit()
+        ProjectService.create_project('P1', '', 'u1', id='p1')
+        yield app
+        db.session.remove()
+        db.drop_all()
+    notification_bus.reset()
+
+@pytest.fixture
+def commits(app):
+    count = []
+    listener = lambda session: count.append(1)
+    event.listen(db.session, 'after_commit', listener)
+    yield count
+    event.remove(db.session, 'after_commit', listener)
+
+@pytest.fixture
+def published():
+    events = []
+    with patch.object(notification_bus, 'publish',
+                      side_effect=lambda user_id, event, data, event_id=None: events.append((user_id, event, data))):
+        yield events
+
+def _unread(user_id):
+    db.session.expire_all()
+    return NotificationCounter.query.get(user_id).unread
+
+def test_task_mutations_commit_once_with_notification(app, commits, published):
+    task, err = TaskService.create_task('A', '', 'p1', assigned_to='u1')
+    assert err is None
+    assert len(commits) == 1
+    assert Notification.query.filter_by(user_id='u1', title='Tarea creada').count() == 1
+    assert [event for _, event, _ in published] == ['notification', 'unread']
+    assert published[1][2] == {'delta': 1, 'unread_count': 1}
+
+    TaskService.update_task(task['id'], assigned_to='u2')
+    assert len(commits) == 2
+    assert Notification.query.filter_by(user_id='u2', title='Tarea actualizada').count() == 1
+
+    TaskService.delete_task(task['id'])
+    assert len(commits) == 3
+    assert Notification.query.filter_by(user_id='u2', title='Tarea eliminada').count() == 1
+    assert _unread('u1') == 1 and _unread('u2') == 2
+
+def test_notification_failure_rolls_back_task(app, published):
+    with patch.object(NotificationService, 'adjust_unread', side_effect=RuntimeError('sin contador')):
+        task, err = TaskService.create_task('A', '', 'p1', assigned_to='u1')
+    assert task is None
+    assert 'sin contador' in err
+    assert Task.query.count() == 0
+    assert Notification.query.count() == 0
+    assert published == []
+    assert pending_callbacks() == 0
+
+def test_after_commit_callbacks_run_once_and_are_discarded_on_rollback(app):
+    calls = []
+    after_commit(calls.append, 'primero')
+    db.session.rollback()
+    assert calls == []
+    assert pending_callbacks() == 0
+
+    after_commit(calls.append, 'segundo')
+    db.session.commit()
+    db.session.commit()
+    assert calls == ['segundo']
+
+def test_failed_after_commit_callback_is_logged(app, caplog):
+    def publish():
+        raise RuntimeError('bus caído')
+
+    after_commit(publish)
+    with caplog.at_level('ERROR', logger='utils.unit_of_work'):
+        db.session.commit()
+    record = caplog.records[-1]
+    assert record.name == 'utils.unit_of_work'
+    assert 'publish' in record.getMessage()
+    assert record.exc_info[1].args == ('bus caído',)
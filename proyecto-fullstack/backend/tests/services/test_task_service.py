@@ -7,9 +7,9 @@ class DummyTask:
         self.status = status
         self.priority = priority
 
-@patch('services.task_service.Task')
-def test_get_tasks_stats(mock_Task):
-    mock_Task.query.all.return_value = [DummyTask('todo', 'high'), DummyTask('done', 'low')]
+@patch('services.stats_service.StatsService.get_task_counts')
+def test_get_tasks_stats(mock_get_task_counts):
+    mock_get_task_counts.return_value = {('todo', 'high'): 1, ('done', 'low'): 1}
     metrics, err = TaskService.get_tasks_stats()
     assert err is None
     assert metrics['total_tasks'] == 2
@@ -22,3 +22,47 @@ def test_get_all_tasks(mock_Task):
     result, err = TaskService.get_all_tasks()
     assert err is None
     assert isinstance(result, list)
+
+class DummyCountedTask(DummyTask):
+    def __init__(self, id, **kwargs):
+        super().__init__(**kwargs)
+        self.id = id
+    def to_dict(self, comments_count=None):
+        return {'id': self.id, 'commentsCount': comments_count}
+
+@patch('services.task_service.Task')
+def test_get_tasks_by_project_uses_precomputed_comments_count(mock_Task):
+    query = mock_Task.query.filter_by.return_value
+    query.outerjoin.return_value.add_columns.return_value.all.return_value = [
+        (DummyCountedTask('t1'), 2),
+        (DummyCountedTask('t2'), 0)
+    ]
+    result, err = TaskService.get_tasks_by_project('p1')
+    assert err is None
+    assert result == [{'id': 't1', 'commentsCount': 2}, {'id': 't2', 'commentsCount': 0}]
+    query.all.assert_not_called()
+
+@patch('services.task_service.apply_keyset')
+@patch('services.task_service.TaskService._serialize_tasks')
+@patch('services.task_service.Task')
+def test_get_tasks_page_returns_next_cursor(mock_Task, mock_serialize, mock_apply_keyset):
+    mock_serialize.return_value = [
+        {'id': f't{i}', 'created_at': '2025-07-01T10:00:00'} for i in range(3)
+    ]
+    page, err = TaskService.get_tasks_page(limit=2)
+    assert err is None
+    assert [t['id'] for t in page['tasks']] == ['t0', 't1']
+    assert page['next_cursor'] is not None
+    assert 'total' not in page
+    mock_serialize.assert_called_once_with(mock_apply_keyset.return_value, limit=3)
+
+@patch('services.task_service.apply_keyset')
+@patch('services.task_service.TaskService._serialize_tasks')
+@patch('services.task_service.Task')
+def test_get_tasks_page_last_page_with_total(mock_Task, mock_serialize, mock_apply_keyset):
+    mock_Task.query.count.return_value = 1
+    mock_serialize.return_value = [{'id': 't0', 'created_at': '2025-07-01T10:00:00'}]
+    page, err = TaskService.get_tasks_page(limit=2, include_total=True)
+    assert err is None
+    assert page['next_cursor'] is None
+    assert page['total'] == 1
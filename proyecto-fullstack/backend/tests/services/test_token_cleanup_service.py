@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+from models.revoked_token import RevokedToken
+from models.password_reset_token import PasswordResetToken
+from services.token_cleanup_service import TokenCleanupService
+from cli import register_commands
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=30)
+    db.init_app(app)
+    register_commands(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Test', email='test@example.com', password_hash='x'))
+        db.session.add_all([
+            RevokedToken(jti=f'expired-{i}', created_at=NOW - timedelta(hours=2), expires_at=NOW - timedelta(hours=1))
+            for i in range(5)
+        ])
+        db.session.add_all([
+            RevokedToken(jti='active', created_at=NOW, expires_at=NOW + timedelta(hours=1)),
+            RevokedToken(jti='legacy-old', created_at=NOW - timedelta(days=31)),
+            RevokedToken(jti='legacy-recent', created_at=NOW - timedelta(days=1)),
+            PasswordResetToken(token='used', user_id='u1', expires_at=NOW + timedelta(hours=1), used=True),
+            PasswordResetToken(token='expired', user_id='u1', expires_at=NOW - timedelta(hours=1)),
+            PasswordResetToken(token='valid', user_id='u1', expires_at=NOW + timedelta(hours=1)),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def test_get_table_sizes(app):
+    assert TokenCleanupService.get_table_sizes() == {'revoked_tokens': 8, 'password_reset_tokens': 3}
+
+def test_purge_expired_tokens_in_batches(app):
+    result, error = TokenCleanupService.purge_expired_tokens(batch_size=2, now=NOW)
+    assert error is None
+    assert result['deleted'] == {'revoked_tokens': 6, 'password_reset_tokens': 2}
+    assert result['before'] == {'revoked_tokens': 8, 'password_reset_tokens': 3}
+    assert result['after'] == {'revoked_tokens': 2, 'password_reset_tokens': 1}
+    remaining = {token.jti for token in RevokedToken.query.all()}
+    assert remaining == {'active', 'legacy-recent'}
+    assert [token.token for token in PasswordResetToken.query.all()] == ['valid']
+
+def test_purge_is_idempotent(app):
+    TokenCleanupService.purge_expired_tokens(now=NOW)
+    result, error = TokenCleanupService.purge_expired_tokens(now=NOW)
+    assert error is None
+    assert result['deleted'] == {'revoked_tokens': 0, 'password_reset_tokens': 0}
+
+def test_purge_tokens_command(app):
+    result = app.test_cli_runner().invoke(args=['purge-tokens', '--batch-size', '3'])
+    assert result.exit_code == 0
+    assert 'revoked_tokens' in result.output
+    assert 'password_reset_tokens' in result.output
+
+def test_purge_skips_when_another_process_holds_the_lock(app, monkeypatch):
+    from contextlib import contextmanager
+    from services import token_cleanup_service
+
+    @contextmanager
+    def busy(key):
+        assert key == token_cleanup_service.TOKEN_PURGE_LOCK_KEY
+        yield False
+
+    monkeypatch.setattr(token_cleanup_service, 'exclusive_pass', busy)
+    result, error = TokenCleanupService.purge_expired_tokens(now=NOW)
+    assert error is None
+    assert result['skipped'] is True
+    assert result['deleted'] == {'revoked_tokens': 0, 'password_reset_tokens': 0}
+    assert TokenCleanupService.get_table_sizes() == {'revoked_tokens': 8, 'password_reset_tokens': 3}
+
+    output = app.test_cli_runner().invoke(args=['purge-tokens']).output
+    assert 'en curso' in output
+
+def test_purge_uses_its_own_advisory_lock_on_postgres(app, monkeypatch):
+    from unittest.mock import MagicMock
+    from services.notification_retention_service import RETENTION_LOCK_KEY
+    from services.token_cleanup_service import TOKEN_PURGE_LOCK_KEY
+    engine = MagicMock()
+    engine.dialect.name = 'postgresql'
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.execute.return_value.scalar.return_value = False
+    monkeypatch.setattr(type(db), 'engine', property(lambda self: engine))
+
+    result, error = TokenCleanupService.purge_expired_tokens(now=NOW)
+    assert error is None and result['skipped'] is True
+    assert connection.execute.call_args.args[1] == {'key': TOKEN_PURGE_LOCK_KEY}
+    assert TOKEN_PURGE_LOCK_KEY != RETENTION_LOCK_KEY
@@ -0,0 +1,24 @@
+import builtins
+import io
+import config
+
+
+def test_detect_cpu_count_uses_affinity(monkeypatch):
+    monkeypatch.setattr(config.os, 'sched_getaffinity', lambda pid: {0, 1, 2, 3}, raising=False)
+    monkeypatch.setattr(builtins, 'open', lambda *a, **k: (_ for _ in ()).throw(OSError()))
+    assert config.detect_cpu_count() == 4
+
+def test_detect_cpu_count_respects_cgroup_quota(monkeypatch):
+    monkeypatch.setattr(config.os, 'sched_getaffinity', lambda pid: set(range(8)), raising=False)
+    monkeypatch.setattr(builtins, 'open', lambda *a, **k: io.StringIO('200000 100000\n'))
+    assert config.detect_cpu_count() == 2
+
+def test_detect_cpu_count_unlimited_quota(monkeypatch):
+    monkeypatch.setattr(config.os, 'sched_getaffinity', lambda pid: set(range(8)), raising=False)
+    monkeypatch.setattr(builtins, 'open', lambda *a, **k: io.StringIO('max 100000\n'))
+    assert config.detect_cpu_count() == 8
+
+def test_production_config_wsgi_defaults():
+    assert config.ProductionConfig.WSGI_WORKERS >= 3
+    assert config.ProductionConfig.WSGI_WORKER_CLASS == 'gthread'
+    assert config.ProductionConfig.WSGI_MAX_REQUESTS_JITTER < config.ProductionConfig.WSGI_MAX_REQUESTS
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_create_app_does_not_load_reporting_stack():
+    code = (
+        "import sys; from app import create_app; create_app('testing'); "
+        "print(sorted(name for name in ('reportlab', 'matplotlib', 'services.pdf_service') if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        env=dict(os.environ, FLASK_ENV='testing')
+    )
+    assert result.stdout.strip().splitlines()[-1] == '[]'
@@ -0,0 +1,64 @@
+import json
+import logging
+import pytest
+from flask import Flask, jsonify
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+from utils.instrumentation import init_instrumentation, timed
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQL_QUERY_BUDGET'] = 2
+    db.init_app(app)
+    init_instrumentation(app)
+
+    @app.route('/users/<int:count>')
+    def list_users(count):
+        for _ in range(count):
+            User.query.all()
+        with timed('render'):
+            payload = {'success': True}
+        return jsonify(payload)
+
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+def test_server_timing_counts_queries(app):
+    response = app.test_client().get('/users/2')
+    header = response.headers['Server-Timing']
+    assert 'db;dur=' in header
+    assert 'desc="2 queries"' in header
+    assert 'serialize;dur=' in header
+    assert 'render;dur=' in header
+    assert 'total;dur=' in header
+    assert 'X-Query-Budget-Exceeded' not in response.headers
+
+def test_query_budget_exceeded(app, caplog):
+    with caplog.at_level(logging.INFO, logger='nutrabiotics.requests'):
+        response = app.test_client().get('/users/3')
+    assert response.headers['X-Query-Budget-Exceeded'] == '3/2'
+    record = json.loads(caplog.records[-1].getMessage())
+    assert caplog.records[-1].levelno == logging.WARNING
+    assert record['queries'] == 3
+    assert record['query_budget'] == 2
+    assert record['endpoint'] == 'list_users'
+    assert record['status'] == 200
+
+def test_structured_log_within_budget(app, caplog):
+    with caplog.at_level(logging.INFO, logger='nutrabiotics.requests'):
+        app.test_client().get('/users/1')
+    record = json.loads(caplog.records[-1].getMessage())
+    assert caplog.records[-1].levelno == logging.INFO
+    assert record['queries'] == 1
+    assert record['path'] == '/users/1'
+    assert 'query_budget' not in record
@@ -0,0 +1,202 @@
+import json
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification
+from routes.notification_routes import notifications_bp
+from services.notification_service import NotificationService
+from utils import notification_bus as bus_module
+from utils.notification_bus import NotificationBus, format_event, notification_bus
+
+
+def _parse(chunk):
+    """Convertir un bloque text/event-stream en diccionario (None para comentarios)"""
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode('utf-8')
+    if chunk.startswith(':') or chunk.startswith('retry:'):
+        return None
+    fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+    fields['data'] = json.loads(fields['data'])
+    return fields
+
+
+@pytest.fixture
+def bus():
+    bus = NotificationBus()
+    bus.heartbeat = 0.01
+    bus.max_stream_seconds = 5
+    return bus
+
+def test_format_event():
+    assert format_event('unread', {'delta': 1}) == 'event: unread\ndata: {"delta": 1}\n\n'
+    assert format_event('notification', {}, 'abc').startswith('id: abc\nevent: notification\n')
+
+def test_publish_reaches_only_the_users_streams(bus):
+    first = bus.subscribe('u1')
+    second = bus.subscribe('u1')
+    other = bus.subscribe('u2')
+    bus.publish('u1', 'unread', {'delta': 1})
+    assert first.queue.get_nowait()[1] == format_event('unread', {'delta': 1})
+    assert second.queue.qsize() == 1
+    assert other.queue.empty()
+
+def test_connection_cap(bus):
+    bus.max_connections = 2
+    first = bus.subscribe('u1')
+    assert bus.subscribe('u2') is not None
+    assert bus.subscribe('u3') is None
+    bus.unsubscribe(first)
+    bus.unsubscribe(first)
+    assert bus.connections == 1
+    assert bus.subscribe('u3') is not None
+
+def test_slow_client_is_closed(bus, monkeypatch):
+    monkeypatch.setattr(bus_module, 'QUEUE_SIZE', 2)
+    subscription = bus.subscribe('u1')
+    for i in range(3):
+        bus.publish('u1', 'unread', {'delta': 1})
+    assert subscription.closed
+
+def test_stream_heartbeat_dedupe_and_unsubscribe(bus):
+    subscription = bus.subscribe('u1')
+    stream = bus.stream(subscription, ['event: unread\ndata: {}\n\n'], replayed_ids=['old'])
+    assert next(stream).startswith('retry:')
+    assert next(stream).startswith('event: unread')
+    assert next(stream) == ': heartbeat\n\n'
+    bus.publish('u1', 'notification', {'id': 'old'}, 'old')
+    bus.publish('u1', 'notification', {'id': 'new'}, 'new')
+    assert _parse(next(stream))['id'] == 'new'
+    stream.close()
+    assert bus.connections == 0
+
+def test_stream_ends_after_max_duration(bus):
+    bus.max_stream_seconds = 0.05
+    chunks = list(bus.stream(bus.subscribe('u1')))
+    assert chunks[0].startswith('retry:')
+    assert bus.connections == 0
+
+def test_init_app_defaults_cap_to_half_the_threads(bus):
+    app = Flask(__name__)
+    app.config.update(WSGI_THREADS=8, SSE_MAX_CONNECTIONS=0)
+    bus.init_app(app)
+    assert bus.max_connections == 4
+    app.config.update(NOTIFICATION_BUS_BACKEND='kafka')
+    with pytest.raises(ValueError):
+        bus.init_app(app)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-notification-stream'
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
+    notification_bus.reset()
+    notification_bus.heartbeat = 0.01
+    notification_bus.max_connections = 100
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Ana', email='ana@example.com', password_hash='x'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    notification_bus.reset()
+
+def _open_stream(app, headers=None):
+    token = create_access_token(identity='u1')
+    response = app.test_client().get('/api/notifications/stream', buffered=False,
+                                     headers={'Authorization': f'Bearer {token}', **(headers or {})})
+    return response, (_parse(chunk) for chunk in response.response)
+
+def _next_event(events):
+    return next(event for event in events if event is not None)
+
+def test_stream_pushes_created_notifications(app):
+    response, events = _open_stream(app)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert _next_event(events) == {'event': 'unread', 'data': {'unread_count': 0}}
+
+    NotificationService.create_notification('u1', 'Hola', 'Mensaje')
+    created = _next_event(events)
+    assert created['event'] == 'notification'
+    assert created['data']['title'] == 'Hola'
+    assert created['id']
+    assert _next_event(events) == {'event': 'unread', 'data': {'delta': 1, 'unread_count': 1}}
+
+    notification_id = created['data']['id']
+    NotificationService.mark_as_read(notification_id, 'u1')
+    assert _next_event(events) == {'event': 'unread', 'data': {'delta': -1, 'unread_count': 0}}
+    response.close()
+    assert notification_bus.connections == 0
+
+def test_stream_resumes_from_last_event_id(app):
+    NotificationService.create_notification('u1', 'Primera', 'x')
+    first = Notification.query.filter_by(title='Primera').one()
+    NotificationService.create_notification('u1', 'Segunda', 'x')
+    # Una transacción lenta puede confirmar una fila con created_at anterior a eventos ya
+    # enviados: la reanudación sigue la secuencia de inserción, no la fecha
+    Notification.query.filter_by(title='Segunda').update(
+        {'created_at': first.created_at.replace(year=first.created_at.year - 1)})
+    db.session.commit()
+
+    response, events = _open_stream(app, {'Last-Event-ID': NotificationService.event_id(first)})
+    replayed = _next_event(events)
+    assert replayed['event'] == 'notification'
+    assert replayed['data']['title'] == 'Segunda'
+    assert replayed['id'] == str(first.seq + 1)
+    assert _next_event(events) == {'event': 'unread', 'data': {'unread_count': 2}}
+    response.close()
+
+def test_stream_ignores_unknown_last_event_id(app):
+    NotificationService.create_notification('u1', 'Primera', 'x')
+    response, events = _open_stream(app, {'Last-Event-ID': 'no-es-una-secuencia'})
+    assert _next_event(events) == {'event': 'unread', 'data': {'unread_count': 1}}
+    response.close()
+
+def test_stream_rejects_when_worker_is_full(app):
+    notification_bus.max_connections = 1
+    first, _ = _open_stream(app)
+    second, _ = _open_stream(app)
+    assert second.status_code == 503
+    assert second.headers['Retry-After']
+    first.close()
+
+def test_postgres_backend_delivers_listen_payloads(monkeypatch):
+    from types import SimpleNamespace
+    from utils.notification_bus import PostgresBackend
+    delivered = []
+    backend = PostgresBackend()
+    backend._stop = bus_module.threading.Event()
+
+    class FakeDBAPIConnection:
+        autocommit = False
+        def __init__(self):
+            self.notifies = []
+            self.statements = []
+        def cursor(self):
+            return SimpleNamespace(execute=self.statements.append)
+        def poll(self):
+            self.notifies.append(SimpleNamespace(payload='{"user_id": "u1"}'))
+
+    dbapi_connection = FakeDBAPIConnection()
+    raw = SimpleNamespace(dbapi_connection=dbapi_connection, detach=lambda: None, close=lambda: None)
+    backend._engine = SimpleNamespace(raw_connection=lambda: raw)
+
+    def deliver(payload):
+        delivered.append(payload)
+        backend.stop()
+    backend._deliver = deliver
+    monkeypatch.setattr(bus_module.select, 'select', lambda r, w, x, timeout: (r, [], []))
+    backend._listen()
+    assert dbapi_connection.autocommit is True
+    assert dbapi_connection.statements == ['LISTEN notifications']
+    assert delivered == ['{"user_id": "u1"}']
@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime
+from flask import Flask
+from sqlalchemy.dialects import sqlite
+from database import db
+from models.user import User
+from models.project import Project
+from models.task import Task
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+from utils.pagination import apply_keyset, encode_cursor, decode_cursor, parse_limit, MAX_PAGE_SIZE
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Test', email='test@example.com', password_hash='x'))
+        db.session.add(Project(id='p1', name='Proyecto', created_by='u1'))
+        db.session.add_all([
+            Task(id='t1', title='1', project_id='p1', created_at=datetime(2025, 7, 1, 10, 0, 0)),
+            Task(id='t2', title='2', project_id='p1', created_at=datetime(2025, 7, 1, 10, 0, 0)),
+            Task(id='t3', title='3', project_id='p1', created_at=datetime(2025, 7, 1, 11, 0, 0)),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(datetime(2025, 7, 1, 10, 0, 0), 'task-1')
+    assert decode_cursor(cursor) == (datetime(2025, 7, 1, 10, 0, 0), 'task-1')
+
+def test_cursor_accepts_isoformat_string():
+    cursor = encode_cursor('2025-07-01T10:00:00', 'task-2')
+    assert decode_cursor(cursor) == (datetime(2025, 7, 1, 10, 0, 0), 'task-2')
+
+def test_decode_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor('no-es-un-cursor')
+
+def test_parse_limit():
+    assert parse_limit(None) == 50
+    assert parse_limit('10') == 10
+    assert parse_limit('100000') == MAX_PAGE_SIZE
+    with pytest.raises(ValueError):
+        parse_limit('0')
+    with pytest.raises(ValueError):
+        parse_limit('abc')
+
+def test_encode_cursor_rejects_missing_created_at():
+    with pytest.raises(ValueError):
+        encode_cursor(None, 'task-1')
+
+def test_keyset_pages_in_order_and_skips_null_keys(app):
+    db.session.execute(Task.__table__.insert().values(id='t0', title='sin fecha', project_id='p1', created_at=None))
+    db.session.commit()
+
+    first = apply_keyset(Task.query, Task.created_at, Task.id).limit(2).all()
+    assert [task.id for task in first] == ['t1', 't2']
+    cursor = decode_cursor(encode_cursor(first[-1].created_at, first[-1].id))
+    rest = apply_keyset(Task.query, Task.created_at, Task.id, cursor).all()
+    assert [task.id for task in rest] == ['t3']
+
+def test_keyset_compares_the_raw_column(app):
+    cursor = (datetime(2025, 7, 1, 10, 0, 0), 't1')
+    statement = apply_keyset(Task.query, Task.created_at, Task.id, cursor).statement
+    sql = str(statement.compile(dialect=sqlite.dialect()))
+    assert 'datetime(' not in sql
+    plan = ' '.join(str(row) for row in db.session.execute(db.text(
+        f"EXPLAIN QUERY PLAN {statement.compile(db.engine, compile_kwargs={'literal_binds': True})}"
+    )))
+    assert 'ix_tasks_created_at_id' in plan
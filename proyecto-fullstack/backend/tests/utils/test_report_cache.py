@@ -0,0 +1,115 @@
+import io
+import os
+import time
+import pytest
+from flask import Flask
+from database import db
+from models.user import User
+from models.project import Project
+from models.task import Task
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification
+from utils.report_cache import ReportCache, normalize_params
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['PDF_CACHE_DIR'] = str(tmp_path / 'cache')
+    app.config['PDF_CACHE_MAX_BYTES'] = 25
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id='u1', name='Test', email='test@example.com', password_hash='x'))
+        db.session.add(Project(id='p1', name='Proyecto', created_by='u1'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def cache(app):
+    cache = ReportCache()
+    cache.init_app(app)
+    return cache
+
+def test_normalize_params_drops_empty_values_and_whitespace():
+    assert normalize_params({'status': ' todo ', 'priority': '', 'project_id': None, 'tags': []}) == {'status': 'todo'}
+    assert normalize_params({'filters': {'status': ''}}) == {}
+
+def test_key_is_stable_for_equivalent_filters(cache):
+    first = cache.make_key('tasks', {'filters': {'status': 'todo', 'priority': ''}})
+    second = cache.make_key('tasks', {'filters': {'status': ' todo'}})
+    assert first == second
+    assert first != cache.make_key('tasks', {'filters': {'status': 'done'}})
+    assert first != cache.make_key('general', {'filters': {'status': 'todo'}})
+
+def test_key_changes_when_data_changes(cache):
+    before = cache.make_key('project', {'project_id': 'p1'})
+    db.session.add(Task(id='t1', title='Nueva', project_id='p1'))
+    db.session.commit()
+    after_insert = cache.make_key('project', {'project_id': 'p1'})
+    assert after_insert != before
+
+    db.session.delete(db.session.get(Task, 't1'))
+    db.session.commit()
+    assert cache.make_key('project', {'project_id': 'p1'}) != after_insert
+
+def test_put_and_get(cache):
+    assert cache.get('abc') is None
+    with cache.put('abc', io.BytesIO(b'%PDF-1.4')) as stored:
+        assert stored.read() == b'%PDF-1.4'
+    with cache.get('abc') as cached:
+        assert cached.read() == b'%PDF-1.4'
+    assert not [name for name in os.listdir(cache.directory) if name.endswith('.tmp')]
+
+def test_disabled_cache_never_hits(cache):
+    cache.put('abc', io.BytesIO(b'%PDF-1.4')).close()
+    cache.enabled = False
+    assert cache.get('abc') is None
+
+def test_evicts_least_recently_used_over_budget(cache):
+    cache.put('a', io.BytesIO(b'x' * 10)).close()
+    cache.put('b', io.BytesIO(b'x' * 10)).close()
+    # Marcar 'a' como usado recientemente para que se expulse 'b'
+    past = time.time() - 100
+    os.utime(os.path.join(cache.directory, 'b.pdf'), (past, past))
+    os.utime(os.path.join(cache.directory, 'a.pdf'), (past - 50, past - 50))
+    cache.get('a').close()
+
+    cache.put('c', io.BytesIO(b'x' * 10)).close()
+
+    assert cache.get('b') is None
+    assert os.path.exists(os.path.join(cache.directory, 'a.pdf'))
+    assert os.path.exists(os.path.join(cache.directory, 'c.pdf'))
+
+def test_key_changes_for_writes_within_the_same_second(cache):
+    db.session.add(Task(id='t1', title='Nueva', project_id='p1'))
+    db.session.commit()
+    before = cache.make_key('project', {'project_id': 'p1'})
+
+    # Misma cantidad de filas: solo cambia updated_at, con resolución de microsegundos
+    db.session.get(Task, 't1').title = 'Renombrada'
+    db.session.commit()
+    after_update = cache.make_key('project', {'project_id': 'p1'})
+    assert after_update != before
+
+    Task.query.filter_by(id='t1').update({'status': 'done'})
+    db.session.commit()
+    assert cache.make_key('project', {'project_id': 'p1'}) != after_update
+
+def test_key_ignores_untracked_writes(cache):
+    before = cache.make_key('project', {'project_id': 'p1'})
+    db.session.add(Notification(user_id='u1', title='x', message='x'))
+    db.session.commit()
+    assert cache.make_key('project', {'project_id': 'p1'}) == before
+
+def test_cached_file_survives_eviction_by_another_worker(cache):
+    with cache.put('abc', io.BytesIO(b'%PDF-1.4')):
+        pass
+    cached = cache.get('abc')
+    os.remove(os.path.join(cache.directory, 'abc.pdf'))
+    with cached:
+        assert cached.read() == b'%PDF-1.4'
+    assert cache.get('abc') is None
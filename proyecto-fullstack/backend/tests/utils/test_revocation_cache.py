@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from database import db
+from models.user import User  # noqa: F401
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+from models.revoked_token import RevokedToken
+from utils.revocation_cache import BloomFilter, RevocationCache
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['REVOKED_TOKEN_REFRESH_SECONDS'] = 0
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(RevokedToken(jti='revoked-1', created_at=datetime(2025, 1, 1)))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def db_lookups(monkeypatch):
+    calls = []
+    original = RevokedToken.is_jti_blacklisted.__func__
+
+    def tracked(cls, jti):
+        calls.append(jti)
+        return original(cls, jti)
+    monkeypatch.setattr(RevokedToken, 'is_jti_blacklisted', classmethod(tracked))
+    return calls
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    values = [f'jti-{i}' for i in range(1000)]
+    for value in values:
+        bloom.add(value)
+    assert all(value in bloom for value in values)
+    false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+
+def test_not_revoked_answered_without_database_lookup(app, db_lookups):
+    cache = RevocationCache()
+    cache.init_app(app)
+    assert cache.is_revoked('fresh-token') is False
+    assert db_lookups == []
+
+def test_revoked_token_confirmed_in_database(app, db_lookups):
+    cache = RevocationCache()
+    cache.init_app(app)
+    assert cache.is_revoked('revoked-1') is True
+    assert db_lookups == ['revoked-1']
+
+def test_local_revocation_visible_immediately(app):
+    app.config['REVOKED_TOKEN_REFRESH_SECONDS'] = 3600
+    cache = RevocationCache()
+    cache.init_app(app)
+    cache.is_revoked('warmup')
+    db.session.add(RevokedToken(jti='revoked-2'))
+    db.session.commit()
+    cache.add('revoked-2')
+    assert cache.is_revoked('revoked-2') is True
+
+def test_revocation_from_other_worker_picked_up_by_refresh(app):
+    worker_a = RevocationCache()
+    worker_a.init_app(app)
+    assert worker_a.is_revoked('revoked-3') is False
+
+    # Otro worker revoca el token (solo escribe en la base de datos)
+    db.session.add(RevokedToken(jti='revoked-3', created_at=datetime(2025, 1, 1) + timedelta(seconds=1)))
+    db.session.commit()
+    assert worker_a.is_revoked('revoked-3') is True
+
+def test_late_commit_within_overlap_is_not_missed(app):
+    cache = RevocationCache()
+    cache.init_app(app)
+    cache.is_revoked('warmup')
+    # Confirmado después de la carga pero con created_at anterior a la marca de agua
+    db.session.add(RevokedToken(jti='late', created_at=datetime(2025, 1, 1) - timedelta(seconds=30)))
+    db.session.commit()
+    assert cache.is_revoked('late') is True
+
+def test_disabled_cache_always_queries_database(app, db_lookups):
+    app.config['REVOKED_TOKEN_CACHE_ENABLED'] = False
+    cache = RevocationCache()
+    cache.init_app(app)
+    assert cache.is_revoked('fresh-token') is False
+    assert db_lookups == ['fresh-token']
@@ -0,0 +1,96 @@
+import pytest
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token, decode_token
+from database import db
+from models.user import User
+from models.project import Project  # noqa: F401
+from models.task import Task  # noqa: F401
+from models.comment import Comment  # noqa: F401
+from models.notification import Notification  # noqa: F401
+from services.auth_service import AuthService
+from utils.auth_decorators import require_role
+from utils.user_version_cache import user_version_cache
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+    app.config['USER_VERSION_REFRESH_SECONDS'] = 3600
+    db.init_app(app)
+    jwt = JWTManager(app)
+    jwt.token_in_blocklist_loader(lambda header, payload: user_version_cache.is_stale(payload))
+    user_version_cache.init_app(app)
+
+    @app.route('/admin-only', methods=['POST'])
+    @require_role('admin')
+    def admin_only():
+        return jsonify({'success': True})
+
+    with app.app_context():
+        db.create_all()
+        user = User(id='u1', name='Admin', email='admin@example.com', role='admin')
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def tokens_for(user):
+    claims = AuthService._token_claims(user)
+    return (
+        create_access_token(identity=user.id, additional_claims=claims),
+        create_refresh_token(identity=user.id, additional_claims=claims)
+    )
+
+def test_require_role_uses_claims_without_query(app, monkeypatch):
+    access, _ = tokens_for(User.query.get('u1'))
+    user_version_cache.is_stale(decode_token(access))  # cargar la caché
+
+    class NoQuery:
+        def __getattr__(self, name):
+            raise AssertionError('require_role no debe consultar la tabla users')
+    monkeypatch.setattr(User, 'query', NoQuery())
+    response = app.test_client().post('/admin-only', headers={'Authorization': f'Bearer {access}'})
+    assert response.status_code == 200
+
+def test_role_change_invalidates_access_token(app):
+    access, refresh = tokens_for(User.query.get('u1'))
+    AuthService.update_user_role('u1', 'developer')
+
+    response = app.test_client().post('/admin-only', headers={'Authorization': f'Bearer {access}'})
+    assert response.status_code == 401
+    assert user_version_cache.is_stale(decode_token(refresh)) is False
+
+def test_new_token_after_role_change_reflects_role(app):
+    AuthService.update_user_role('u1', 'developer')
+    access, _ = tokens_for(User.query.get('u1'))
+    response = app.test_client().post('/admin-only', headers={'Authorization': f'Bearer {access}'})
+    assert response.status_code == 403
+
+def test_deactivated_user_tokens_rejected(app):
+    access, refresh = tokens_for(User.query.get('u1'))
+    AuthService.delete_user('u1')
+    assert user_version_cache.is_stale(decode_token(access)) is True
+    assert user_version_cache.is_stale(decode_token(refresh)) is True
+
+def test_change_from_other_worker_seen_after_refresh(app):
+    access, _ = tokens_for(User.query.get('u1'))
+    assert user_version_cache.is_stale(decode_token(access)) is False
+
+    # Otro worker cambia el rol: solo se actualiza la base de datos
+    user = User.query.get('u1')
+    user.role = 'developer'
+    user.role_version = 2
+    db.session.commit()
+    assert user_version_cache.is_stale(decode_token(access)) is False
+
+    user_version_cache.refresh_interval = 0
+    assert user_version_cache.is_stale(decode_token(access)) is True
+
+def test_legacy_token_without_claims_falls_back_to_database(app):
+    legacy = create_access_token(identity='u1')
+    response = app.test_client().post('/admin-only', headers={'Authorization': f'Bearer {legacy}'})
+    assert response.status_code == 200
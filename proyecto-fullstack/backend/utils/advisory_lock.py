@@ -0,0 +1,27 @@
+"""
+Exclusión entre procesos para tareas de mantenimiento periódicas
+Los hilos de purga arrancan en cada worker de Gunicorn; sin un lock compartido varios
+procesos borrarían los mismos lotes a la vez y las métricas contarían filas de más.
+"""
+from contextlib import contextmanager
+from sqlalchemy import text
+from database import db
+
+
+@contextmanager
+def exclusive_pass(key):
+    """
+    Indicar si esta pasada puede ejecutarse (True) o ya hay otra en curso (False)
+    PostgreSQL: pg_try_advisory_lock(key) en una conexión propia mientras dura la pasada.
+    SQLite serializa las escrituras y se usa en un solo proceso, así que no se bloquea.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        yield True
+        return
+    with db.engine.connect() as connection:
+        acquired = connection.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': key}).scalar()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': key})
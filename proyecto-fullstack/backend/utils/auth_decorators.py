@@ -2,10 +2,11 @@
 Decoradores y middlewares para autenticación y autorización
 """
 from functools import wraps
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from flask import jsonify
 from models.user import User
-from models.revoked_token import RevokedToken
+from utils.revocation_cache import revocation_cache
+from utils.user_version_cache import user_version_cache
 
 def require_role(*allowed_roles):
     """Decorador para validar roles de usuario"""
@@ -13,10 +14,17 @@ def require_role(*allowed_roles):
         @wraps(f)
         @jwt_required()
         def decorated_function(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            user = User.query.get(current_user_id)
+            claims = get_jwt()
             
-            if not user or user.role not in allowed_roles:
+            if 'role' in claims:
+                # El rol viaja en el token; los tokens desactualizados ya fueron rechazados
+                role, is_active = claims['role'], claims.get('is_active', True)
+            else:
+                # Tokens emitidos antes de incluir el rol como claim
+                user = User.query.get(get_jwt_identity())
+                role, is_active = (user.role, True) if user else (None, False)
+            
+            if not is_active or role not in allowed_roles:
                 return jsonify({'success': False, 'message': 'Acceso denegado'}), 403
             
             return f(*args, **kwargs)
@@ -24,6 +32,11 @@ def require_role(*allowed_roles):
     return decorator
 
 def check_if_token_revoked(jwt_header, jwt_payload):
-    """Verificar si un token está en la blacklist"""
+    """
+    Verificar si un token está en la blacklist (caché en proceso + confirmación en BD)
+    También se rechazan los tokens emitidos antes de un cambio de rol o una desactivación
+    """
+    if user_version_cache.is_stale(jwt_payload):
+        return True
     jti = jwt_payload['jti']
-    return RevokedToken.is_jti_blacklisted(jti)
+    return revocation_cache.is_revoked(jti)
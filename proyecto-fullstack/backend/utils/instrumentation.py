@@ -0,0 +1,125 @@
+"""
+Instrumentación por petición: número de consultas SQL, tiempo de base de datos,
+tiempo de serialización JSON y tiempo total
+Se publica en la cabecera Server-Timing y en un log estructurado (JSON) por petición
+"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('nutrabiotics.requests')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Marcar el inicio de la consulta en la conexión"""
+    if has_request_context():
+        conn.info['query_start_time'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Acumular la consulta en los contadores de la petición actual"""
+    if not has_request_context():
+        return
+    start = conn.info.pop('query_start_time', None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    g.sql_queries = g.get('sql_queries', 0) + 1
+    g.sql_time = g.get('sql_time', 0.0) + elapsed
+
+
+@contextmanager
+def timed(name):
+    """
+    Medir un bloque de código y agregarlo como segmento de Server-Timing
+    Uso: with timed('pdf'): ...
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context():
+            timings = g.setdefault('timings', {})
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+class InstrumentedJSONProvider(DefaultJSONProvider):
+    """Proveedor JSON que mide el tiempo de serialización de las respuestas"""
+
+    def dumps(self, obj, **kwargs):
+        with timed('serialize'):
+            return super().dumps(obj, **kwargs)
+
+
+def _start_request():
+    g.request_start_time = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_time = 0.0
+    g.timings = {}
+
+
+def _record_request(response):
+    """Agregar Server-Timing, registrar el log estructurado y validar el presupuesto de consultas"""
+    start = g.get('request_start_time')
+    if start is None:
+        return response
+
+    total_ms = (time.perf_counter() - start) * 1000
+    queries = g.get('sql_queries', 0)
+    db_ms = g.get('sql_time', 0.0) * 1000
+    timings = {name: seconds * 1000 for name, seconds in g.get('timings', {}).items()}
+    budget = current_app.config.get('SQL_QUERY_BUDGET') or 0
+    over_budget = bool(budget) and queries > budget
+
+    if current_app.config.get('SERVER_TIMING_ENABLED', True):
+        segments = [f'db;dur={db_ms:.2f};desc="{queries} queries"']
+        segments += [f'{name};dur={ms:.2f}' for name, ms in timings.items()]
+        segments.append(f'total;dur={total_ms:.2f}')
+        response.headers['Server-Timing'] = ', '.join(segments)
+        if over_budget:
+            response.headers['X-Query-Budget-Exceeded'] = f'{queries}/{budget}'
+
+    record = {
+        'event': 'request',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'queries': queries,
+        'db_ms': round(db_ms, 2),
+        'serialize_ms': round(timings.get('serialize', 0.0), 2),
+        'total_ms': round(total_ms, 2)
+    }
+    if over_budget:
+        record['query_budget'] = budget
+        logger.warning(json.dumps(record))
+    else:
+        logger.info(json.dumps(record))
+
+    return response
+
+
+def init_instrumentation(app):
+    """Registrar los eventos de SQLAlchemy y los hooks de Flask"""
+    if not app.config.get('INSTRUMENTATION_ENABLED', True):
+        return
+
+    # Los eventos se registran una sola vez a nivel de clase para todos los engines
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(app.config.get('REQUEST_LOG_LEVEL', 'INFO'))
+
+    app.json = InstrumentedJSONProvider(app)
+    app.before_request(_start_request)
+    app.after_request(_record_request)
@@ -0,0 +1,158 @@
+"""
+Métricas operativas en formato Prometheus (GET /metrics)
+Latencia por blueprint/endpoint, peticiones en curso, pool de conexiones,
+generación de PDFs y notificaciones creadas.
+
+Con varios workers (Gunicorn) se usa el modo multiproceso de prometheus_client:
+cada proceso escribe sus valores en PROMETHEUS_MULTIPROC_DIR y /metrics los agrega.
+"""
+import os
+import time
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool, QueuePool
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latencia de las peticiones HTTP',
+    ['blueprint', 'endpoint', 'method']
+)
+REQUESTS_TOTAL = Counter(
+    'http_requests_total', 'Peticiones HTTP atendidas',
+    ['blueprint', 'endpoint', 'method', 'status']
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Peticiones HTTP en curso',
+    multiprocess_mode='livesum'
+)
+DB_POOL_CHECKOUTS = Counter(
+    'db_pool_checkouts_total', 'Conexiones obtenidas del pool'
+)
+DB_POOL_IN_USE = Gauge(
+    'db_pool_connections_in_use', 'Conexiones del pool en uso',
+    multiprocess_mode='livesum'
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', 'Tiempo de espera para obtener una conexión del pool',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+DB_POOL_TIMEOUTS = Counter(
+    'db_pool_timeouts_total', 'Esperas de conexión que agotaron el timeout del pool'
+)
+PDF_GENERATION = Histogram(
+    'pdf_generation_seconds', 'Duración de la generación de reportes PDF',
+    ['report'], buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+NOTIFICATIONS_CREATED = Counter(
+    'notifications_created_total', 'Notificaciones creadas (fan-out)',
+    ['category']
+)
+SSE_CONNECTIONS = Gauge(
+    'sse_connections', 'Streams SSE de notificaciones abiertos',
+    multiprocess_mode='livesum'
+)
+SSE_REJECTED = Counter(
+    'sse_connections_rejected_total', 'Streams SSE rechazados por el límite de conexiones'
+)
+NOTIFICATIONS_RETIRED = Counter(
+    'notifications_retired_total', 'Notificaciones leídas archivadas o eliminadas por antigüedad',
+    ['mode']
+)
+TOKEN_TABLE_ROWS = Gauge(
+    'token_table_rows', 'Filas en las tablas de tokens (medido en cada purga)',
+    ['table'], multiprocess_mode='liveall'
+)
+TOKENS_PURGED = Counter(
+    'tokens_purged_total', 'Tokens expirados eliminados',
+    ['table']
+)
+REVOCATION_CACHE_LOOKUPS = Counter(
+    'revocation_cache_lookups_total', 'Consultas a la caché de tokens revocados',
+    ['result']
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mide cuánto se espera para obtener una conexión"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKOUTS.inc()
+    DB_POOL_IN_USE.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_IN_USE.dec()
+
+
+def _start_request():
+    g.metrics_start_time = time.perf_counter()
+    REQUESTS_IN_PROGRESS.inc()
+
+
+def _record_request(response):
+    start = g.get('metrics_start_time')
+    if start is None:
+        return response
+    # Las rutas inexistentes se agrupan para no crear una serie por URL
+    endpoint = request.endpoint or 'not_found'
+    blueprint = request.blueprint or 'app'
+    REQUEST_LATENCY.labels(blueprint, endpoint, request.method).observe(time.perf_counter() - start)
+    REQUESTS_TOTAL.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+    return response
+
+
+def _finish_request(error=None):
+    if g.pop('metrics_start_time', None) is not None:
+        REQUESTS_IN_PROGRESS.dec()
+
+
+def metrics_view():
+    """Exponer las métricas en formato de texto de Prometheus"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def configure_engine_metrics(app):
+    """
+    Usar el pool instrumentado para bases con QueuePool (PostgreSQL)
+    Debe llamarse antes de db.init_app(app)
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    if app.config.get('SQLALCHEMY_DATABASE_URI', '').startswith('sqlite'):
+        return
+    engine_options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    engine_options.setdefault('poolclass', InstrumentedQueuePool)
+
+
+def init_metrics(app):
+    """Registrar los hooks de métricas y la ruta /metrics"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    if not event.contains(Pool, 'checkout', _on_checkout):
+        event.listen(Pool, 'checkout', _on_checkout)
+        event.listen(Pool, 'checkin', _on_checkin)
+
+    app.before_request(_start_request)
+    app.after_request(_record_request)
+    app.teardown_request(_finish_request)
+    app.add_url_rule('/metrics', 'prometheus_metrics', metrics_view, methods=['GET'])
@@ -0,0 +1,285 @@
+"""
+Pub/sub de notificaciones para el stream SSE (GET /api/notifications/stream)
+Cada worker mantiene en memoria los suscriptores conectados a él (una cola por stream).
+Los eventos se publican a través de un backend intercambiable:
+
+    memory    entrega directa dentro del proceso (desarrollo, tests, un solo worker)
+    postgres  NOTIFY/LISTEN de PostgreSQL: cada worker escucha el canal con una conexión
+              dedicada, así un evento publicado en un worker llega a los streams de todos
+
+Un backend es cualquier clase con start(deliver), publish(message) y stop() (y opcionalmente
+publish_many(messages) para envíos masivos); se registra en BACKENDS y se elige con
+NOTIFICATION_BUS_BACKEND.
+"""
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+from collections import defaultdict
+from sqlalchemy import text
+from database import db
+from utils.metrics import SSE_CONNECTIONS, SSE_REJECTED
+
+logger = logging.getLogger(__name__)
+
+# Eventos pendientes por stream; si un cliente lento la llena se cierra su stream
+QUEUE_SIZE = 100
+RETRY_MILLISECONDS = 3000
+
+
+def format_event(event, data, event_id=None):
+    """Serializar un evento en formato text/event-stream"""
+    lines = [f'id: {event_id}'] if event_id else []
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class MemoryBackend:
+    """Entrega directa a los suscriptores del mismo proceso"""
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, message):
+        self._deliver(message)
+
+    def publish_many(self, messages):
+        for message in messages:
+            self._deliver(message)
+
+    def stop(self):
+        pass
+
+
+class PostgresBackend:
+    """NOTIFY/LISTEN de PostgreSQL (payload máximo de 8000 bytes)"""
+
+    CHANNEL = 'notifications'
+    MAX_PAYLOAD_BYTES = 7900
+
+    def start(self, deliver):
+        self._deliver = deliver
+        self._engine = db.engine
+        self._stop = threading.Event()
+        threading.Thread(target=self._listen, name='notification-bus', daemon=True).start()
+
+    def publish(self, message):
+        self.publish_many([message])
+
+    def publish_many(self, messages):
+        # Un solo executemany y una sola transacción; PostgreSQL entrega los NOTIFY al confirmar
+        with self._engine.connect() as connection:
+            connection.execute(text('SELECT pg_notify(:channel, :payload)'),
+                               [{'channel': self.CHANNEL, 'payload': message} for message in messages])
+            connection.commit()
+
+    def stop(self):
+        self._stop.set()
+
+    def _listen(self):
+        backoff = 1
+        while not self._stop.is_set():
+            connection = None
+            try:
+                # Conexión fuera del pool: queda ocupada mientras el worker viva
+                connection = self._engine.raw_connection()
+                connection.detach()
+                dbapi_connection = connection.dbapi_connection
+                dbapi_connection.autocommit = True
+                dbapi_connection.cursor().execute(f'LISTEN {self.CHANNEL}')
+                backoff = 1
+                while not self._stop.is_set():
+                    if select.select([dbapi_connection], [], [], 5) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        self._deliver(dbapi_connection.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning(f"Bus de notificaciones: conexión LISTEN perdida ({e}); reintento en {backoff}s")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'postgres': PostgresBackend
+}
+
+
+class Subscription:
+    """Stream abierto de un usuario"""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.closed = False
+
+    def put(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            # Cliente lento: se cierra el stream y al reconectarse recupera lo pendiente con Last-Event-ID
+            self.closed = True
+
+
+class NotificationBus:
+    """Suscriptores SSE del worker y publicación de eventos por usuario"""
+
+    def __init__(self):
+        self.backend_name = 'memory'
+        self.heartbeat = 15
+        self.max_connections = 100
+        self.max_stream_seconds = 300
+        self._lock = threading.Lock()
+        self._backend = None
+        self.reset()
+
+    def init_app(self, app):
+        """Leer la configuración de la aplicación"""
+        self.backend_name = app.config.get('NOTIFICATION_BUS_BACKEND', self.backend_name)
+        if self.backend_name not in BACKENDS:
+            raise ValueError(f"NOTIFICATION_BUS_BACKEND inválido: {self.backend_name}")
+        self.heartbeat = app.config.get('SSE_HEARTBEAT_SECONDS', self.heartbeat)
+        self.max_stream_seconds = app.config.get('SSE_MAX_STREAM_SECONDS', self.max_stream_seconds)
+        # Con gunicorn gthread cada stream ocupa un hilo: por defecto se deja la mitad libre
+        threads = app.config.get('WSGI_THREADS')
+        self.max_connections = app.config.get('SSE_MAX_CONNECTIONS') or (max(1, threads // 2) if threads else 100)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            if self._backend is not None:
+                self._backend.stop()
+            self._backend = None
+            self._pid = None
+            self._subscribers = defaultdict(set)
+            self._connections = 0
+
+    def _ensure_backend(self):
+        # Tras el fork de gunicorn cada worker arranca su propio backend (y su hilo LISTEN)
+        if self._pid == os.getpid():
+            return self._backend
+        with self._lock:
+            if self._pid != os.getpid():
+                self._subscribers = defaultdict(set)
+                self._connections = 0
+                backend = BACKENDS[self.backend_name]()
+                backend.start(self._deliver)
+                self._backend = backend
+                self._pid = os.getpid()
+        return self._backend
+
+    @property
+    def connections(self):
+        return self._connections
+
+    def subscribe(self, user_id):
+        """Registrar un stream; devuelve None si el worker alcanzó el límite de conexiones"""
+        self._ensure_backend()
+        with self._lock:
+            if self._connections >= self.max_connections:
+                SSE_REJECTED.inc()
+                return None
+            subscription = Subscription(user_id)
+            self._subscribers[user_id].add(subscription)
+            self._connections += 1
+        SSE_CONNECTIONS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Quitar un stream (idempotente)"""
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if not subscriptions or subscription not in subscriptions:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.user_id]
+            self._connections -= 1
+        SSE_CONNECTIONS.dec()
+
+    def _serialize(self, user_id, event, data, event_id, limit):
+        message = json.dumps({'user_id': user_id, 'event': event, 'data': data, 'id': event_id})
+        if limit and len(message.encode('utf-8')) > limit and isinstance(data.get('message'), str):
+            # Se recorta el texto; el cliente puede leer la notificación completa del listado
+            excess = len(message.encode('utf-8')) - limit
+            data = dict(data, message=data['message'][:max(0, len(data['message']) - excess - 3)] + '…',
+                        truncated=True)
+            message = json.dumps({'user_id': user_id, 'event': event, 'data': data, 'id': event_id})
+        return message
+
+    def publish(self, user_id, event, data, event_id=None):
+        """
+        Publicar un evento para los streams del usuario en todos los workers
+        Los errores se registran y no se propagan: la notificación ya está guardada y el
+        cliente la recupera al reconectarse
+        """
+        self.publish_many([(user_id, event, data, event_id)])
+
+    def publish_many(self, events):
+        """Publicar varios eventos (user_id, event, data, event_id) en un solo envío al backend"""
+        events = list(events)
+        try:
+            backend = self._ensure_backend()
+            limit = getattr(backend, 'MAX_PAYLOAD_BYTES', None)
+            messages = [self._serialize(user_id, event, data, event_id, limit)
+                        for user_id, event, data, event_id in events]
+            if not messages:
+                return
+            if hasattr(backend, 'publish_many'):
+                backend.publish_many(messages)
+            else:
+                for message in messages:
+                    backend.publish(message)
+        except Exception as e:
+            logger.warning(f"No se pudieron publicar {len(events)} eventos de notificaciones: {e}")
+
+    def _deliver(self, message):
+        envelope = json.loads(message)
+        with self._lock:
+            subscriptions = list(self._subscribers.get(envelope['user_id'], ()))
+        if not subscriptions:
+            return
+        formatted = format_event(envelope['event'], envelope['data'], envelope.get('id'))
+        for subscription in subscriptions:
+            subscription.put((envelope.get('id'), formatted))
+
+    def stream(self, subscription, initial_events=(), replayed_ids=()):
+        """
+        Generador text/event-stream: eventos iniciales, luego eventos en vivo con heartbeat
+        Termina al cerrarse la suscripción o al superar SSE_MAX_STREAM_SECONDS
+        replayed_ids: ids ya enviados en la reanudación (se descartan si llegan en vivo)
+        """
+        replayed_ids = set(replayed_ids)
+        deadline = time.monotonic() + self.max_stream_seconds
+        try:
+            yield f'retry: {RETRY_MILLISECONDS}\n\n'
+            for event in initial_events:
+                yield event
+            while not subscription.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event_id, event = subscription.queue.get(timeout=min(self.heartbeat, remaining))
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+                    continue
+                if event_id and event_id in replayed_ids:
+                    continue
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+
+notification_bus = NotificationBus()
@@ -0,0 +1,70 @@
+"""
+Utilidades de paginación por cursor (keyset) sobre (created_at, id)
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at, record_id):
+    """Codificar la posición (created_at, id) en un cursor opaco"""
+    if created_at is None:
+        # apply_keyset excluye esas filas; un cursor así no podría decodificarse
+        raise ValueError('No se puede paginar desde un registro sin created_at')
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    payload = json.dumps([created_at, record_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decodificar un cursor opaco; lanza ValueError si no es válido"""
+    try:
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), str(record_id)
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError('Cursor inválido')
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Normalizar el tamaño de página solicitado; lanza ValueError si no es válido"""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('Límite inválido')
+    if limit < 1:
+        raise ValueError('El límite debe ser mayor que cero')
+    return min(limit, maximum)
+
+
+def apply_keyset(query, created_at_column, id_column, cursor=None, descending=False):
+    """
+    Ordenar por (created_at, id) y continuar después del cursor dado
+    Se compara la columna sin transformar para usar el índice (created_at, id); las filas
+    sin created_at no tienen posición en el orden y se excluyen de forma explícita
+    """
+    query = query.filter(created_at_column.isnot(None))
+
+    if cursor:
+        created_at, record_id = cursor
+        if descending:
+            query = query.filter(or_(
+                created_at_column < created_at,
+                and_(created_at_column == created_at, id_column < record_id)
+            ))
+        else:
+            query = query.filter(or_(
+                created_at_column > created_at,
+                and_(created_at_column == created_at, id_column > record_id)
+            ))
+
+    if descending:
+        return query.order_by(created_at_column.desc(), id_column.desc())
+    return query.order_by(created_at_column.asc(), id_column.asc())
@@ -0,0 +1,118 @@
+"""
+Tabla PDF por streaming para reportes con muchas filas
+Una sola Table de ReportLab con todas las filas tiene un layout súper-lineal y mantiene
+todas las celdas en memoria. StreamedTable consume las filas de un iterador (por ejemplo
+una consulta con yield_per) y, cada vez que ReportLab le pide dividirse, genera solo el
+trozo que cabe en el espacio disponible de la página, con el encabezado repetido.
+
+Los anchos de columna y los altos de fila son fijos, por lo que no se mide el contenido:
+los textos que no caben en su columna se recortan con "…".
+Solo se importa desde services.pdf_service (carga ReportLab).
+"""
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Table, TableStyle
+from reportlab.platypus.flowables import Flowable
+
+HEADER_FONT = 'Helvetica-Bold'
+BODY_FONT = 'Helvetica'
+HEADER_FONT_SIZE = 9
+BODY_FONT_SIZE = 8
+HEADER_HEIGHT = 18
+ROW_HEIGHT = 14
+CELL_PADDING = 6
+
+CHUNK_STYLE = TableStyle([
+    # Encabezados
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), HEADER_FONT),
+    ('FONTSIZE', (0, 0), (-1, 0), HEADER_FONT_SIZE),
+
+    # Contenido
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), BODY_FONT),
+    ('FONTSIZE', (0, 1), (-1, -1), BODY_FONT_SIZE),
+
+    # Bordes
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 0), (-1, -1), 1),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+])
+
+
+def fit_text(value, width, font_name=BODY_FONT, font_size=BODY_FONT_SIZE):
+    """Recortar el texto para que quepa en el ancho de la columna"""
+    text = '' if value is None else str(value)
+    available = width - CELL_PADDING * 2
+    if stringWidth(text, font_name, font_size) <= available:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if stringWidth(text[:middle] + '…', font_name, font_size) <= available:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + '…'
+
+
+class StreamedTable(Flowable):
+    """Flowable que reparte las filas de un iterador en tablas del tamaño de la página"""
+
+    def __init__(self, rows, total_rows, headers, col_widths, progress_callback=None):
+        super().__init__()
+        self.rows = iter(rows)
+        self.remaining = total_rows
+        self.total_rows = total_rows
+        self.headers = [fit_text(header, width, HEADER_FONT, HEADER_FONT_SIZE)
+                        for header, width in zip(headers, col_widths)]
+        self.col_widths = list(col_widths)
+        self.progress_callback = progress_callback
+
+    def _rows_that_fit(self, available_height):
+        return max(0, int((available_height - HEADER_HEIGHT) // ROW_HEIGHT))
+
+    def _next_chunk(self, count):
+        """Construir la tabla con las siguientes `count` filas del iterador"""
+        data = [self.headers]
+        for row in self.rows:
+            data.append([fit_text(value, width) for value, width in zip(row, self.col_widths)])
+            if len(data) > count:
+                break
+        fetched = len(data) - 1
+        # Si el conteo inicial quedó desfasado, el iterador manda
+        self.remaining = self.remaining - fetched if fetched == count else 0
+        if self.progress_callback and self.total_rows:
+            done = self.total_rows - self.remaining
+            self.progress_callback(min(99, int(done * 100 / self.total_rows)))
+        table = Table(data, colWidths=self.col_widths,
+                      rowHeights=[HEADER_HEIGHT] + [ROW_HEIGHT] * fetched, repeatRows=1)
+        table.setStyle(CHUNK_STYLE)
+        return table
+
+    def wrap(self, available_width, available_height):
+        self.width = sum(self.col_widths)
+        self.height = HEADER_HEIGHT + ROW_HEIGHT * self.remaining
+        return self.width, self.height
+
+    def split(self, available_width, available_height):
+        count = self._rows_that_fit(available_height)
+        if count <= 0:
+            # No cabe ni una fila: ReportLab pasa a la página siguiente
+            return []
+        chunk = self._next_chunk(count)
+        if self.remaining <= 0:
+            return [chunk]
+        # El resto continúa en la página siguiente como un flowable nuevo
+        self.__dict__.pop('_postponed', None)
+        return [chunk, self]
+
+    def draw(self):
+        # Las filas restantes caben en el espacio actual
+        chunk = self._next_chunk(self.remaining)
+        _, chunk_height = chunk.wrap(self.width, self.height)
+        chunk.drawOn(self.canv, 0, self.height - chunk_height)
@@ -0,0 +1,148 @@
+"""
+Caché en disco de reportes PDF direccionada por contenido
+La clave es un hash del tipo de reporte, los filtros normalizados y una huella de los
+datos (max(updated_at) de tareas, proyectos y usuarios, el total de tareas de project_stats
+y el número de proyectos y usuarios): si nada cambió se sirve el mismo archivo y la clave
+se usa como ETag.
+
+Los archivos se comparten entre workers; el orden LRU se lleva con la fecha de
+modificación de cada archivo (se actualiza en cada acierto) y se expulsan los menos
+usados cuando el directorio supera PDF_CACHE_MAX_BYTES.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from sqlalchemy import func, select
+from database import db
+from models.user import User
+from models.project import Project
+from models.project_stats import ProjectStats
+from models.task import Task
+
+
+def normalize_params(params):
+    """Quitar valores vacíos y espacios para que filtros equivalentes den la misma clave"""
+    if isinstance(params, dict):
+        normalized = {}
+        for key, value in params.items():
+            value = normalize_params(value)
+            if value not in (None, '', [], {}):
+                normalized[str(key)] = value
+        return normalized
+    if isinstance(params, (list, tuple)):
+        return [normalize_params(value) for value in params]
+    if isinstance(params, str):
+        return params.strip()
+    return params
+
+
+def data_fingerprint():
+    """
+    Huella de los datos que alimentan los reportes (una sola consulta)
+    max(updated_at) sale de los índices ix_*_updated_at; las tareas se cuentan con
+    project_stats en lugar de recorrer la tabla y proyectos y usuarios son tablas pequeñas
+    """
+    row = db.session.execute(select(
+        select(func.max(Task.updated_at)).scalar_subquery(),
+        select(func.coalesce(func.sum(ProjectStats.total_tasks), 0)).scalar_subquery(),
+        select(func.max(Project.updated_at)).scalar_subquery(),
+        select(func.count(Project.id)).scalar_subquery(),
+        select(func.max(User.updated_at)).scalar_subquery(),
+        select(func.count(User.id)).scalar_subquery()
+    )).one()
+    return [value.isoformat() if hasattr(value, 'isoformat') else value for value in row]
+
+
+class ReportCache:
+    """Caché LRU de PDFs generados con presupuesto de tamaño en disco"""
+
+    def __init__(self):
+        self.enabled = True
+        self.directory = os.path.join(tempfile.gettempdir(), 'nutrabiotics_pdf_cache')
+        self.max_bytes = 256 * 1024 * 1024
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Leer la configuración de la aplicación"""
+        self.enabled = app.config.get('PDF_CACHE_ENABLED', True)
+        self.directory = app.config.get('PDF_CACHE_DIR') or self.directory
+        self.max_bytes = app.config.get('PDF_CACHE_MAX_BYTES', self.max_bytes)
+
+    def make_key(self, report_type, params=None):
+        """Clave (y ETag) del reporte para el estado actual de los datos"""
+        payload = json.dumps({
+            'report': report_type,
+            'params': normalize_params(params or {}),
+            'data': data_fingerprint()
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pdf')
+
+    def get(self, key):
+        """
+        PDF en caché abierto en modo binario o None; un acierto lo marca como usado recientemente
+        Se devuelve el archivo abierto porque otro worker puede expulsarlo en cualquier momento
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            os.utime(path)
+            return open(path, 'rb')
+        except OSError:
+            return None
+
+    def put(self, key, pdf_file):
+        """Copiar el PDF (objeto de archivo binario) a la caché y devolver la copia abierta"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # Escritura atómica: otro worker nunca ve un archivo a medio escribir
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                shutil.copyfileobj(pdf_file, f)
+            os.replace(temp_path, path)
+            # Abrir antes de expulsar: el archivo sigue legible aunque se elimine
+            cached = open(path, 'rb')
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+        return cached
+
+    def evict(self):
+        """Expulsar los archivos menos usados hasta quedar dentro del presupuesto"""
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith('.pdf'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+            return evicted
+
+
+report_cache = ReportCache()
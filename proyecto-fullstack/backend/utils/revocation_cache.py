@@ -0,0 +1,134 @@
+"""
+Caché en proceso de tokens revocados
+Un filtro de Bloom responde el caso común ("no revocado") sin consultar la base de datos;
+solo los posibles positivos se confirman con RevokedToken.is_jti_blacklisted.
+
+El filtro se carga completo la primera vez y luego se actualiza de forma incremental
+con las revocaciones cuyo created_at supera la marca de agua, de modo que las
+revocaciones hechas en otros workers se ven como máximo REVOKED_TOKEN_REFRESH_SECONDS después.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+from database import db
+from models.revoked_token import RevokedToken
+from utils.metrics import REVOCATION_CACHE_LOOKUPS
+
+
+class BloomFilter:
+    """Filtro de Bloom de tamaño fijo (sin falsos negativos)"""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(1, int(capacity))
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationCache:
+    """Caché de JTIs revocados compartida por los hilos de un worker"""
+
+    def __init__(self):
+        self.enabled = True
+        self.capacity = 100000
+        self.error_rate = 0.001
+        self.refresh_interval = 5
+        self.full_reload_interval = 3600
+        # Margen para revocaciones confirmadas tarde con un created_at anterior a la marca de agua
+        self.overlap = timedelta(seconds=60)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def init_app(self, app):
+        """Leer la configuración de la aplicación"""
+        self.enabled = app.config.get('REVOKED_TOKEN_CACHE_ENABLED', True)
+        self.capacity = app.config.get('REVOKED_TOKEN_CACHE_CAPACITY', self.capacity)
+        self.error_rate = app.config.get('REVOKED_TOKEN_CACHE_ERROR_RATE', self.error_rate)
+        self.refresh_interval = app.config.get('REVOKED_TOKEN_REFRESH_SECONDS', self.refresh_interval)
+        self.full_reload_interval = app.config.get('REVOKED_TOKEN_FULL_RELOAD_SECONDS', self.full_reload_interval)
+        self.reset()
+
+    def reset(self):
+        """Descartar el estado; la próxima consulta recarga desde la base de datos"""
+        with self._lock:
+            self._bloom = None
+            self._watermark = None
+            self._last_refresh = 0.0
+            self._last_full_load = 0.0
+
+    def _full_load(self):
+        rows = db.session.query(RevokedToken.jti, RevokedToken.created_at).all()
+        # Capacidad con holgura para las revocaciones futuras; se reconstruye al llenarse
+        bloom = BloomFilter(max(self.capacity, len(rows) * 2), self.error_rate)
+        watermark = None
+        for jti, created_at in rows:
+            bloom.add(jti)
+            if created_at and (watermark is None or created_at > watermark):
+                watermark = created_at
+        now = time.monotonic()
+        self._bloom, self._watermark = bloom, watermark
+        self._last_refresh = self._last_full_load = now
+
+    def _incremental_load(self):
+        query = db.session.query(RevokedToken.jti, RevokedToken.created_at)
+        if self._watermark is not None:
+            query = query.filter(RevokedToken.created_at >= self._watermark - self.overlap)
+        for jti, created_at in query.all():
+            if jti not in self._bloom:
+                self._bloom.add(jti)
+            if created_at and (self._watermark is None or created_at > self._watermark):
+                self._watermark = created_at
+        self._last_refresh = time.monotonic()
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._bloom is not None and now - self._last_refresh < self.refresh_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if (self._bloom is None
+                    or self._bloom.count >= self._bloom.capacity
+                    or now - self._last_full_load >= self.full_reload_interval):
+                self._full_load()
+            elif now - self._last_refresh >= self.refresh_interval:
+                self._incremental_load()
+
+    def add(self, jti):
+        """Registrar una revocación hecha en este proceso (visible de inmediato)"""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def is_revoked(self, jti):
+        """Verificar si un JTI está revocado"""
+        if not self.enabled:
+            return RevokedToken.is_jti_blacklisted(jti)
+
+        self._ensure_fresh()
+        if jti not in self._bloom:
+            REVOCATION_CACHE_LOOKUPS.labels(result='miss').inc()
+            return False
+
+        REVOCATION_CACHE_LOOKUPS.labels(result='database').inc()
+        return RevokedToken.is_jti_blacklisted(jti)
+
+
+revocation_cache = RevocationCache()
@@ -0,0 +1,40 @@
+"""
+Respuestas por streaming
+Envían archivos temporales o generadores por bloques sin cargarlos completos en memoria.
+"""
+import os
+from flask import current_app, stream_with_context
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _attachment(response, download_name):
+    response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    return response
+
+
+def stream_file(fileobj, download_name, mimetype):
+    """
+    Enviar un archivo abierto (BytesIO, SpooledTemporaryFile...) por bloques
+    El archivo se cierra al terminar la respuesta, también si el cliente se desconecta.
+    """
+    size = fileobj.seek(0, os.SEEK_END)
+    fileobj.seek(0)
+
+    def generate():
+        while True:
+            chunk = fileobj.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    response = current_app.response_class(generate(), mimetype=mimetype, direct_passthrough=True)
+    response.call_on_close(fileobj.close)
+    response.content_length = size
+    return _attachment(response, download_name)
+
+
+def stream_generator(chunks, download_name, mimetype):
+    """Enviar el contenido producido por un generador (mantiene el contexto de la petición)"""
+    response = current_app.response_class(stream_with_context(chunks), mimetype=mimetype)
+    return _attachment(response, download_name)
@@ -0,0 +1,52 @@
+"""
+Acciones posteriores al commit de la sesión de SQLAlchemy
+Un servicio puede escribir varias filas en la misma transacción (por ejemplo una tarea y
+la notificación de su asignado) y dejar para después del commit lo que no debe ocurrir si
+la transacción se revierte: publicar eventos SSE, incrementar métricas...
+Las acciones se ejecutan tras el commit más externo y se descartan si la transacción
+termina de otra forma (rollback o cierre de la sesión).
+"""
+import logging
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from database import db
+
+logger = logging.getLogger(__name__)
+
+_CALLBACKS_KEY = 'after_commit_callbacks'
+
+
+def after_commit(callback, *args, **kwargs):
+    """
+    Ejecutar callback(*args, **kwargs) cuando se confirme la transacción actual
+    El callback no puede usar la sesión (ya no hay transacción activa): los datos que
+    necesite deben calcularse antes y pasarse como argumentos
+    """
+    db.session.info.setdefault(_CALLBACKS_KEY, []).append((callback, args, kwargs))
+
+
+def pending_callbacks(session=None):
+    """Número de acciones en espera del próximo commit"""
+    session = session or db.session
+    return len(session.info.get(_CALLBACKS_KEY, ()))
+
+
+def _run_callbacks(session):
+    for callback, args, kwargs in session.info.pop(_CALLBACKS_KEY, ()):
+        try:
+            callback(*args, **kwargs)
+        except Exception:
+            # Los datos ya están confirmados: un fallo aquí no debe propagarse al request
+            logger.exception("Error en acción posterior al commit (%s)", getattr(callback, '__qualname__', callback))
+
+
+def _discard_callbacks(session, transaction):
+    # Solo la transacción más externa; un savepoint no descarta lo registrado antes
+    if transaction.parent is None:
+        session.info.pop(_CALLBACKS_KEY, None)
+
+
+# Se registran una sola vez a nivel de clase para todas las sesiones
+if not event.contains(Session, 'after_commit', _run_callbacks):
+    event.listen(Session, 'after_commit', _run_callbacks)
+    event.listen(Session, 'after_transaction_end', _discard_callbacks)
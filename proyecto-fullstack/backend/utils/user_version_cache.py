@@ -0,0 +1,93 @@
+"""
+Caché en proceso de versiones de rol de usuario
+Los tokens llevan el rol, is_active y role_version como claims; esta caché permite
+rechazar tokens emitidos antes de un cambio de rol o de una desactivación sin
+consultar la tabla users en cada petición.
+
+Solo se guardan los usuarios con role_version > 1 o inactivos (el resto es válido por
+defecto) y se refresca de forma incremental por updated_at, igual que la caché de
+tokens revocados.
+"""
+import threading
+import time
+from datetime import timedelta
+from sqlalchemy import or_
+from database import db
+from models.user import User
+
+
+class UserVersionCache:
+    """Versión de rol vigente y estado de los usuarios modificados"""
+
+    def __init__(self):
+        self.enabled = True
+        self.refresh_interval = 5
+        self.overlap = timedelta(seconds=60)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def init_app(self, app):
+        """Leer la configuración de la aplicación"""
+        self.enabled = app.config.get('USER_VERSION_CACHE_ENABLED', True)
+        self.refresh_interval = app.config.get('USER_VERSION_REFRESH_SECONDS', self.refresh_interval)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._versions = None
+            self._watermark = None
+            self._last_refresh = 0.0
+
+    def _store(self, user_id, role_version, is_active, updated_at=None):
+        if (role_version or 1) > 1 or is_active is False:
+            self._versions[user_id] = (role_version or 1, is_active is not False)
+        else:
+            self._versions.pop(user_id, None)
+        if updated_at and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+
+    def _load(self):
+        query = db.session.query(User.id, User.role_version, User.is_active, User.updated_at)
+        if self._versions is None:
+            self._versions = {}
+            query = query.filter(or_(User.role_version > 1, User.is_active == False))
+        elif self._watermark is not None:
+            query = query.filter(User.updated_at >= self._watermark - self.overlap)
+        for user_id, role_version, is_active, updated_at in query.all():
+            self._store(user_id, role_version, is_active, updated_at)
+        self._last_refresh = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._versions is not None and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        with self._lock:
+            if self._versions is None or time.monotonic() - self._last_refresh >= self.refresh_interval:
+                self._load()
+
+    def update(self, user):
+        """Registrar un cambio hecho en este proceso (visible de inmediato)"""
+        with self._lock:
+            if self._versions is not None:
+                self._store(user.id, user.role_version, user.is_active)
+
+    def is_stale(self, jwt_payload):
+        """
+        Verificar si un token quedó invalidado por un cambio de rol o una desactivación
+        Los tokens sin claim role_version (emitidos antes de este cambio) no se evalúan aquí
+        """
+        if not self.enabled or 'role_version' not in jwt_payload:
+            return False
+
+        self._ensure_fresh()
+        entry = self._versions.get(jwt_payload.get('sub'))
+        if entry is None:
+            return False
+
+        role_version, is_active = entry
+        if not is_active:
+            return True
+        # Los refresh tokens siguen siendo válidos: el refresco vuelve a leer el usuario
+        return jwt_payload.get('type') == 'access' and jwt_payload['role_version'] < role_version
+
+
+user_version_cache = UserVersionCache()
@@ -0,0 +1,9 @@
+"""
+Punto de entrada WSGI para producción
+Uso: gunicorn -c gunicorn.conf.py wsgi:application
+"""
+import os
+from app import create_app
+
+application = create_app(os.getenv('FLASK_ENV', 'production'))
+app = application
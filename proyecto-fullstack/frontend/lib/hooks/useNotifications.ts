@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
 import { useAuthStore } from '@/lib/store/authStore'
 import { safeFormatDistanceToNow } from '@/lib/utils'
 
@@ -27,7 +27,9 @@ export function useNotifications() {
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
   
-  const { token } = useAuthStore()
+  const { token, logout } = useAuthStore()
+  // Con el stream SSE conectado el contador lo actualiza el servidor
+  const streaming = useRef(false)
 
   const fetchNotifications = useCallback(async (unreadOnly = false) => {
     if (!token) return
@@ -95,7 +97,9 @@ export function useNotifications() {
         )
         
         // Actualizar contador
-        setUnreadCount(prev => Math.max(0, prev - 1))
+        if (!streaming.current) {
+          setUnreadCount(prev => Math.max(0, prev - 1))
+        }
       }
     } catch (err) {
       console.error('Error al marcar notificación como leída:', err)
@@ -125,7 +129,9 @@ export function useNotifications() {
         setNotifications(prev => 
           prev.map(notif => ({ ...notif, unread: false }))
         )
-        setUnreadCount(0)
+        if (!streaming.current) {
+          setUnreadCount(0)
+        }
       }
     } catch (err) {
       console.error('Error al marcar todas las notificaciones como leídas:', err)
@@ -150,7 +156,7 @@ export function useNotifications() {
       if (data.success) {
         const deletedNotification = notifications.find(n => n.id === notificationId)
         setNotifications(prev => prev.filter(notif => notif.id !== notificationId))
-        if (deletedNotification?.unread) {
+        if (deletedNotification?.unread && !streaming.current) {
           setUnreadCount(prev => Math.max(0, prev - 1))
         }
       }
@@ -208,6 +214,93 @@ export function useNotifications() {
     }
   }, [token])
 
+  // Stream de notificaciones en tiempo real (SSE) con reconexión desde Last-Event-ID
+  useEffect(() => {
+    if (!token) return
+
+    const controller = new AbortController()
+    let lastEventId = ''
+    let retryMs = 3000
+
+    const handleEvent = (event: string, data: string) => {
+      const payload = JSON.parse(data)
+      if (event === 'notification') {
+        setNotifications(prev =>
+          prev.some(notif => notif.id === payload.id) ? prev : [payload as Notification, ...prev]
+        )
+      } else if (event === 'unread') {
+        if (typeof payload.unread_count === 'number') {
+          setUnreadCount(payload.unread_count)
+        } else {
+          setUnreadCount(prev => Math.max(0, prev + payload.delta))
+        }
+      }
+    }
+
+    const connect = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5000'}/api/notifications/stream`, {
+            headers: {
+              'Authorization': `Bearer ${token}`,
+              'Accept': 'text/event-stream',
+              ...(lastEventId ? { 'Last-Event-ID': lastEventId } : {}),
+            },
+            signal: controller.signal,
+          })
+
+          // Token vencido o revocado: reintentar no sirve; se cierra la sesión como en el
+          // interceptor de api.ts y el cambio de token termina este efecto
+          if (response.status === 401) {
+            logout()
+            return
+          }
+          // Otros 4xx tampoco se resuelven reintentando; solo 5xx/503 y errores de red
+          if (!response.ok && response.status < 500) return
+
+          if (response.ok && response.body) {
+            streaming.current = true
+            const reader = response.body.getReader()
+            const decoder = new TextDecoder()
+            let buffer = ''
+
+            while (true) {
+              const { value, done } = await reader.read()
+              if (done) break
+              buffer += decoder.decode(value, { stream: true })
+
+              let boundary = buffer.indexOf('\n\n')
+              while (boundary >= 0) {
+                const block = buffer.slice(0, boundary)
+                buffer = buffer.slice(boundary + 2)
+                boundary = buffer.indexOf('\n\n')
+
+                let event = 'message'
+                let data = ''
+                block.split('\n').forEach(line => {
+                  if (line.startsWith('id: ')) lastEventId = line.slice(4)
+                  else if (line.startsWith('event: ')) event = line.slice(7)
+                  else if (line.startsWith('data: ')) data += line.slice(6)
+                  else if (line.startsWith('retry: ')) retryMs = Number(line.slice(7)) || retryMs
+                })
+                if (data) handleEvent(event, data)
+              }
+            }
+          }
+        } catch (err) {
+          if (controller.signal.aborted) return
+        } finally {
+          streaming.current = false
+        }
+        // El servidor cierra el stream periódicamente (o está lleno): reconectar
+        await new Promise(resolve => setTimeout(resolve, retryMs))
+      }
+    }
+
+    connect()
+    return () => controller.abort()
+  }, [token, logout])
+
   // Función para obtener el tiempo relativo (hace X minutos/horas/días)
   const getRelativeTime = (dateString: string) => {
     return safeFormatDistanceToNow(dateString) || 'Fecha inválida'